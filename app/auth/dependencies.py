@@ -27,7 +27,11 @@ def get_current_user(
     if token is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Недійсний токен.")
 
-    if token.expires_at <= datetime.now(timezone.utc):
+    expires_at = token.expires_at
+    if expires_at.tzinfo is None:
+        # SQLite hands back naive datetimes
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    if expires_at <= datetime.now(timezone.utc):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Токен протерміновано.")
 
     user = token.user
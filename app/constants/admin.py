@@ -0,0 +1,3 @@
+# Розмір сторінки списків в адмінці (еквіп, рослини, квести, вузли квесту).
+ADMIN_PAGE_DEFAULT_LIMIT = 50
+ADMIN_PAGE_MAX_LIMIT = 200
@@ -0,0 +1,6 @@
+# Рядків на одну сторінку keyset-пагінації експорту (один запит до бази).
+EXPORT_PAGE_SIZE = 10000
+# Скільки рядків серверний курсор віддає за раз усередині сторінки.
+EXPORT_YIELD_PER = 1000
+# Рівень стиснення gzip: 6 — звичний компроміс між швидкістю і розміром.
+EXPORT_GZIP_LEVEL = 6
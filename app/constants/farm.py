@@ -0,0 +1,2 @@
+# Вік (секунди), після якого каталог рослин завантажується з бази заново.
+PLANT_CATALOG_CACHE_MAX_AGE_SECONDS = 300
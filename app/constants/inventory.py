@@ -0,0 +1,2 @@
+# Слоти предметів, які не можна одягнути: такі предмети зберігаються стосом з лічильником.
+STACKABLE_SLOTS = frozenset({"consumable", "material", "resource"})
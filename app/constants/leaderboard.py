@@ -0,0 +1,11 @@
+# Рейтинги: за рівнем гравця (рівень, потім XP), за рівнем фермерства і за золотом.
+LEADERBOARD_LEVEL = "level"
+LEADERBOARD_FARMING = "farming"
+LEADERBOARD_GOLD = "gold"
+LEADERBOARD_BOARDS = (LEADERBOARD_LEVEL, LEADERBOARD_FARMING, LEADERBOARD_GOLD)
+# Розмір сторінки топу за замовчуванням і максимальний.
+LEADERBOARD_DEFAULT_LIMIT = 10
+LEADERBOARD_MAX_LIMIT = 100
+# Скільки сусідів згори і знизу показувати навколо гравця.
+LEADERBOARD_DEFAULT_AROUND = 2
+LEADERBOARD_MAX_AROUND = 10
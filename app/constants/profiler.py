@@ -0,0 +1,9 @@
+# Інтервал між знімками стеків за замовчуванням (мілісекунди).
+PROFILER_DEFAULT_INTERVAL_MS = 5
+# Найкоротший дозволений інтервал: частіші знімки вже помітно гальмують воркер.
+PROFILER_MIN_INTERVAL_MS = 1
+# Тривалість сесії профілювання за замовчуванням і максимальна (секунди).
+PROFILER_DEFAULT_SECONDS = 10
+PROFILER_MAX_SECONDS = 120
+# Скільки унікальних стеків зберігати, щоб сесія не з'їла пам'ять воркера.
+PROFILER_MAX_DISTINCT_STACKS = 20000
@@ -0,0 +1,6 @@
+FALLEN_CROWN_ACT_I_ID = 2001
+FALLEN_CROWN_ACT_II_ID = 2002
+FALLEN_CROWN_ACT_III_ID = 2003
+FALLEN_CROWN_ACT_IV_ID = 2004
+FALLEN_CROWN_ACT_V_ID = 2005
+FALLEN_CROWN_START_NODE_ID = "fallen_crown_a1_q1"
@@ -0,0 +1,6 @@
+# Через скільки секунд кешована вітрина перечитується з бази навіть без змін у цьому процесі.
+SHOP_OFFER_CACHE_MAX_AGE_SECONDS = 60
+# Скільки покупок однієї пропозиції процес пропускає до бази одночасно.
+SHOP_OFFER_PURCHASE_CONCURRENCY = 4
+# Скільки секунд пам'ятати, що пропозицію розпродано, і відповідати без запиту до бази.
+SHOP_SOLD_OUT_MEMO_SECONDS = 5
@@ -2,6 +2,14 @@ from __future__ import annotations
 
 from typing import List
 
+from app.constants.quests import (  # noqa: F401  # re-exported for content tooling
+    FALLEN_CROWN_ACT_I_ID,
+    FALLEN_CROWN_ACT_II_ID,
+    FALLEN_CROWN_ACT_III_ID,
+    FALLEN_CROWN_ACT_IV_ID,
+    FALLEN_CROWN_ACT_V_ID,
+    FALLEN_CROWN_START_NODE_ID,
+)
 from app.services.quest_content_builder import (
     QuestChoiceSpec,
     QuestNodeSpec,
@@ -9,14 +17,6 @@ from app.services.quest_content_builder import (
 )
 
 
-FALLEN_CROWN_ACT_I_ID = 2001
-FALLEN_CROWN_ACT_II_ID = 2002
-FALLEN_CROWN_ACT_III_ID = 2003
-FALLEN_CROWN_ACT_IV_ID = 2004
-FALLEN_CROWN_ACT_V_ID = 2005
-FALLEN_CROWN_START_NODE_ID = "fallen_crown_a1_q1"
-
-
 def fallen_crown_blueprint() -> List[QuestSpec]:
     """Declarative blueprint for the “Saga of the Fallen Crown” quest line."""
 
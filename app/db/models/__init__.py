@@ -1,4 +1,5 @@
 from app.db.models.activity import PlayerActivityLog
+from app.db.models.idempotency import IdempotencyKey
 from app.db.models.inventory import InventoryItem, InventoryItemCatalog
 from app.db.models.player import Player
 from app.db.models.quest import Quest, QuestChoice, QuestNode, QuestProgress
@@ -14,6 +15,7 @@ from app.db.models.user import UserAccount, SessionToken
 
 __all__ = [
     "PlayerActivityLog",
+    "IdempotencyKey",
     "InventoryItem",
     "InventoryItemCatalog",
     "Player",
@@ -8,9 +8,11 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -61,6 +63,8 @@ class FarmPlot(Base):
     """A single patch of land the player can cultivate."""
 
     __tablename__ = "farm_plots"
+    # рядки ділянок створюються ліниво; паралельні запити не повинні створити один слот двічі
+    __table_args__ = (UniqueConstraint("player_id", "slot_index", name="uq_farm_plots_player_id_slot_index"),)
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(BigInteger, ForeignKey("players.id"), nullable=False, index=True)
@@ -85,6 +89,10 @@ class PlantedCrop(Base):
     """Represents an in-progress or finished crop on a plot."""
 
     __tablename__ = "farm_planted_crops"
+    __table_args__ = (
+        # CropReadyScheduler шукає визрілі посіви: state = 'growing' AND ready_at <= now
+        Index("ix_farm_planted_crops_state_ready_at", "state", "ready_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     plot_id = Column(Integer, ForeignKey("farm_plots.id"), nullable=False, unique=True)
@@ -97,15 +105,18 @@ class PlantedCrop(Base):
     plot = relationship("FarmPlot", back_populates="crop")
     plant_type = relationship("PlantType", back_populates="crops")
 
-    def mark_ready(self, ready_time: datetime) -> None:
-        """Set the crop state to ready if growth completed."""
+    def state_at(self, moment: datetime) -> str:
+        """Return the state the crop has at ``moment`` without waiting for the scheduler to store it."""
         if self.state != "growing":
-            return
+            return self.state
         ready_target = self.ready_at
         if ready_target.tzinfo is None:
             ready_target = ready_target.replace(tzinfo=timezone.utc)
-        candidate = ready_time
+        candidate = moment
         if candidate.tzinfo is None:
             candidate = candidate.replace(tzinfo=timezone.utc)
-        if candidate >= ready_target:
-            self.state = "ready"
+        return "ready" if candidate >= ready_target else "growing"
+
+    def mark_ready(self, ready_time: datetime) -> None:
+        """Set the crop state to ready if growth completed."""
+        self.state = self.state_at(ready_time)
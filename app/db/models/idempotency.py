@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """Перша відповідь на запит з заголовком Idempotency-Key; повтори отримують її без повторного виконання."""
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    scope = Column(String(128), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    # NULL, поки оригінальний запит ще виконується
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Index, false, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -16,17 +16,38 @@ class InventoryItemCatalog(Base):
     description = Column(Text, nullable=True)
     icon = Column(String, nullable=True)  # ідентифікатор або url іконки
 
+
 class InventoryItem(Base):
     """
     Конкретний айтем, що належить гравцю.
     """
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        Index("ix_inventory_items_owner_id_catalog_item_id", "owner_id", "catalog_item_id"),
+        Index("ix_inventory_items_owner_id_is_equipped", "owner_id", "is_equipped"),
+        Index("ix_inventory_items_owner_id_id", "owner_id", "id"),
+        Index("ix_inventory_items_owner_id_slot", "owner_id", "slot"),
+        # один стос на гравця й предмет: ціль для INSERT … ON CONFLICT при видачі стосових предметів
+        Index(
+            "uq_inventory_items_owner_id_catalog_item_id_stackable",
+            "owner_id",
+            "catalog_item_id",
+            unique=True,
+            postgresql_where=text("stackable"),
+            sqlite_where=text("stackable"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     owner_id = Column(Integer, ForeignKey("players.id"), nullable=False)
     catalog_item_id = Column(Integer, ForeignKey("inventory_items_catalog.id"), nullable=False)
+    # копія InventoryItemCatalog.slot, щоб екіпірування оновлювалось одним індексованим UPDATE;
+    # задається явно при створенні (без прихованого SELECT на кожен рядок)
+    slot = Column(String, nullable=False)
 
     is_equipped = Column(Boolean, default=False, nullable=False)
+    quantity = Column(Integer, default=1, nullable=False)  # розмір стосу для розхідників і дублікатів косметики
+    stackable = Column(Boolean, default=False, server_default=false(), nullable=False)  # рядок-стос (див. is_stackable)
 
     owner = relationship("Player", back_populates="inventory_items")
     catalog_item = relationship("InventoryItemCatalog")
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime
-from sqlalchemy import BigInteger, Boolean
+from sqlalchemy import BigInteger, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -8,8 +8,13 @@ from app.db.base import Base
 
 class Player(Base):
     __tablename__ = "players"
+    __table_args__ = (
+        # пошук гравців, що можуть забрати щоденну нагороду: NULL або давно, з keyset-пагінацією по id
+        Index("ix_players_last_daily_claim_at_id", "last_daily_claim_at", "id"),
+    )
 
-    id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    # SQLite only autoincrements INTEGER PRIMARY KEY, so /auth/register needs the variant there
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True, autoincrement=True)
     # Ми можемо прямо використовувати telegram_user_id як id, щоб не мучитись з мапінгом
 
     username = Column(String, nullable=True)  # видно в рейтингах
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -14,6 +14,8 @@ class Quest(Base):
 
 class QuestNode(Base):
     __tablename__ = "quest_nodes"
+    # лічильники вузлів і посторінковий список вузлів квесту в адмінці
+    __table_args__ = (Index("ix_quest_nodes_quest_id_id", "quest_id", "id"),)
 
     id = Column(String, primary_key=True, index=True)
     quest_id = Column(Integer, ForeignKey("quests.id"), nullable=False)
@@ -29,6 +31,7 @@ class QuestNode(Base):
 
 class QuestChoice(Base):
     __tablename__ = "quest_choices"
+    __table_args__ = (Index("ix_quest_choices_node_id", "node_id"),)
 
     id = Column(String, primary_key=True, index=True)
     node_id = Column(String, ForeignKey("quest_nodes.id"), nullable=False)
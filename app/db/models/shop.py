@@ -16,5 +16,7 @@ class ShopOffer(Base):
     price_gold = Column(Integer, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=True)
     is_limited = Column(Boolean, default=False, nullable=False)
+    # Загальний запас для флеш-розпродажів; NULL означає необмежену кількість.
+    stock_remaining = Column(Integer, nullable=True)
 
     catalog_item = relationship("InventoryItemCatalog")
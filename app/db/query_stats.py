@@ -0,0 +1,174 @@
+"""Per-request SQL instrumentation.
+
+Engine-level cursor events (registered on the ``Engine`` class, so the sync engine, the async
+engine's sync core and test engines are all covered) add every statement to the
+``RequestQueryStats`` of the current request, found through a ``ContextVar``. Starlette copies the
+context into the threadpool for sync routes and SQLAlchemy keeps it across ``run_sync``, so
+dependencies such as ``get_current_user`` are counted too.
+
+``QueryStatsMiddleware`` opens the per-request stats, adds ``X-DB-*`` headers with ``APP_DEBUG=1`` and
+folds each finished request into the process-wide ``route_query_stats`` aggregates.
+
+Rows are what the driver reports as ``cursor.rowcount``: affected rows for DML, and rows returned
+for SELECT on psycopg/asyncpg. SQLite does not report SELECT rows.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SLOWEST_STATEMENT_MAX_LENGTH = 300
+_STARTED_KEY = "query_stats_started"
+
+
+@dataclass
+class RequestQueryStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, seconds: float, rows: int) -> None:
+        self.statements += 1
+        self.db_seconds += seconds
+        if rows > 0:
+            self.rows += rows
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement[:SLOWEST_STATEMENT_MAX_LENGTH]
+
+    def headers(self) -> List[Tuple[bytes, bytes]]:
+        return [
+            (b"x-db-statements", str(self.statements).encode()),
+            (b"x-db-time-ms", f"{self.db_seconds * 1000:.2f}".encode()),
+            (b"x-db-rows", str(self.rows).encode()),
+            (b"x-db-slowest-ms", f"{self.slowest_seconds * 1000:.2f}".encode()),
+        ]
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[RequestQueryStats]:
+    """Collect the statements issued inside the block, e.g. ``with track_queries() as stats: ...``."""
+    stats = RequestQueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    started = conn.info.get(_STARTED_KEY)
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop(), getattr(cursor, "rowcount", -1))
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context) -> None:
+    # a failed statement never reaches after_cursor_execute; drop its start time
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_STARTED_KEY):
+        connection.info[_STARTED_KEY].pop()
+
+
+@dataclass
+class RouteQueryTotals:
+    requests: int = 0
+    statements: int = 0
+    max_statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+
+
+class RouteQueryStats:
+    """Process-wide aggregates keyed by ``(method, route template)``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteQueryTotals] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes = {}
+
+    def record(self, method: str, route: str, stats: RequestQueryStats) -> None:
+        with self._lock:
+            totals = self._routes.setdefault((method, route), RouteQueryTotals())
+            totals.requests += 1
+            totals.statements += stats.statements
+            totals.max_statements = max(totals.max_statements, stats.statements)
+            totals.db_seconds += stats.db_seconds
+            totals.rows += stats.rows
+            if stats.slowest_statement is not None and stats.slowest_seconds >= totals.slowest_seconds:
+                totals.slowest_seconds = stats.slowest_seconds
+                totals.slowest_statement = stats.slowest_statement
+
+    def snapshot(self) -> Dict[Tuple[str, str], RouteQueryTotals]:
+        with self._lock:
+            return {key: replace(totals) for key, totals in self._routes.items()}
+
+
+route_query_stats = RouteQueryStats()
+
+
+def debug_headers_enabled() -> bool:
+    return os.getenv("APP_DEBUG", "0") == "1"
+
+
+def _route_template(scope: Dict[str, Any]) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "<unmatched>"
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware, so the handler runs in the same context as the stats it fills."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *stats.headers()]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if debug_headers_enabled() else send)
+        finally:
+            _current_stats.reset(token)
+            route_query_stats.record(scope["method"], _route_template(scope), stats)
@@ -1,21 +1,19 @@
 from __future__ import annotations
 
 import os
-import sys
 from typing import List
-from pathlib import Path
-
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.append(str(PROJECT_ROOT))
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.db import models  # noqa: F401  # ensure metadata is registered
+from app.db.query_stats import QueryStatsMiddleware
 from app.routes import api_router
-from app.db.base import Base, engine
+from app.services.crop_scheduler import crop_ready_scheduler
+from app.startup import ensure_schema, warm_up
+from app.utils.metrics import RequestMetricsMiddleware
+from app.utils.profiler import ProfilerMiddleware
 
 
 def _split_env_list(raw: str | None) -> List[str]:
@@ -49,14 +47,39 @@ app.add_middleware(
     allow_methods=allow_methods,
     allow_headers=allow_headers,
 )
+# X-DB-* headers (statements, DB time, rows, slowest statement) are only sent with APP_DEBUG=1
+app.add_middleware(QueryStatsMiddleware)
+# latency histograms and in-flight requests for /metrics
+app.add_middleware(RequestMetricsMiddleware)
+# idle unless an admin starts a session via POST /admin/profiler
+app.add_middleware(ProfilerMiddleware)
 
 app.include_router(api_router)
 
 
 @app.on_event("startup")
-def ensure_database_tables() -> None:
-    """Create database tables if they are missing."""
-    Base.metadata.create_all(bind=engine)
+def verify_database_schema() -> None:
+    """Check the Alembic revision (DB_SCHEMA_MODE=check), create tables (create) or skip (off); see app.startup."""
+    ensure_schema()
+
+
+@app.on_event("startup")
+async def warm_up_worker() -> None:
+    """Open pool connections and prime caches before serving traffic when APP_WARMUP=1."""
+    if os.getenv("APP_WARMUP", "0") == "1":
+        await warm_up()
+
+
+@app.on_event("startup")
+async def start_crop_scheduler() -> None:
+    """Store ready crops in the background when CROP_SCHEDULER_ENABLED=1 (one worker is enough)."""
+    if os.getenv("CROP_SCHEDULER_ENABLED", "0") == "1":
+        crop_ready_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_crop_scheduler() -> None:
+    await crop_ready_scheduler.stop()
 
 
 def run() -> None:
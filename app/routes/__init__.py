@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from app.routes.dashboard_routes import router as dashboard_router
 from app.routes.inventory_routes import router as inventory_router
+from app.routes.leaderboard_routes import router as leaderboard_router
 from app.routes.meta_routes import router as meta_router
 from app.routes.player_routes import router as player_router
 from app.routes.progression_routes import router as progression_router
@@ -24,6 +25,7 @@ api_router.include_router(inventory_router)
 api_router.include_router(progression_router)
 api_router.include_router(shop_router)
 api_router.include_router(farm_router)
+api_router.include_router(leaderboard_router)
 api_router.include_router(onboarding_router)
 api_router.include_router(admin_router)
 api_router.include_router(auth_router)
@@ -1,45 +1,56 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Set
+from typing import Dict, List, Optional, Set
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.constants.admin import ADMIN_PAGE_DEFAULT_LIMIT, ADMIN_PAGE_MAX_LIMIT
+from app.db.query_stats import route_query_stats
 from app.db.session import get_db
+from app.services.export_service import EXPORT_DATASETS, UnknownExportColumns, export_dataset
+from app.services.leaderboard_service import leaderboards
+from app.services.progression_service import iter_claimable_player_ids
 from app.services.quest_content_service import QuestContentService
 from app.schemas.admin import (
     EquipmentItemCreate,
+    EquipmentItemPage,
     EquipmentItemPublic,
     EquipmentItemUpdate,
     PlantTypeCreate,
+    PlantTypePage,
     PlantTypePublic,
     PlantTypeUpdate,
     QuestCreateRequest,
+    QuestNodePage,
+    QuestNodePublic,
     QuestPublic,
+    QuestSummaryPage,
+    ProfilerStartRequest,
+    ProfilerStatus,
     QuestUpdateRequest,
-)
-from app.services.admin_service import (
-    create_equipment_item,
-    create_plant_type,
-    create_quest,
-    list_equipment_items,
-    list_plants,
-    list_quests,
-    update_equipment_item,
-    update_plant_type,
-    update_quest,
+    RouteQueryStatsPublic,
 )
 from app.auth.dependencies import require_admin
 from app.db.models.quest import QuestNode, QuestChoice
+from app.utils.profiler import ProfileSession, ProfilerBusy, sampling_profiler
 
 router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
 
 logger = logging.getLogger(__name__)
 
 
+def _admin_service():
+    """Admin CRUD is rarely hit, so its service module loads on first use rather than at worker boot."""
+    from app.services import admin_service
+
+    return admin_service
+
+
 async def _ensure_fallen_crown(db: AsyncSession) -> None:
     def _sync(session):
         QuestContentService(session).ensure_fallen_crown_saga()
@@ -47,9 +58,23 @@ async def _ensure_fallen_crown(db: AsyncSession) -> None:
     await db.run_sync(_sync)
 
 
+_PAGE_LIMIT = Query(ADMIN_PAGE_DEFAULT_LIMIT, ge=1, le=ADMIN_PAGE_MAX_LIMIT)
+
+
 @router.get("/equipment", response_model=List[EquipmentItemPublic])
 async def get_equipment_catalog(db: AsyncSession = Depends(get_db)):
-    return await list_equipment_items(db)
+    return await _admin_service().list_equipment_items(db)
+
+
+@router.get("/equipment/page", response_model=EquipmentItemPage)
+async def get_equipment_page(
+    after: Optional[int] = None,
+    limit: int = _PAGE_LIMIT,
+    db: AsyncSession = Depends(get_db),
+):
+    """Catalog items after `after` by id, without descriptions."""
+    items, next_after = await _admin_service().page_equipment_items(db, after, limit)
+    return EquipmentItemPage(items=items, next_after=next_after)
 
 
 @router.post(
@@ -62,7 +87,7 @@ async def add_equipment_item(
     db: AsyncSession = Depends(get_db),
 ):
     try:
-        item = await create_equipment_item(db, payload)
+        item = await _admin_service().create_equipment_item(db, payload)
         await db.commit()
         return item
     except IntegrityError as exc:
@@ -77,7 +102,7 @@ async def edit_equipment_item(
     db: AsyncSession = Depends(get_db),
 ):
     try:
-        item = await update_equipment_item(db, item_id, payload)
+        item = await _admin_service().update_equipment_item(db, item_id, payload)
         if item is None:
             raise HTTPException(status_code=404, detail="Предмет не знайдено.")
         await db.commit()
@@ -89,7 +114,18 @@ async def edit_equipment_item(
 
 @router.get("/plants", response_model=List[PlantTypePublic])
 async def get_plants(db: AsyncSession = Depends(get_db)):
-    return await list_plants(db)
+    return await _admin_service().list_plants(db)
+
+
+@router.get("/plants/page", response_model=PlantTypePage)
+async def get_plants_page(
+    after: Optional[int] = None,
+    limit: int = _PAGE_LIMIT,
+    db: AsyncSession = Depends(get_db),
+):
+    """Plant types after `after` by id, without descriptions."""
+    items, next_after = await _admin_service().page_plants(db, after, limit)
+    return PlantTypePage(items=items, next_after=next_after)
 
 
 @router.post(
@@ -102,7 +138,7 @@ async def add_plant(
     db: AsyncSession = Depends(get_db),
 ):
     try:
-        plant = await create_plant_type(db, payload)
+        plant = await _admin_service().create_plant_type(db, payload)
         await db.commit()
         return plant
     except IntegrityError as exc:
@@ -117,7 +153,7 @@ async def edit_plant(
     db: AsyncSession = Depends(get_db),
 ):
     try:
-        plant = await update_plant_type(db, plant_id, payload)
+        plant = await _admin_service().update_plant_type(db, plant_id, payload)
         if plant is None:
             raise HTTPException(status_code=404, detail="Рослину не знайдено.")
         await db.commit()
@@ -219,7 +255,50 @@ async def _validate_quest_payload(
 @router.get("/quests", response_model=List[QuestPublic])
 async def get_quests(db: AsyncSession = Depends(get_db)):
     await _ensure_fallen_crown(db)
-    return await list_quests(db)
+    return await _admin_service().list_quests(db)
+
+
+@router.get("/quests/page", response_model=QuestSummaryPage)
+async def get_quests_page(
+    after: Optional[int] = None,
+    limit: int = _PAGE_LIMIT,
+    db: AsyncSession = Depends(get_db),
+):
+    """Quest headers with node and choice counts; fetch a quest or node by id for its text."""
+    await _ensure_fallen_crown(db)
+    items, next_after = await _admin_service().page_quest_summaries(db, after, limit)
+    return QuestSummaryPage(items=items, next_after=next_after)
+
+
+@router.get("/quests/{quest_id}", response_model=QuestPublic)
+async def get_quest(quest_id: int, db: AsyncSession = Depends(get_db)):
+    await _ensure_fallen_crown(db)
+    quest = await _admin_service().get_quest(db, quest_id)
+    if quest is None:
+        raise HTTPException(status_code=404, detail="Квест не знайдено.")
+    return quest
+
+
+@router.get("/quests/{quest_id}/nodes", response_model=QuestNodePage)
+async def get_quest_nodes(
+    quest_id: int,
+    after: Optional[str] = None,
+    limit: int = _PAGE_LIMIT,
+    db: AsyncSession = Depends(get_db),
+):
+    """Node titles and flags of one quest, by node id; bodies come from the node endpoint."""
+    await _ensure_fallen_crown(db)
+    items, next_after = await _admin_service().page_quest_nodes(db, quest_id, after, limit)
+    return QuestNodePage(items=items, next_after=next_after)
+
+
+@router.get("/quests/{quest_id}/nodes/{node_id}", response_model=QuestNodePublic)
+async def get_quest_node(quest_id: int, node_id: str, db: AsyncSession = Depends(get_db)):
+    await _ensure_fallen_crown(db)
+    node = await _admin_service().get_quest_node(db, quest_id, node_id)
+    if node is None:
+        raise HTTPException(status_code=404, detail="Вузол квесту не знайдено.")
+    return node
 
 
 @router.post("/quests", response_model=QuestPublic, status_code=status.HTTP_201_CREATED)
@@ -230,7 +309,7 @@ async def add_quest(
     await _ensure_fallen_crown(db)
     await _validate_quest_payload(payload, db, current_quest_id=None)
     try:
-        quest = await create_quest(db, payload)
+        quest = await _admin_service().create_quest(db, payload)
         await db.commit()
         return quest
     except IntegrityError as exc:
@@ -247,7 +326,7 @@ async def edit_quest(
     await _ensure_fallen_crown(db)
     await _validate_quest_payload(payload, db, current_quest_id=quest_id)
     try:
-        quest = await update_quest(db, quest_id, payload)
+        quest = await _admin_service().update_quest(db, quest_id, payload)
         if quest is None:
             raise HTTPException(status_code=404, detail="Квест не знайдено.")
         await db.commit()
@@ -256,3 +335,132 @@ async def edit_quest(
         await db.rollback()
         logger.exception("Failed to update quest %s due to integrity error", quest_id)
         raise HTTPException(status_code=400, detail="Не вдалося оновити квест. Перевірте унікальність ID вузлів або виборів.") from exc
+
+
+@router.get("/query-stats", response_model=List[RouteQueryStatsPublic])
+async def get_query_stats():
+    """Statements, DB time and rows per route since this worker started, busiest routes first."""
+    rows = []
+    for (method, route), totals in route_query_stats.snapshot().items():
+        rows.append(
+            RouteQueryStatsPublic(
+                method=method,
+                route=route,
+                requests=totals.requests,
+                statements=totals.statements,
+                avg_statements=round(totals.statements / totals.requests, 2),
+                max_statements=totals.max_statements,
+                db_time_ms=round(totals.db_seconds * 1000, 2),
+                avg_db_time_ms=round(totals.db_seconds * 1000 / totals.requests, 2),
+                rows=totals.rows,
+                slowest_ms=round(totals.slowest_seconds * 1000, 2),
+                slowest_statement=totals.slowest_statement,
+            )
+        )
+    return sorted(rows, key=lambda row: row.db_time_ms, reverse=True)
+
+
+@router.post("/leaderboards/rebuild", response_model=Dict[str, int])
+async def rebuild_leaderboards(db: AsyncSession = Depends(get_db)):
+    """Reload this worker's leaderboards from the database; returns players per board."""
+    return await db.run_sync(leaderboards.rebuild)
+
+
+@router.get("/daily-rewards/claimable")
+async def export_claimable_players(db: AsyncSession = Depends(get_db)):
+    """CSV of every player who can claim the daily reward right now, streamed batch by batch."""
+
+    async def rows():
+        yield "player_id\n"
+        async for batch in iter_claimable_player_ids(db):
+            yield "".join(f"{player_id}\n" for player_id in batch)
+
+    return StreamingResponse(
+        rows(),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="claimable_players.csv"'},
+    )
+
+
+_EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/export/{dataset}")
+async def export_player_state(
+    dataset: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to include (all by default)"),
+    gzip: bool = False,
+    after: Optional[int] = Query(None, description="Resume after this key value"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream a whole dataset (`players`, `wallets`, `farm_stats`, `farm_plots`, `inventory`) page by page."""
+    export = EXPORT_DATASETS.get(dataset)
+    if export is None:
+        raise HTTPException(status_code=404, detail="Набір даних для експорту не знайдено.")
+    requested = [name.strip() for name in columns.split(",") if name.strip()] if columns else None
+    try:
+        selected = export.resolve(requested)
+    except UnknownExportColumns as exc:
+        raise HTTPException(status_code=400, detail=f"Невідомі колонки: {', '.join(exc.columns)}.") from exc
+
+    filename = f"{dataset}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_dataset(db, export, selected, fmt=format, compress=gzip, after=after),
+        media_type="application/gzip" if gzip else _EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _profiler_status(session: ProfileSession) -> ProfilerStatus:
+    return ProfilerStatus(
+        running=session.running,
+        route=session.route,
+        max_requests=session.max_requests,
+        requests_seen=session.requests_seen,
+        samples=session.samples,
+        dropped_samples=session.dropped_samples,
+        distinct_stacks=len(session.stacks),
+        started_at=session.started_at,
+        finished_at=session.finished_at,
+    )
+
+
+def _profiler_session() -> ProfileSession:
+    session = sampling_profiler.session
+    if session is None:
+        raise HTTPException(status_code=404, detail="Профілювання ще не запускали на цьому воркері.")
+    return session
+
+
+@router.post("/profiler", response_model=ProfilerStatus, status_code=status.HTTP_201_CREATED)
+async def start_profiler(payload: ProfilerStartRequest):
+    """Sample this worker for `seconds`, or until `requests` calls to `route` have finished."""
+    try:
+        session = sampling_profiler.start(
+            seconds=payload.seconds,
+            interval=payload.interval_ms / 1000,
+            route=payload.route,
+            max_requests=payload.requests,
+        )
+    except ProfilerBusy as exc:
+        raise HTTPException(status_code=409, detail="Профілювання вже запущене.") from exc
+    return _profiler_status(session)
+
+
+@router.get("/profiler", response_model=ProfilerStatus)
+async def get_profiler_status():
+    return _profiler_status(_profiler_session())
+
+
+@router.delete("/profiler", response_model=ProfilerStatus)
+async def stop_profiler():
+    session = _profiler_session()
+    session.stop()
+    return _profiler_status(session)
+
+
+@router.get("/profiler/collapsed", response_class=PlainTextResponse)
+async def get_profiler_stacks():
+    """Collapsed stacks (`frame;frame count`) for flamegraph.pl or speedscope."""
+    return PlainTextResponse(_profiler_session().collapsed())
@@ -9,7 +9,6 @@ from app.db.models.player import Player
 from app.db.models.user import SessionToken, UserAccount
 from app.db.models.wallet import Wallet
 from app.schemas.auth import AuthResponse, AuthenticatedUser, HeroRegistrationRequest, LoginRequest
-from app.services.farm_service import FarmService
 from app.services.onboarding_service import OnboardingService
 from app.services.player_profile import build_player_profile
 from app.services.quest_content_service import QuestContentService
@@ -78,7 +77,6 @@ def register_hero(payload: HeroRegistrationRequest, session: Session = Depends(g
     session.add(wallet)
     session.flush()
 
-    FarmService(session).get_farm_state(player.id)
     onboarding_service = OnboardingService(session)
     onboarding_service.ensure_onboarding_content()
     QuestContentService(session).ensure_fallen_crown_saga()
@@ -1,23 +1,95 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+import json
+from typing import Dict, List, Optional, Union
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from app.db.base import get_session
 from app.schemas.farm import (
     FarmActionResponse,
+    FarmBatchActionResponse,
+    FarmCompactActionResponse,
+    FarmPlotActionResult,
+    FarmResponseView,
     FarmState,
+    FarmStateChanges,
     HarvestCropRequest,
+    PlantBatchRequest,
+    PlantCatalog,
     PlantCropRequest,
     RefillFarmEnergyRequest,
 )
-from app.services.farm_service import FarmService
+from app.services.farm_service import FarmService, FarmStateData, PlotActionResult
 from app.utils.exceptions import GameLogicError
-from app.auth.dependencies import require_player_access
+from app.auth.dependencies import get_current_user, require_player_access
+from app.routes.idempotency import IDEMPOTENCY_HEADER, begin_idempotent, finish_idempotent
 
 
 router = APIRouter(prefix="/farm", tags=["farm"])
 
+PLANT_CATALOG_MAX_AGE_SECONDS = 300
+
+
+def _idempotent_request(request: object, view: FarmResponseView) -> Dict[str, object]:
+    # the view shapes the stored response, so a retry with another view is a different request
+    return {"request": request, "view": view}
+
+
+def _action_response(
+    service: FarmService,
+    state: FarmStateData,
+    message: str,
+    view: FarmResponseView,
+) -> Union[FarmActionResponse, FarmCompactActionResponse]:
+    if view == "compact":
+        return FarmCompactActionResponse(
+            changes=FarmStateChanges(**service.build_compact_changes(state)),
+            message=message,
+        )
+    public = service.build_public_state(state)
+    return FarmActionResponse(state=FarmState(**public), message=message)
+
+
+def _batch_response(
+    service: FarmService,
+    state: FarmStateData,
+    results: List[PlotActionResult],
+    message: str,
+    view: FarmResponseView,
+) -> Union[FarmBatchActionResponse, FarmCompactActionResponse]:
+    results_public = [FarmPlotActionResult(**vars(result)) for result in results]
+    if view == "compact":
+        return FarmCompactActionResponse(
+            changes=FarmStateChanges(**service.build_compact_changes(state)),
+            message=message,
+            results=results_public,
+        )
+    public = service.build_public_state(state)
+    return FarmBatchActionResponse(state=FarmState(**public), results=results_public, message=message)
+
+
+# registered before "/{player_id}" so that "catalog" is not parsed as a player id
+@router.get("/catalog", response_model=PlantCatalog)
+def get_plant_catalog(
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_session),
+    _user=Depends(get_current_user),
+):
+    """Plant catalog shared by all players; compact farm responses reference it by plant id."""
+    catalog = PlantCatalog(plants=FarmService(session).list_plant_catalog())
+    body = json.dumps(jsonable_encoder(catalog), sort_keys=True, ensure_ascii=False)
+    etag = f'"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={PLANT_CATALOG_MAX_AGE_SECONDS}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return catalog
+
 
 @router.get("/{player_id}", response_model=FarmState)
 def get_farm_state(
@@ -31,85 +103,179 @@ def get_farm_state(
     return FarmState(**public)
 
 
-@router.post("/{player_id}/plant", response_model=FarmActionResponse)
+@router.post("/{player_id}/plant", response_model=Union[FarmActionResponse, FarmCompactActionResponse])
 def plant_crop(
     player_id: int,
     payload: PlantCropRequest,
+    view: FarmResponseView = "full",
     session: Session = Depends(get_session),
     _user=Depends(require_player_access),
-) -> FarmActionResponse:
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> Union[FarmActionResponse, FarmCompactActionResponse]:
+    scope = f"farm.plant:{player_id}"
+    replay = begin_idempotent(session, scope, idempotency_key, _idempotent_request(payload, view))
+    if replay is not None:
+        return replay
+
     service = FarmService(session)
     try:
         state, message = service.plant_crop(player_id, payload.plot_id, payload.plant_type_id)
     except GameLogicError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    public = service.build_public_state(state)
-    return FarmActionResponse(state=FarmState(**public), message=message)
+    response = _action_response(service, state, message, view)
+    finish_idempotent(session, scope, idempotency_key, response)
+    return response
 
 
-@router.post("/{player_id}/harvest", response_model=FarmActionResponse)
+@router.post("/{player_id}/plant-batch", response_model=Union[FarmBatchActionResponse, FarmCompactActionResponse])
+def plant_batch(
+    player_id: int,
+    payload: PlantBatchRequest,
+    view: FarmResponseView = "full",
+    session: Session = Depends(get_session),
+    _user=Depends(require_player_access),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> Union[FarmBatchActionResponse, FarmCompactActionResponse]:
+    scope = f"farm.plant_batch:{player_id}"
+    replay = begin_idempotent(session, scope, idempotency_key, _idempotent_request(payload, view))
+    if replay is not None:
+        return replay
+
+    service = FarmService(session)
+    try:
+        state, results = service.plant_batch(
+            player_id,
+            [(item.plot_id, item.plant_type_id) for item in payload.plantings],
+        )
+    except GameLogicError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    planted = sum(1 for result in results if result.status == "planted")
+    message = f"Засаджено ділянок: {planted} з {len(results)}."
+    response = _batch_response(service, state, results, message, view)
+    finish_idempotent(session, scope, idempotency_key, response)
+    return response
+
+
+@router.post("/{player_id}/harvest-all", response_model=Union[FarmBatchActionResponse, FarmCompactActionResponse])
+def harvest_all(
+    player_id: int,
+    view: FarmResponseView = "full",
+    session: Session = Depends(get_session),
+    _user=Depends(require_player_access),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> Union[FarmBatchActionResponse, FarmCompactActionResponse]:
+    scope = f"farm.harvest_all:{player_id}"
+    replay = begin_idempotent(session, scope, idempotency_key, _idempotent_request({}, view))
+    if replay is not None:
+        return replay
+
+    service = FarmService(session)
+    try:
+        state, results, message = service.harvest_all(player_id)
+    except GameLogicError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    response = _batch_response(service, state, results, message, view)
+    finish_idempotent(session, scope, idempotency_key, response)
+    return response
+
+
+@router.post("/{player_id}/harvest", response_model=Union[FarmActionResponse, FarmCompactActionResponse])
 def harvest_crop(
     player_id: int,
     payload: HarvestCropRequest,
+    view: FarmResponseView = "full",
     session: Session = Depends(get_session),
     _user=Depends(require_player_access),
-) -> FarmActionResponse:
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> Union[FarmActionResponse, FarmCompactActionResponse]:
+    scope = f"farm.harvest:{player_id}"
+    replay = begin_idempotent(session, scope, idempotency_key, _idempotent_request(payload, view))
+    if replay is not None:
+        return replay
+
     service = FarmService(session)
     try:
         state, message = service.harvest_crop(player_id, payload.plot_id)
     except GameLogicError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    public = service.build_public_state(state)
-    return FarmActionResponse(state=FarmState(**public), message=message)
+    response = _action_response(service, state, message, view)
+    finish_idempotent(session, scope, idempotency_key, response)
+    return response
 
 
-@router.post("/{player_id}/plots/{plot_id}/unlock", response_model=FarmActionResponse)
+@router.post("/{player_id}/plots/{plot_id}/unlock", response_model=Union[FarmActionResponse, FarmCompactActionResponse])
 def unlock_plot(
     player_id: int,
     plot_id: int,
+    view: FarmResponseView = "full",
     session: Session = Depends(get_session),
     _user=Depends(require_player_access),
-) -> FarmActionResponse:
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> Union[FarmActionResponse, FarmCompactActionResponse]:
+    scope = f"farm.unlock:{player_id}"
+    replay = begin_idempotent(session, scope, idempotency_key, _idempotent_request({"plot_id": plot_id}, view))
+    if replay is not None:
+        return replay
+
     service = FarmService(session)
     try:
         state, message = service.unlock_plot(player_id, plot_id)
     except GameLogicError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    public = service.build_public_state(state)
-    return FarmActionResponse(state=FarmState(**public), message=message)
+    response = _action_response(service, state, message, view)
+    finish_idempotent(session, scope, idempotency_key, response)
+    return response
 
 
-@router.post("/{player_id}/tool/upgrade", response_model=FarmActionResponse)
+@router.post("/{player_id}/tool/upgrade", response_model=Union[FarmActionResponse, FarmCompactActionResponse])
 def upgrade_tool(
     player_id: int,
+    view: FarmResponseView = "full",
     session: Session = Depends(get_session),
     _user=Depends(require_player_access),
-) -> FarmActionResponse:
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> Union[FarmActionResponse, FarmCompactActionResponse]:
+    scope = f"farm.tool_upgrade:{player_id}"
+    replay = begin_idempotent(session, scope, idempotency_key, _idempotent_request({}, view))
+    if replay is not None:
+        return replay
+
     service = FarmService(session)
     try:
         state, message = service.upgrade_tool(player_id)
     except GameLogicError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    public = service.build_public_state(state)
-    return FarmActionResponse(state=FarmState(**public), message=message)
+    response = _action_response(service, state, message, view)
+    finish_idempotent(session, scope, idempotency_key, response)
+    return response
 
 
-@router.post("/{player_id}/energy/refill", response_model=FarmActionResponse)
+@router.post("/{player_id}/energy/refill", response_model=Union[FarmActionResponse, FarmCompactActionResponse])
 def refill_farm_energy(
     player_id: int,
     payload: RefillFarmEnergyRequest,
+    view: FarmResponseView = "full",
     session: Session = Depends(get_session),
     _user=Depends(require_player_access),
-) -> FarmActionResponse:
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
+) -> Union[FarmActionResponse, FarmCompactActionResponse]:
+    scope = f"farm.energy_refill:{player_id}"
+    replay = begin_idempotent(session, scope, idempotency_key, _idempotent_request(payload, view))
+    if replay is not None:
+        return replay
+
     service = FarmService(session)
     try:
         state, message = service.refill_energy(player_id, payload.amount)
     except GameLogicError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    public = service.build_public_state(state)
-    return FarmActionResponse(state=FarmState(**public), message=message)
+    response = _action_response(service, state, message, view)
+    finish_idempotent(session, scope, idempotency_key, response)
+    return response
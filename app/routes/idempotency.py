@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.services.idempotency_service import IdempotencyService
+from app.utils.exceptions import IdempotencyKeyReused, IdempotencyRequestInProgress
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def begin_idempotent(
+    session: Session,
+    scope: str,
+    key: Optional[str],
+    request: Any,
+) -> Optional[JSONResponse]:
+    """Reserve ``key`` for this request, or return the stored response when it is a retry."""
+    return _replay_response(session, scope, key, request, reserve=True)
+
+
+def replay_idempotent(
+    session: Session,
+    scope: str,
+    key: Optional[str],
+    request: Any,
+) -> Optional[JSONResponse]:
+    """Return the stored response for a retry without reserving ``key`` for a new request."""
+    return _replay_response(session, scope, key, request, reserve=False)
+
+
+def finish_idempotent(session: Session, scope: str, key: Optional[str], response: Any) -> None:
+    """Store the successful response so retries with the same key get it back verbatim."""
+    if not key:
+        return
+    IdempotencyService(session).complete(scope, key, 200, jsonable_encoder(response))
+
+
+def _replay_response(
+    session: Session,
+    scope: str,
+    key: Optional[str],
+    request: Any,
+    *,
+    reserve: bool,
+) -> Optional[JSONResponse]:
+    if not key:
+        return None
+
+    service = IdempotencyService(session)
+    request_hash = service.fingerprint(jsonable_encoder(request))
+    try:
+        if reserve:
+            stored = service.begin(scope, key, request_hash)
+        else:
+            stored = service.replay(scope, key, request_hash)
+    except IdempotencyKeyReused as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except IdempotencyRequestInProgress as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+    if stored is None:
+        return None
+    return JSONResponse(
+        status_code=stored.status_code,
+        content=stored.body,
+        media_type="application/json; charset=utf-8",
+        headers={"Idempotent-Replayed": "true"},
+    )
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.schemas.inventory import InventoryEquipRequest, InventoryUnequipRequest
 from app.services.inventory_service import (
+    INVENTORY_FIELDS,
+    INVENTORY_PAGE_SIZE,
+    InventoryFilters,
     build_inventory_public,
     equip_inventory_item,
+    list_inventory_page,
     unequip_inventory_item,
 )
 from app.auth.dependencies import require_player_access
@@ -19,11 +25,34 @@ router = APIRouter(prefix="/player/{player_id}/inventory", tags=["inventory"])
 @router.get("")
 async def get_inventory(
     player_id: int,
+    limit: int = Query(INVENTORY_PAGE_SIZE, ge=1, le=200),
+    cursor: Optional[int] = Query(None, ge=0),
+    slot: Optional[str] = None,
+    rarity: Optional[str] = None,
+    equipped: Optional[bool] = None,
+    cosmetic: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated list of item fields to return"),
     db: AsyncSession = Depends(get_db),
     _user=Depends(require_player_access),
 ):
-    """Return full inventory for the given player."""
-    return await build_inventory_public(db, player_id)
+    """Return one page of the player's inventory, optionally filtered and trimmed to selected fields."""
+    selected_fields = INVENTORY_FIELDS
+    if fields:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = sorted(set(requested) - set(INVENTORY_FIELDS))
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown inventory fields: {', '.join(unknown)}")
+        selected_fields = tuple(field for field in INVENTORY_FIELDS if field in requested)
+
+    filters = InventoryFilters(slot=slot, rarity=rarity, equipped=equipped, cosmetic=cosmetic)
+    return await list_inventory_page(
+        db,
+        player_id,
+        limit=limit,
+        cursor=cursor,
+        filters=filters,
+        fields=selected_fields,
+    )
 
 
 @router.post("/equip")
@@ -34,15 +63,17 @@ async def equip_item(
     _user=Depends(require_player_access),
 ):
     """Equip the specified item and return updated inventory state."""
-    item = await equip_inventory_item(db, player_id, payload.item_id)
-    if item is None:
+    # the guarded UPDATE goes first: an unknown item costs one statement, and the inventory read
+    # below already sees the new flags
+    changes = await equip_inventory_item(db, player_id, payload.item_id)
+    if changes is None:
         raise HTTPException(status_code=404, detail="Item not found for this player")
 
-    await db.commit()
     inventory_state = await build_inventory_public(db, player_id)
+    await db.commit()
     return {
         "status": "equipped",
-        "equipped_item_id": item.id,
+        "equipped_item_id": payload.item_id,
         "inventory": inventory_state["items"],
         "base_stats": inventory_state["base_stats"],
     }
@@ -56,15 +87,17 @@ async def unequip_item(
     _user=Depends(require_player_access),
 ):
     """Unequip the specified item and return updated inventory state."""
-    item = await unequip_inventory_item(db, player_id, payload.item_id)
-    if item is None:
+    # the guarded UPDATE goes first: an unknown item costs one statement, and the inventory read
+    # below already sees the new flags
+    changes = await unequip_inventory_item(db, player_id, payload.item_id)
+    if changes is None:
         raise HTTPException(status_code=404, detail="Item not found for this player")
 
-    await db.commit()
     inventory_state = await build_inventory_public(db, player_id)
+    await db.commit()
     return {
         "status": "unequipped",
-        "unequipped_item_id": item.id,
+        "unequipped_item_id": payload.item_id,
         "inventory": inventory_state["items"],
         "base_stats": inventory_state["base_stats"],
     }
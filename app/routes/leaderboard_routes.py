@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.auth.dependencies import get_current_user
+from app.constants.leaderboard import (
+    LEADERBOARD_BOARDS,
+    LEADERBOARD_DEFAULT_AROUND,
+    LEADERBOARD_DEFAULT_LIMIT,
+    LEADERBOARD_MAX_AROUND,
+    LEADERBOARD_MAX_LIMIT,
+)
+from app.db.base import get_session
+from app.schemas.leaderboard import LeaderboardEntry, LeaderboardPage, LeaderboardStanding
+from app.services.leaderboard_service import RankedPlayer, leaderboards
+
+
+router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
+
+
+def _board_name(board: str) -> str:
+    if board not in LEADERBOARD_BOARDS:
+        raise HTTPException(status_code=404, detail="Рейтинг не знайдено.")
+    return board
+
+
+def _entry(ranked: RankedPlayer) -> LeaderboardEntry:
+    value, *rest = ranked.score
+    return LeaderboardEntry(
+        rank=ranked.rank,
+        player_id=ranked.player_id,
+        username=ranked.username,
+        value=value,
+        xp=rest[0] if rest else None,
+    )
+
+
+@router.get("/{board}", response_model=LeaderboardPage)
+def get_leaderboard(
+    board: str,
+    limit: int = Query(LEADERBOARD_DEFAULT_LIMIT, ge=1, le=LEADERBOARD_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    session: Session = Depends(get_session),
+    _user=Depends(get_current_user),
+):
+    """Top players of `level`, `farming` or `gold`, best first; ties go to the older account."""
+    board = _board_name(board)
+    leaderboards.ensure_loaded(session)
+    total, ranked = leaderboards.top(board, limit, offset)
+    return LeaderboardPage(board=board, total=total, entries=[_entry(entry) for entry in ranked])
+
+
+@router.get("/{board}/players/{player_id}", response_model=LeaderboardStanding)
+def get_player_standing(
+    board: str,
+    player_id: int,
+    around: int = Query(LEADERBOARD_DEFAULT_AROUND, ge=0, le=LEADERBOARD_MAX_AROUND),
+    session: Session = Depends(get_session),
+    _user=Depends(get_current_user),
+):
+    """A player's rank with up to `around` neighbours above and below."""
+    board = _board_name(board)
+    leaderboards.ensure_loaded(session)
+    standing = leaderboards.standing(board, player_id, around)
+    if standing is None:
+        raise HTTPException(status_code=404, detail="Гравця немає в цьому рейтингу.")
+    return LeaderboardStanding(
+        board=board,
+        total=standing.total,
+        entry=_entry(standing.player),
+        neighbours=[_entry(entry) for entry in standing.neighbours],
+    )
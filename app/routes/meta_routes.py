@@ -1,11 +1,48 @@
 from __future__ import annotations
 
+from typing import Iterable
+
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.db.base import engine
+from app.db.query_stats import route_query_stats
+from app.db.session import ASYNC_ENGINE
+from app.utils.metrics import CONTENT_TYPE, REGISTRY, Sample
 
 
 router = APIRouter()
 
 
+def _pool_samples() -> Iterable[Sample]:
+    for name, pool in (("sync", engine.pool), ("async", ASYNC_ENGINE.sync_engine.pool)):
+        for state in ("checkedout", "checkedin", "overflow", "size"):
+            read = getattr(pool, state, None)
+            if callable(read):
+                yield {"engine": name, "state": state}, read()
+
+
+def _db_statement_samples() -> Iterable[Sample]:
+    for (method, route), totals in sorted(route_query_stats.snapshot().items()):
+        yield {"method": method, "route": route}, totals.statements
+
+
+def _db_seconds_samples() -> Iterable[Sample]:
+    for (method, route), totals in sorted(route_query_stats.snapshot().items()):
+        yield {"method": method, "route": route}, totals.db_seconds
+
+
+REGISTRY.collector("app_db_pool_connections", "gauge", "SQLAlchemy pool connections by state", _pool_samples)
+REGISTRY.collector("app_db_statements_total", "counter", "SQL statements issued per route", _db_statement_samples)
+REGISTRY.collector("app_db_seconds_total", "counter", "Time spent in SQL per route", _db_seconds_samples)
+
+
 @router.get("/health")
 def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text format for this worker process."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
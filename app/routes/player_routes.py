@@ -9,7 +9,6 @@ from app.db.models.inventory import InventoryItem
 from app.db.models.player import Player
 from app.db.models.wallet import Wallet
 from app.schemas.player import PlayerCreateRequest, PlayerProfile
-from app.services.farm_service import FarmService
 from app.services.onboarding_service import OnboardingService
 from app.services.quest_content_service import QuestContentService
 from app.services.player_profile import build_player_profile
@@ -46,7 +45,6 @@ def create_player(
             session.add(wallet)
             session.commit()
         session.refresh(player)
-        FarmService(session).get_farm_state(player.id)
         OnboardingService(session).ensure_onboarding_content()
         QuestContentService(session).ensure_fallen_crown_saga()
         response.status_code = 200
@@ -69,7 +67,6 @@ def create_player(
     session.add(wallet)
     session.commit()
     session.refresh(player)
-    FarmService(session).get_farm_state(player.id)
     OnboardingService(session).ensure_onboarding_content()
     QuestContentService(session).ensure_fallen_crown_saga()
     return build_player_profile(player)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.orm import Session
 
 from app.db.base import get_session
@@ -11,6 +11,7 @@ from app.db.models.player import Player
 from app.services.progression_service import DAILY_REWARD_COOLDOWN, ProgressionService
 from app.utils.exceptions import DailyRewardUnavailable
 from app.auth.dependencies import require_player_access
+from app.routes.idempotency import IDEMPOTENCY_HEADER, begin_idempotent, finish_idempotent
 
 
 router = APIRouter(prefix="/player", tags=["reward"])
@@ -21,7 +22,13 @@ def claim_daily_reward(
     player_id: int,
     session: Session = Depends(get_session),
     _user=Depends(require_player_access),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
 ) -> Dict[str, object]:
+    scope = f"reward.daily:{player_id}"
+    replay = begin_idempotent(session, scope, idempotency_key, {})
+    if replay is not None:
+        return replay
+
     player = session.get(Player, player_id)
     if player is None:
         raise HTTPException(status_code=404, detail="Player not found")
@@ -40,9 +47,7 @@ def claim_daily_reward(
             "message": "Ти вже відпочивав нещодавно. Спробуй пізніше.",
         }
 
-    session.commit()
-
-    return {
+    response = {
         "status": "claimed",
         "gained": {
             "energy": reward.energy_gained,
@@ -51,6 +56,9 @@ def claim_daily_reward(
         },
         "message": "Ти відпочив біля вогнища і відчуваєш прилив сил.",
     }
+    finish_idempotent(session, scope, idempotency_key, response)
+    session.commit()
+    return response
 
 
 def _calculate_retry_after(player: Player, now: datetime) -> int:
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
 from app.schemas.shop import ShopPurchaseRequest
-from app.services.shop_service import buy_offer, list_shop_offers
-from app.utils.exceptions import InsufficientFunds, ShopOfferUnavailable
+from app.services.shop_service import buy_offer, list_shop_offers, offer_purchase_queue
+from app.utils.exceptions import InsufficientFunds, ShopOfferSoldOut, ShopOfferUnavailable
+from app.utils.metrics import SHOP_PURCHASES
 from app.auth.dependencies import require_player_access
+from app.routes.idempotency import (
+    IDEMPOTENCY_HEADER,
+    begin_idempotent,
+    finish_idempotent,
+    replay_idempotent,
+)
 
 
 router = APIRouter(prefix="/player/{player_id}/shop", tags=["shop"])
@@ -35,29 +44,52 @@ async def buy_shop_offer(
     payload: ShopPurchaseRequest,
     db: AsyncSession = Depends(get_db),
     _user=Depends(require_player_access),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER),
 ) -> dict:
-    try:
-        wallet, granted = await buy_offer(db, player_id, payload.offer_id)
-    except InsufficientFunds as exc:
-        raise HTTPException(
-            status_code=402,
-            detail={
-                "error": "insufficient_funds",
-                "message": str(exc),
-                "available_gold": exc.available,
-                "required_gold": exc.required,
-            },
-        ) from exc
-    except ShopOfferUnavailable as exc:
-        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    scope = f"shop.buy:{player_id}"
+    if offer_purchase_queue.is_sold_out(payload.offer_id):
+        replay = await db.run_sync(replay_idempotent, scope, idempotency_key, payload)
+        if replay is not None:
+            return replay
+        raise HTTPException(status_code=409, detail="Offer is sold out")
 
-    await db.commit()
+    # the whole transaction runs inside the gate so waiting buyers hold no locks
+    async with offer_purchase_queue.slot(payload.offer_id):
+        replay = await db.run_sync(begin_idempotent, scope, idempotency_key, payload)
+        if replay is not None:
+            return replay
 
-    return {
-        "status": "purchased",
-        "wallet": {
-            "gold": wallet.gold,
-            "gems": 0,
-        },
-        "granted": granted,
-    }
+        try:
+            wallet, granted = await buy_offer(db, player_id, payload.offer_id)
+        except InsufficientFunds as exc:
+            await db.rollback()
+            raise HTTPException(
+                status_code=402,
+                detail={
+                    "error": "insufficient_funds",
+                    "message": str(exc),
+                    "available_gold": exc.available,
+                    "required_gold": exc.required,
+                },
+            ) from exc
+        except ShopOfferSoldOut as exc:
+            await db.rollback()
+            offer_purchase_queue.mark_sold_out(payload.offer_id)
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+        except ShopOfferUnavailable as exc:
+            await db.rollback()
+            raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+        response = {
+            "status": "purchased",
+            "wallet": {
+                "gold": wallet.gold,
+                "gems": 0,
+            },
+            "granted": granted,
+        }
+        await db.run_sync(finish_idempotent, scope, idempotency_key, response)
+        await db.commit()
+    # counted only once the purchase is durable; rolled-back attempts never reach this line
+    SHOP_PURCHASES.inc()
+    return response
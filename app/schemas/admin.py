@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 try:  # Pydantic v2
@@ -8,6 +9,13 @@ except ImportError:  # pragma: no cover - fallback to v1
     from pydantic import BaseModel, Field  # type: ignore
     ConfigDict = None  # type: ignore
 
+from app.constants.profiler import (
+    PROFILER_DEFAULT_INTERVAL_MS,
+    PROFILER_DEFAULT_SECONDS,
+    PROFILER_MAX_SECONDS,
+    PROFILER_MIN_INTERVAL_MS,
+)
+
 
 class _ORMModel(BaseModel):
     """Shared configuration to support both Pydantic v1 and v2."""
@@ -39,6 +47,20 @@ class EquipmentItemPublic(_ORMModel):
     icon: Optional[str]
 
 
+class EquipmentItemSummary(_ORMModel):
+    id: int
+    name: str
+    slot: str
+    rarity: str
+    cosmetic: bool
+    icon: Optional[str]
+
+
+class EquipmentItemPage(BaseModel):
+    items: List[EquipmentItemSummary]
+    next_after: Optional[int] = Field(default=None, description="Передайте як `after`, щоб отримати наступну сторінку")
+
+
 class EquipmentItemUpdate(BaseModel):
     name: Optional[str] = None
     slot: Optional[str] = None
@@ -75,6 +97,24 @@ class PlantTypePublic(_ORMModel):
     icon: Optional[str]
 
 
+class PlantTypeSummary(_ORMModel):
+    id: int
+    name: str
+    growth_seconds: int
+    xp_reward: int
+    energy_cost: int
+    seed_cost: int
+    sell_price: int
+    unlock_level: int
+    unlock_farming_level: int
+    icon: Optional[str]
+
+
+class PlantTypePage(BaseModel):
+    items: List[PlantTypeSummary]
+    next_after: Optional[int] = None
+
+
 class PlantTypeUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -143,15 +183,79 @@ class QuestPublic(_ORMModel):
     nodes: List[QuestNodePublic]
 
 
+class QuestSummary(_ORMModel):
+    id: int
+    title: str
+    is_repeatable: bool
+    start_node_id: Optional[str]
+    node_count: int
+    choice_count: int
+
+
+class QuestSummaryPage(BaseModel):
+    items: List[QuestSummary]
+    next_after: Optional[int] = None
+
+
+class QuestNodeSummary(_ORMModel):
+    id: str
+    title: str
+    is_start: bool
+    is_final: bool
+    choice_count: int
+
+
+class QuestNodePage(BaseModel):
+    items: List[QuestNodeSummary]
+    next_after: Optional[str] = None
+
+
 AdminResponse = Dict[str, Any]
 
 
+class RouteQueryStatsPublic(BaseModel):
+    method: str
+    route: str
+    requests: int
+    statements: int
+    avg_statements: float
+    max_statements: int
+    db_time_ms: float
+    avg_db_time_ms: float
+    rows: int
+    slowest_ms: float
+    slowest_statement: Optional[str]
+
+
+class ProfilerStartRequest(BaseModel):
+    seconds: float = Field(default=PROFILER_DEFAULT_SECONDS, gt=0, le=PROFILER_MAX_SECONDS)
+    interval_ms: float = Field(default=PROFILER_DEFAULT_INTERVAL_MS, ge=PROFILER_MIN_INTERVAL_MS)
+    route: Optional[str] = Field(default=None, description="Шаблон маршруту, напр. /farm/{player_id}")
+    requests: Optional[int] = Field(default=None, gt=0, description="Зупинитися після N запитів до маршруту")
+
+
+class ProfilerStatus(BaseModel):
+    running: bool
+    route: Optional[str]
+    max_requests: Optional[int]
+    requests_seen: int
+    samples: int
+    dropped_samples: int
+    distinct_stacks: int
+    started_at: datetime
+    finished_at: Optional[datetime]
+
+
 __all__ = [
     "EquipmentItemCreate",
     "EquipmentItemPublic",
+    "EquipmentItemSummary",
+    "EquipmentItemPage",
     "EquipmentItemUpdate",
     "PlantTypeCreate",
     "PlantTypePublic",
+    "PlantTypeSummary",
+    "PlantTypePage",
     "PlantTypeUpdate",
     "QuestChoiceCreate",
     "QuestNodeCreate",
@@ -160,5 +264,13 @@ __all__ = [
     "QuestChoicePublic",
     "QuestNodePublic",
     "QuestPublic",
+    "QuestSummary",
+    "QuestSummaryPage",
+    "QuestNodeSummary",
+    "QuestNodePage",
     "AdminResponse",
+    "RouteQueryStatsPublic",
+    "ProfilerStartRequest",
+    "ProfilerStatus",
 ]
+
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class PlantTypePublic(BaseModel):
@@ -77,6 +77,10 @@ class PlantCropRequest(BaseModel):
     plant_type_id: int
 
 
+class PlantBatchRequest(BaseModel):
+    plantings: List[PlantCropRequest] = Field(min_length=1, max_length=32)
+
+
 class HarvestCropRequest(BaseModel):
     plot_id: int
 
@@ -88,3 +92,65 @@ class RefillFarmEnergyRequest(BaseModel):
 class FarmActionResponse(BaseModel):
     state: FarmState
     message: str
+
+
+class FarmPlotActionResult(BaseModel):
+    plot_id: int
+    status: str
+    message: str
+
+
+class FarmBatchActionResponse(BaseModel):
+    state: FarmState
+    results: List[FarmPlotActionResult]
+    message: str
+
+
+FarmResponseView = Literal["full", "compact"]
+
+
+class PlantCatalogEntry(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    growth_seconds: int
+    xp_reward: int
+    energy_cost: int
+    seed_cost: int
+    sell_price: int
+    unlock_level: int
+    unlock_farming_level: int
+    icon: Optional[str]
+
+
+class PlantCatalog(BaseModel):
+    plants: List[PlantCatalogEntry]
+
+
+class PlantedCropCompact(BaseModel):
+    id: int
+    plant_type_id: int
+    planted_at: datetime
+    ready_at: datetime
+    state: str
+
+
+class FarmPlotCompact(BaseModel):
+    id: int
+    slot_index: int
+    unlocked: bool
+    crop: Optional[PlantedCropCompact]
+
+
+class FarmStateChanges(BaseModel):
+    player_id: int
+    player_level: int
+    stats: FarmingStatsPublic
+    plots: List[FarmPlotCompact]
+    wallet_gold: int
+
+
+class FarmCompactActionResponse(BaseModel):
+    changes: FarmStateChanges
+    message: str
+    results: Optional[List[FarmPlotActionResult]] = None
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    player_id: int
+    username: Optional[str]
+    # рівень / рівень фермерства / золото
+    value: int
+    # XP усередині рівня; для рейтингу золота відсутній
+    xp: Optional[int] = None
+
+
+class LeaderboardPage(BaseModel):
+    board: str
+    total: int
+    entries: List[LeaderboardEntry]
+
+
+class LeaderboardStanding(BaseModel):
+    board: str
+    total: int
+    entry: LeaderboardEntry
+    neighbours: List[LeaderboardEntry]
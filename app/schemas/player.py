@@ -15,6 +15,7 @@ class InventoryItemPublic(BaseModel):
     rarity: str
     cosmetic: bool
     is_equipped: bool
+    quantity: int = 1
     icon: Optional[str] = None
     description: Optional[str] = None
 
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import Select, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.db.models.farm import PlantType
-from app.db.models.inventory import InventoryItemCatalog
+from app.db.models.inventory import InventoryItem, InventoryItemCatalog
 from app.db.models.quest import Quest, QuestChoice, QuestNode, QuestProgress
 from app.schemas.admin import (
     EquipmentItemCreate,
@@ -25,6 +25,41 @@ def _model_dump(model, *, exclude_unset: bool = False) -> dict:
     return model.dict(exclude_unset=exclude_unset)
 
 
+async def _keyset_page(
+    session: AsyncSession,
+    statement: Select,
+    key_column: Any,
+    after: Optional[Any],
+    limit: int,
+) -> Tuple[Sequence[Any], Optional[Any]]:
+    """Rows after ``after`` in key order plus the key to pass for the next page (None on the last)."""
+    if after is not None:
+        statement = statement.where(key_column > after)
+    # one extra row tells whether another page exists without a COUNT over the table
+    result = await session.execute(statement.order_by(key_column).limit(limit + 1))
+    rows = result.all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, rows[-1].id
+
+
+async def page_equipment_items(
+    session: AsyncSession,
+    after: Optional[int],
+    limit: int,
+) -> Tuple[Sequence[Any], Optional[int]]:
+    statement = select(
+        InventoryItemCatalog.id,
+        InventoryItemCatalog.name,
+        InventoryItemCatalog.slot,
+        InventoryItemCatalog.rarity,
+        InventoryItemCatalog.cosmetic,
+        InventoryItemCatalog.icon,
+    )
+    return await _keyset_page(session, statement, InventoryItemCatalog.id, after, limit)
+
+
 async def list_equipment_items(session: AsyncSession) -> List[InventoryItemCatalog]:
     statement = select(InventoryItemCatalog).order_by(InventoryItemCatalog.id)
     result = await session.execute(statement)
@@ -55,11 +90,39 @@ async def update_equipment_item(
     for field, value in data.items():
         setattr(item, field, value)
 
+    if data.get("slot") is not None:
+        # inventory rows carry a copy of the slot for indexed equip queries
+        await session.execute(
+            update(InventoryItem)
+            .where(InventoryItem.catalog_item_id == item.id)
+            .values(slot=item.slot)
+        )
+
     await session.flush()
     await session.refresh(item)
     return item
 
 
+async def page_plants(
+    session: AsyncSession,
+    after: Optional[int],
+    limit: int,
+) -> Tuple[Sequence[Any], Optional[int]]:
+    statement = select(
+        PlantType.id,
+        PlantType.name,
+        PlantType.growth_seconds,
+        PlantType.xp_reward,
+        PlantType.energy_cost,
+        PlantType.seed_cost,
+        PlantType.sell_price,
+        PlantType.unlock_level,
+        PlantType.unlock_farming_level,
+        PlantType.icon,
+    )
+    return await _keyset_page(session, statement, PlantType.id, after, limit)
+
+
 async def list_plants(session: AsyncSession) -> List[PlantType]:
     statement = select(PlantType).order_by(PlantType.id)
     result = await session.execute(statement)
@@ -106,6 +169,76 @@ async def list_quests(session: AsyncSession) -> List[Quest]:
     return list(quests)
 
 
+async def page_quest_summaries(
+    session: AsyncSession,
+    after: Optional[int],
+    limit: int,
+) -> Tuple[Sequence[Any], Optional[int]]:
+    """Quest headers with node/choice counts; node bodies and choices stay in the database."""
+    node_count = select(func.count(QuestNode.id)).where(QuestNode.quest_id == Quest.id).scalar_subquery()
+    choice_count = (
+        select(func.count(QuestChoice.id))
+        .join(QuestNode, QuestNode.id == QuestChoice.node_id)
+        .where(QuestNode.quest_id == Quest.id)
+        .scalar_subquery()
+    )
+    start_node_id = (
+        select(QuestNode.id)
+        .where(QuestNode.quest_id == Quest.id, QuestNode.is_start.is_(True))
+        .order_by(QuestNode.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    statement = select(
+        Quest.id,
+        Quest.title,
+        Quest.is_repeatable,
+        start_node_id.label("start_node_id"),
+        node_count.label("node_count"),
+        choice_count.label("choice_count"),
+    )
+    return await _keyset_page(session, statement, Quest.id, after, limit)
+
+
+async def get_quest(session: AsyncSession, quest_id: int) -> Quest | None:
+    statement = (
+        select(Quest)
+        .options(selectinload(Quest.nodes).selectinload(QuestNode.choices))
+        .where(Quest.id == quest_id)
+    )
+    result = await session.execute(statement)
+    return result.scalars().unique().one_or_none()
+
+
+async def page_quest_nodes(
+    session: AsyncSession,
+    quest_id: int,
+    after: Optional[str],
+    limit: int,
+) -> Tuple[Sequence[Any], Optional[str]]:
+    choice_count = (
+        select(func.count(QuestChoice.id)).where(QuestChoice.node_id == QuestNode.id).scalar_subquery()
+    )
+    statement = select(
+        QuestNode.id,
+        QuestNode.title,
+        QuestNode.is_start,
+        QuestNode.is_final,
+        choice_count.label("choice_count"),
+    ).where(QuestNode.quest_id == quest_id)
+    return await _keyset_page(session, statement, QuestNode.id, after, limit)
+
+
+async def get_quest_node(session: AsyncSession, quest_id: int, node_id: str) -> QuestNode | None:
+    statement = (
+        select(QuestNode)
+        .options(selectinload(QuestNode.choices))
+        .where(QuestNode.quest_id == quest_id, QuestNode.id == node_id)
+    )
+    result = await session.execute(statement)
+    return result.scalar_one_or_none()
+
+
 async def create_quest(
     session: AsyncSession,
     payload: QuestCreateRequest,
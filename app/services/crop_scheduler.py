@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Sequence
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import SessionLocal
+from app.db.models.farm import FarmPlot, PlantedCrop
+
+
+logger = logging.getLogger(__name__)
+
+CROP_READY_BATCH_SIZE = 500
+CROP_SCHEDULER_MAX_SLEEP_SECONDS = 5.0
+CROP_SCHEDULER_MIN_SLEEP_SECONDS = 0.2
+
+
+@dataclass(frozen=True)
+class CropReadyEvent:
+    crop_id: int
+    plot_id: int
+    player_id: int
+    plant_type_id: int
+    ready_at: datetime
+
+
+CropReadyListener = Callable[[Sequence[CropReadyEvent]], None]
+
+
+def advance_ready_crops(
+    session: Session,
+    now: datetime,
+    limit: int = CROP_READY_BATCH_SIZE,
+) -> List[CropReadyEvent]:
+    """Flip up to ``limit`` due crops from ``growing`` to ``ready`` with a single UPDATE."""
+    due_ids = (
+        select(PlantedCrop.id)
+        .where(PlantedCrop.state == "growing", PlantedCrop.ready_at <= now)
+        .order_by(PlantedCrop.ready_at)
+        .limit(limit)
+        # several workers may run the scheduler; each claims a disjoint batch on Postgres
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(PlantedCrop)
+        .where(PlantedCrop.id.in_(due_ids), PlantedCrop.state == "growing")
+        .values(state="ready")
+        .returning(PlantedCrop.id, PlantedCrop.plot_id, PlantedCrop.plant_type_id, PlantedCrop.ready_at)
+        .execution_options(synchronize_session=False)
+    )
+    flipped = session.execute(stmt).all()
+    if not flipped:
+        return []
+
+    owners = dict(
+        session.execute(
+            select(FarmPlot.id, FarmPlot.player_id).where(FarmPlot.id.in_([row.plot_id for row in flipped]))
+        ).all()
+    )
+    return [
+        CropReadyEvent(
+            crop_id=row.id,
+            plot_id=row.plot_id,
+            player_id=owners.get(row.plot_id),
+            plant_type_id=row.plant_type_id,
+            ready_at=row.ready_at,
+        )
+        for row in flipped
+    ]
+
+
+def next_ready_at(session: Session) -> Optional[datetime]:
+    stmt = select(func.min(PlantedCrop.ready_at)).where(PlantedCrop.state == "growing")
+    value = session.execute(stmt).scalar()
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class CropReadyScheduler:
+    """Stores the ``ready`` state of due crops in batches and tells subscribers about it.
+
+    Reads never depend on the scheduler (``PlantedCrop.state_at`` computes the state), so it can be
+    disabled or lag behind. Listeners run on the scheduler's worker thread after the batch is
+    committed; hand the events off to a queue if the consumer is slow.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session] = SessionLocal,
+        *,
+        batch_size: int = CROP_READY_BATCH_SIZE,
+        max_sleep_seconds: float = CROP_SCHEDULER_MAX_SLEEP_SECONDS,
+    ) -> None:
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_sleep_seconds = max_sleep_seconds
+        self._listeners: List[CropReadyListener] = []
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def subscribe(self, listener: CropReadyListener) -> Callable[[], None]:
+        self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def run_once(self, now: Optional[datetime] = None) -> List[CropReadyEvent]:
+        """Advance every crop that is due at ``now``; returns the published events."""
+        events, _ = self._tick(now or datetime.now(timezone.utc))
+        return events
+
+    def _tick(self, now: datetime) -> tuple[List[CropReadyEvent], Optional[datetime]]:
+        published: List[CropReadyEvent] = []
+        with self._session_factory() as session:
+            while True:
+                events = advance_ready_crops(session, now, self.batch_size)
+                session.commit()
+                if events:
+                    self._publish(events)
+                    published.extend(events)
+                if len(events) < self.batch_size:
+                    break
+            upcoming = next_ready_at(session)
+        return published, upcoming
+
+    def _publish(self, events: Sequence[CropReadyEvent]) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(events)
+            except Exception:  # noqa: BLE001 - a broken subscriber must not stop the scheduler
+                logger.exception("Crop ready listener %r failed", listener)
+
+    def _sleep_seconds(self, now: datetime, upcoming: Optional[datetime]) -> float:
+        if upcoming is None:
+            return self.max_sleep_seconds
+        until_due = (upcoming - now).total_seconds()
+        return min(self.max_sleep_seconds, max(CROP_SCHEDULER_MIN_SLEEP_SECONDS, until_due))
+
+    async def _run_forever(self) -> None:
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                _, upcoming = await asyncio.to_thread(self._tick, now)
+                delay = self._sleep_seconds(datetime.now(timezone.utc), upcoming)
+            except Exception:  # noqa: BLE001 - keep the loop alive across transient DB errors
+                logger.exception("Crop ready scheduler tick failed")
+                delay = self.max_sleep_seconds
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+crop_ready_scheduler = CropReadyScheduler()
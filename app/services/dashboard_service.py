@@ -7,7 +7,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.schemas.quest import QuestNodePublic
-from app.services.inventory_service import build_inventory_public
+from app.services.inventory_service import (
+    build_inventory_preview,
+    has_unequipped_items,
+    list_inventory_page,
+)
 from app.services.player_service import create_player_if_not_exists
 from app.services.progression_service import DAILY_REWARD_COOLDOWN, ProgressionService
 from app.services.quest_content_service import QuestContentService
@@ -41,10 +45,10 @@ async def build_dashboard(db: AsyncSession, player_id: int) -> Dict[str, Any]:
         quest_node = await _load_current_quest_node(db, player_id, seed_saga=True)
     quest_data = _format_quest_node(quest_node)
 
-    inventory_state = await build_inventory_public(db, player_id)
-    inventory_items = inventory_state.get("items", [])
-    inventory_preview = _build_inventory_preview(inventory_items)
-    pending_actions = _build_pending_actions(player, inventory_items)
+    inventory_state = await list_inventory_page(db, player_id)
+    inventory_preview = await build_inventory_preview(db, player_id)
+    can_equip_new_item = await has_unequipped_items(db, player_id)
+    pending_actions = _build_pending_actions(player, can_equip_new_item)
     await _log_dashboard_visit(db, player_id)
 
     milestone = ProgressionService.build_milestone(player)
@@ -117,23 +121,8 @@ def _format_quest_node(node: Optional[QuestNodePublic]) -> Dict[str, Any]:
     return quest_dict
 
 
-def _build_inventory_preview(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    if not items:
-        return []
-    sorted_items = sorted(
-        items,
-        key=lambda entry: (
-            not entry.get("is_equipped", False),
-            entry.get("slot") or "",
-            entry.get("name") or "",
-        ),
-    )
-    return sorted_items[:4]
-
-
-def _build_pending_actions(player: Any, inventory: List[Dict[str, Any]]) -> Dict[str, bool]:
+def _build_pending_actions(player: Any, you_can_equip_new_item: bool) -> Dict[str, bool]:
     you_have_unspent_points = player.energy >= player.max_energy
-    you_can_equip_new_item = any(not item.get("is_equipped", False) for item in inventory)
 
     return {
         "you_have_unspent_points": you_have_unspent_points,
@@ -0,0 +1,171 @@
+"""Streaming exports of player state for analytics.
+
+Every dataset is read in keyset-paginated pages (``WHERE key > :last ORDER BY key LIMIT n``) and
+each page is consumed through a server-side cursor (``stream`` + ``yield_per``), so memory stays
+flat whatever the table size and no query scans past the rows it returns. Rows are encoded as
+NDJSON or CSV and optionally gzip-compressed on the fly.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import ColumnElement, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.export import EXPORT_GZIP_LEVEL, EXPORT_PAGE_SIZE, EXPORT_YIELD_PER
+from app.db.models.farm import FarmPlot, PlantedCrop, PlayerFarmingStats
+from app.db.models.inventory import InventoryItem, InventoryItemCatalog
+from app.db.models.player import Player
+from app.db.models.wallet import Wallet
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+class UnknownExportColumns(ValueError):
+    def __init__(self, columns: Iterable[str]) -> None:
+        self.columns = sorted(columns)
+        super().__init__(f"Unknown export columns: {', '.join(self.columns)}")
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    name: str
+    source: Any
+    columns: Dict[str, ColumnElement]
+    # unique, indexed output column the pages are keyed on
+    key: str
+
+    def resolve(self, requested: Optional[Sequence[str]]) -> Tuple[str, ...]:
+        if not requested:
+            return tuple(self.columns)
+        unknown = set(requested) - set(self.columns)
+        if unknown:
+            raise UnknownExportColumns(unknown)
+        return tuple(name for name in self.columns if name in requested)
+
+
+def _table_columns(model) -> Dict[str, ColumnElement]:
+    return {column.name: column for column in model.__table__.columns}
+
+
+EXPORT_DATASETS: Dict[str, ExportDataset] = {
+    dataset.name: dataset
+    for dataset in (
+        ExportDataset("players", Player.__table__, _table_columns(Player), key="id"),
+        ExportDataset("wallets", Wallet.__table__, _table_columns(Wallet), key="player_id"),
+        ExportDataset("farm_stats", PlayerFarmingStats.__table__, _table_columns(PlayerFarmingStats), key="player_id"),
+        ExportDataset(
+            "farm_plots",
+            FarmPlot.__table__.outerjoin(PlantedCrop.__table__, PlantedCrop.plot_id == FarmPlot.id),
+            {
+                **_table_columns(FarmPlot),
+                "crop_plant_type_id": PlantedCrop.plant_type_id,
+                "crop_state": PlantedCrop.state,
+                "crop_planted_at": PlantedCrop.planted_at,
+                "crop_ready_at": PlantedCrop.ready_at,
+            },
+            key="id",
+        ),
+        ExportDataset(
+            "inventory",
+            InventoryItem.__table__.join(InventoryItemCatalog.__table__, InventoryItemCatalog.id == InventoryItem.catalog_item_id),
+            {
+                **_table_columns(InventoryItem),
+                "item_name": InventoryItemCatalog.name,
+                "item_rarity": InventoryItemCatalog.rarity,
+                "item_cosmetic": InventoryItemCatalog.cosmetic,
+            },
+            key="id",
+        ),
+    )
+}
+
+
+async def iter_dataset_rows(
+    session: AsyncSession,
+    dataset: ExportDataset,
+    columns: Sequence[str],
+    *,
+    after: Optional[Any] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+    yield_per: int = EXPORT_YIELD_PER,
+) -> AsyncIterator[List[Tuple[Any, ...]]]:
+    """Yield lists of row tuples (in ``columns`` order), at most ``yield_per`` rows each."""
+    key_column = dataset.columns[dataset.key]
+    selected = list(columns) if dataset.key in columns else [*columns, dataset.key]
+    key_position = selected.index(dataset.key)
+    trim = len(selected) != len(columns)
+    last_key = after
+    while True:
+        stmt = (
+            select(*(dataset.columns[name].label(name) for name in selected))
+            .select_from(dataset.source)
+            .order_by(key_column)
+            .limit(page_size)
+            .execution_options(yield_per=yield_per)
+        )
+        if last_key is not None:
+            stmt = stmt.where(key_column > last_key)
+        result = await session.stream(stmt)
+        page_rows = 0
+        async for partition in result.partitions():
+            page_rows += len(partition)
+            last_key = partition[-1][key_position]
+            yield [tuple(row[:-1]) if trim else tuple(row) for row in partition]
+        if page_rows < page_size:
+            return
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode_ndjson(columns: Sequence[str], rows: Iterable[Tuple[Any, ...]]) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=_json_default) + "\n" for row in rows
+    )
+
+
+def _encode_csv(rows: Iterable[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows([value.isoformat() if isinstance(value, datetime) else value for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def export_dataset(
+    session: AsyncSession,
+    dataset: ExportDataset,
+    columns: Sequence[str],
+    *,
+    fmt: str = "ndjson",
+    compress: bool = False,
+    after: Optional[Any] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> AsyncIterator[bytes]:
+    """Encoded export chunks, one per cursor partition; gzip members when ``compress`` is set."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    compressor = zlib.compressobj(EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+
+    def emit(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor is not None else data
+
+    if fmt == "csv":
+        yield emit(_encode_csv([columns]))
+    async for rows in iter_dataset_rows(session, dataset, columns, after=after, page_size=page_size):
+        chunk = emit(_encode_ndjson(columns, rows) if fmt == "ndjson" else _encode_csv(rows))
+        if chunk:
+            yield chunk
+    if compressor is not None:
+        yield compressor.flush()
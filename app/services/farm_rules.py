@@ -0,0 +1,224 @@
+"""Farm economy rules shared by ``FarmService`` and the offline simulator.
+
+Everything here is pure: no sessions, no models, no clock. Functions that update progress take
+any object with the ``PlayerFarmingStats`` attribute names, so the service passes its ORM row and
+the simulator passes a plain dataclass.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Protocol, Tuple, TypeVar
+
+
+DEFAULT_PLANTS: Tuple[Dict[str, object], ...] = (
+    {
+        "name": "Соковита морква",
+        "description": "Невибаглива культура для перших врожаїв.",
+        "growth_seconds": 900,
+        "xp_reward": 25,
+        "energy_cost": 2,
+        "seed_cost": 0,
+        "sell_price": 35,
+        "unlock_level": 1,
+        "unlock_farming_level": 1,
+        "icon": "plant_carrot_common",
+    },
+    {
+        "name": "Вербена зоряного сяйва",
+        "description": "Легендарна трава, що краще росте поруч із реальними овочами.",
+        "growth_seconds": 1500,
+        "xp_reward": 40,
+        "energy_cost": 3,
+        "seed_cost": 55,
+        "sell_price": 110,
+        "unlock_level": 2,
+        "unlock_farming_level": 2,
+        "icon": "plant_starverbena_uncommon",
+    },
+    {
+        "name": "Медова полуниця",
+        "description": "Швидко росте та додає вітамінів.",
+        "growth_seconds": 1800,
+        "xp_reward": 45,
+        "energy_cost": 3,
+        "seed_cost": 40,
+        "sell_price": 95,
+        "unlock_level": 3,
+        "unlock_farming_level": 2,
+        "icon": "plant_strawberry_rare",
+    },
+    {
+        "name": "Сонячний гарбуз-глорія",
+        "description": "Гібрид гарбуза і фантазійного світляка, світиться уночі.",
+        "growth_seconds": 2700,
+        "xp_reward": 70,
+        "energy_cost": 4,
+        "seed_cost": 85,
+        "sell_price": 190,
+        "unlock_level": 4,
+        "unlock_farming_level": 3,
+        "icon": "plant_pumpkin_gloria",
+    },
+    {
+        "name": "Місячна лаванда",
+        "description": "Рослина для досвідчених фермерів. Дає багато досвіду.",
+        "growth_seconds": 3600,
+        "xp_reward": 110,
+        "energy_cost": 4,
+        "seed_cost": 120,
+        "sell_price": 260,
+        "unlock_level": 6,
+        "unlock_farming_level": 4,
+        "icon": "plant_lavender_epic",
+    },
+)
+
+TOOL_UPGRADES: Tuple[Dict[str, object], ...] = (
+    {
+        "level": 1,
+        "name": "Дерев'яна сапка",
+        "bonus_percent": 0,
+        "cost": 0,
+        "required_farming_level": 1,
+    },
+    {
+        "level": 2,
+        "name": "Бронзова сапка",
+        "bonus_percent": 10,
+        "cost": 250,
+        "required_farming_level": 2,
+    },
+    {
+        "level": 3,
+        "name": "Срібна сапка",
+        "bonus_percent": 20,
+        "cost": 600,
+        "required_farming_level": 4,
+    },
+    {
+        "level": 4,
+        "name": "Кришталевий культиватор",
+        "bonus_percent": 35,
+        "cost": 1200,
+        "required_farming_level": 6,
+    },
+)
+
+BASE_PLOTS = 3
+TOTAL_PLOTS = 8
+BASE_PLOT_UNLOCK_COST = 400
+FARM_XP_BASE_THRESHOLD = 80
+FARM_XP_GROWTH_FACTOR = 1.22
+FARM_ENERGY_GOLD_PER_POINT = 25
+FARM_ENERGY_MAX_CAP = 60
+FARM_ENERGY_REGEN_SECONDS = 600  # пасивна регенерація: 1 енергія кожні 10 хвилин
+
+PLOT_UNLOCK_COST_STEP = 250
+FARM_LEVEL_UP_ENERGY_BONUS = 2
+MIN_GROWTH_SECONDS = 60
+
+Moment = TypeVar("Moment", datetime, float)
+
+
+class FarmProgress(Protocol):
+    level: int
+    xp: int
+    energy: int
+    max_energy: int
+
+
+@dataclass(frozen=True)
+class PlotTerms:
+    unlocked: bool
+    unlock_cost: int
+    unlock_level_requirement: int
+    unlock_farming_level_requirement: int
+
+
+def apply_tool_bonus(base_seconds: int, bonus_percent: int) -> int:
+    if bonus_percent <= 0:
+        return base_seconds
+    reduction = base_seconds * bonus_percent // 100
+    return max(MIN_GROWTH_SECONDS, base_seconds - reduction)
+
+
+def xp_required_for_next_level(level: int) -> int:
+    threshold = FARM_XP_BASE_THRESHOLD * (FARM_XP_GROWTH_FACTOR ** (level - 1))
+    return max(10, int(threshold))
+
+
+def grant_farming_xp(progress: FarmProgress, amount: int) -> Tuple[int, int]:
+    """Add ``amount`` XP and apply every level-up it pays for; returns ``(xp_gain, levels_gained)``."""
+    if amount <= 0:
+        return 0, 0
+
+    progress.xp += amount
+    levels_gained = 0
+    while progress.xp >= xp_required_for_next_level(progress.level):
+        progress.xp -= xp_required_for_next_level(progress.level)
+        progress.level += 1
+        levels_gained += 1
+        progress.max_energy = min(FARM_ENERGY_MAX_CAP, progress.max_energy + FARM_LEVEL_UP_ENERGY_BONUS)
+        progress.energy = min(progress.max_energy, progress.energy + FARM_LEVEL_UP_ENERGY_BONUS)
+    return amount, levels_gained
+
+
+def regen_energy(
+    energy: int,
+    max_energy: int,
+    last_refill_at: Optional[Moment],
+    now: Moment,
+) -> Tuple[int, Moment]:
+    """Passive regeneration in closed form, so any offline period costs the same to catch up.
+
+    Works with ``datetime`` moments (the service) and float seconds (the simulator). Returns the
+    new energy and the moment the next regeneration point starts counting from.
+    """
+    if energy >= max_energy or last_refill_at is None:
+        return energy, now
+
+    elapsed = now - last_refill_at
+    elapsed_seconds = elapsed.total_seconds() if isinstance(elapsed, timedelta) else elapsed
+    if elapsed_seconds < FARM_ENERGY_REGEN_SECONDS:
+        return energy, last_refill_at
+
+    energy_points = int(elapsed_seconds // FARM_ENERGY_REGEN_SECONDS)
+    energy = min(max_energy, energy + energy_points)
+    if energy >= max_energy:
+        return energy, now
+    consumed_seconds = energy_points * FARM_ENERGY_REGEN_SECONDS
+    if isinstance(last_refill_at, datetime):
+        return energy, last_refill_at + timedelta(seconds=consumed_seconds)
+    return energy, last_refill_at + consumed_seconds
+
+
+def plot_terms(slot_index: int) -> PlotTerms:
+    if slot_index <= BASE_PLOTS:
+        return PlotTerms(
+            unlocked=True,
+            unlock_cost=0,
+            unlock_level_requirement=1,
+            unlock_farming_level_requirement=1,
+        )
+    return PlotTerms(
+        unlocked=False,
+        unlock_cost=BASE_PLOT_UNLOCK_COST + (slot_index - BASE_PLOTS) * PLOT_UNLOCK_COST_STEP,
+        unlock_level_requirement=max(1, slot_index),
+        unlock_farming_level_requirement=max(1, slot_index // 2 + 1),
+    )
+
+
+PLOT_SLOT_RULES: Tuple[PlotTerms, ...] = tuple(plot_terms(slot) for slot in range(1, TOTAL_PLOTS + 1))
+
+
+def find_tool_upgrade(tool_level: int) -> Optional[Dict[str, object]]:
+    for upgrade in TOOL_UPGRADES:
+        if upgrade["level"] == tool_level:
+            return upgrade
+    return None
+
+
+def is_plant_unlocked(player_level: int, farming_level: int, unlock_level: int, unlock_farming_level: int) -> bool:
+    return player_level >= unlock_level and farming_level >= unlock_farming_level
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, load_only, make_transient_to_detached, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.db.models.farm import FarmPlot, PlantType, PlantedCrop, PlayerFarmingStats
 from app.db.models.player import Player
 from app.db.models.wallet import Wallet
+from app.services import farm_rules
+from app.services.farm_rules import BASE_PLOTS, DEFAULT_PLANTS, FARM_ENERGY_GOLD_PER_POINT, TOTAL_PLOTS
+from app.services.plant_catalog_cache import plant_catalog_cache
 from app.utils.exceptions import (
     FarmPlantLocked,
+    GameLogicError,
     FarmPlotEmpty,
     FarmPlotLocked,
     FarmPlotOccupied,
@@ -19,120 +25,58 @@ from app.utils.exceptions import (
     InsufficientFunds,
     NotEnoughFarmEnergy,
 )
+from app.utils.metrics import CROPS_HARVESTED, CROPS_PLANTED
 
 
-DEFAULT_PLANTS: Tuple[Dict[str, object], ...] = (
-    {
-        "name": "Соковита морква",
-        "description": "Невибаглива культура для перших врожаїв.",
-        "growth_seconds": 900,
-        "xp_reward": 25,
-        "energy_cost": 2,
-        "seed_cost": 0,
-        "sell_price": 35,
-        "unlock_level": 1,
-        "unlock_farming_level": 1,
-        "icon": "plant_carrot_common",
-    },
-    {
-        "name": "Вербена зоряного сяйва",
-        "description": "Легендарна трава, що краще росте поруч із реальними овочами.",
-        "growth_seconds": 1500,
-        "xp_reward": 40,
-        "energy_cost": 3,
-        "seed_cost": 55,
-        "sell_price": 110,
-        "unlock_level": 2,
-        "unlock_farming_level": 2,
-        "icon": "plant_starverbena_uncommon",
-    },
-    {
-        "name": "Медова полуниця",
-        "description": "Швидко росте та додає вітамінів.",
-        "growth_seconds": 1800,
-        "xp_reward": 45,
-        "energy_cost": 3,
-        "seed_cost": 40,
-        "sell_price": 95,
-        "unlock_level": 3,
-        "unlock_farming_level": 2,
-        "icon": "plant_strawberry_rare",
-    },
-    {
-        "name": "Сонячний гарбуз-глорія",
-        "description": "Гібрид гарбуза і фантазійного світляка, світиться уночі.",
-        "growth_seconds": 2700,
-        "xp_reward": 70,
-        "energy_cost": 4,
-        "seed_cost": 85,
-        "sell_price": 190,
-        "unlock_level": 4,
-        "unlock_farming_level": 3,
-        "icon": "plant_pumpkin_gloria",
-    },
-    {
-        "name": "Місячна лаванда",
-        "description": "Рослина для досвідчених фермерів. Дає багато досвіду.",
-        "growth_seconds": 3600,
-        "xp_reward": 110,
-        "energy_cost": 4,
-        "seed_cost": 120,
-        "sell_price": 260,
-        "unlock_level": 6,
-        "unlock_farming_level": 4,
-        "icon": "plant_lavender_epic",
-    },
-)
+@dataclass
+class LockedPlot:
+    """A slot the player has not bought yet. It has no row; ``unlock_plot`` inserts one."""
+
+    player_id: int
+    slot_index: int
+    unlock_cost: int
+    unlock_level_requirement: int
+    unlock_farming_level_requirement: int
+    unlocked: bool = False
+    crop: None = None
+
+    @property
+    def id(self) -> int:
+        # negative, so it never collides with a stored plot id and still routes to this slot
+        return -self.slot_index
+
+    @classmethod
+    def for_slot(cls, player_id: int, slot_index: int) -> "LockedPlot":
+        terms = farm_rules.PLOT_SLOT_RULES[slot_index - 1]
+        return cls(
+            player_id=player_id,
+            slot_index=slot_index,
+            unlock_cost=terms.unlock_cost,
+            unlock_level_requirement=terms.unlock_level_requirement,
+            unlock_farming_level_requirement=terms.unlock_farming_level_requirement,
+        )
 
-TOOL_UPGRADES: Tuple[Dict[str, object], ...] = (
-    {
-        "level": 1,
-        "name": "Дерев'яна сапка",
-        "bonus_percent": 0,
-        "cost": 0,
-        "required_farming_level": 1,
-    },
-    {
-        "level": 2,
-        "name": "Бронзова сапка",
-        "bonus_percent": 10,
-        "cost": 250,
-        "required_farming_level": 2,
-    },
-    {
-        "level": 3,
-        "name": "Срібна сапка",
-        "bonus_percent": 20,
-        "cost": 600,
-        "required_farming_level": 4,
-    },
-    {
-        "level": 4,
-        "name": "Кришталевий культиватор",
-        "bonus_percent": 35,
-        "cost": 1200,
-        "required_farming_level": 6,
-    },
-)
 
-BASE_PLOTS = 3
-TOTAL_PLOTS = 8
-BASE_PLOT_UNLOCK_COST = 400
-FARM_XP_BASE_THRESHOLD = 80
-FARM_XP_GROWTH_FACTOR = 1.22
-FARM_ENERGY_GOLD_PER_POINT = 25
-FARM_ENERGY_MAX_CAP = 60
-FARM_ENERGY_REGEN_SECONDS = 600  # пасивна регенерація: 1 енергія кожні 10 хвилин
+PlotView = Union[FarmPlot, LockedPlot]
 
 
 @dataclass
 class FarmStateData:
     player: Player
     stats: PlayerFarmingStats
-    plots: List[FarmPlot]
+    plots: List[PlotView]
     plants: List[PlantType]
     wallet: Wallet
     now: datetime
+    # plots touched by the action that produced this state; drives the compact response
+    changed_plot_ids: Set[int] = field(default_factory=set)
+
+
+@dataclass
+class PlotActionResult:
+    plot_id: int
+    status: str  # planted|harvested|skipped
+    message: str
 
 
 class FarmService:
@@ -142,14 +86,14 @@ class FarmService:
         self._session = session
 
     def get_farm_state(self, player_id: int, now: Optional[datetime] = None) -> FarmStateData:
+        # plants first: crops then resolve ``plant_type`` from the identity map instead of a query
+        plants = self._ensure_default_plants()
         player = self._load_player(player_id)
         now = now or datetime.now(timezone.utc)
         stats = self._ensure_stats(player)
         self._apply_passive_energy_regen(stats, now)
         wallet = self._ensure_wallet(player)
-        plants = self._ensure_default_plants()
         plots = self._ensure_plots(player)
-        self._update_crop_states(plots, now)
         return FarmStateData(player=player, stats=stats, plots=plots, plants=plants, wallet=wallet, now=now)
 
     def plant_crop(
@@ -198,11 +142,13 @@ class FarmService:
         crop = PlantedCrop(plot=plot, plant_type=plant_type, planted_at=now, ready_at=ready_at, state="growing")
         self._session.add(crop)
         self._session.flush()
+        CROPS_PLANTED.inc()
 
         message = f"Ви посадили {plant_type.name}. Врожай буде готовий приблизно о {ready_at:%H:%M}."
         if used_starter_seed:
             message += " Використано подарункове насіння."
         refreshed = self.get_farm_state(player_id, now)
+        refreshed.changed_plot_ids.add(plot.id)
         return refreshed, message
 
     def harvest_crop(
@@ -218,10 +164,8 @@ class FarmService:
             raise FarmPlotEmpty("Ділянка порожня.")
 
         crop = plot.crop
-        crop.mark_ready(now)
-        if crop.state != "ready":
-            remaining = int((crop.ready_at - now).total_seconds())
-            remaining = max(remaining, 0)
+        if crop.state_at(now) != "ready":
+            remaining = self._seconds_until(crop.ready_at, now)
             raise FarmPlotOccupied(f"Врожай ще росте. Залишилось приблизно {remaining // 60} хв.")
 
         plant = crop.plant_type
@@ -234,6 +178,7 @@ class FarmService:
         self._session.delete(crop)
         plot.crop = None
         self._session.flush()
+        CROPS_HARVESTED.inc()
 
         message_parts = [
             f"Ви зібрали {plant.name} і заробили {plant.sell_price} золотих.",
@@ -243,10 +188,191 @@ class FarmService:
             message_parts.append(f"Рівень ферми підвищено до {state.stats.level}!")
         message = " ".join(message_parts)
         refreshed = self.get_farm_state(player_id, now)
+        refreshed.changed_plot_ids.add(plot.id)
         return refreshed, message
 
-    def unlock_plot(self, player_id: int, plot_id: int) -> Tuple[FarmStateData, str]:
-        state = self.get_farm_state(player_id)
+    def plant_batch(
+        self,
+        player_id: int,
+        plantings: Iterable[Tuple[int, int]],
+        now: Optional[datetime] = None,
+    ) -> Tuple[FarmStateData, List[PlotActionResult]]:
+        """Plant several ``(plot_id, plant_type_id)`` pairs with one state load and one flush.
+
+        Plots that cannot be planted are reported as skipped; energy and gold are checked once
+        for everything that remains, so the batch either pays for all of it or fails as a whole.
+        """
+        now = now or datetime.now(timezone.utc)
+        state = self.get_farm_state(player_id, now)
+        results: List[PlotActionResult] = []
+        accepted: List[Tuple[FarmPlot, PlantType]] = []
+        claimed_plot_ids = set()
+
+        for plot_id, plant_type_id in plantings:
+            try:
+                plot = self._plot_by_id(state.plots, plot_id)
+                if not plot.unlocked:
+                    raise FarmPlotLocked("This plot is still locked")
+                if plot.crop is not None or plot.id in claimed_plot_ids:
+                    raise FarmPlotOccupied("Plot already has a crop")
+                plant_type = self._plant_by_id(state.plants, plant_type_id)
+                self._guard_plant_requirements(state.player, state.stats, plant_type)
+            except GameLogicError as exc:
+                results.append(PlotActionResult(plot_id=plot_id, status="skipped", message=str(exc)))
+                continue
+            claimed_plot_ids.add(plot.id)
+            accepted.append((plot, plant_type))
+            results.append(PlotActionResult(plot_id=plot.id, status="planted", message=""))
+
+        if not accepted:
+            return state, results
+
+        self._spend_energy(state.stats, sum(plant.energy_cost for _, plant in accepted), now)
+
+        wallet = state.wallet
+        gold_left = wallet.gold
+        starter_charges = state.stats.starter_seed_charges
+        starter_used_for = set()
+        for plot, plant_type in accepted:
+            if plant_type.seed_cost <= 0:
+                continue
+            if gold_left >= plant_type.seed_cost:
+                gold_left -= plant_type.seed_cost
+            elif starter_charges > 0:
+                starter_charges -= 1
+                starter_used_for.add(plot.id)
+            else:
+                # every starter charge is spent by now; the rest of the batch is paid in gold
+                covered = sum(plant.seed_cost for planted_plot, plant in accepted if planted_plot.id in starter_used_for)
+                required = sum(plant.seed_cost for _, plant in accepted) - covered
+                raise InsufficientFunds(wallet.gold, required)
+
+        wallet.gold = gold_left
+        state.player.gold = gold_left
+        state.stats.starter_seed_charges = starter_charges
+
+        planted = {}
+        rows = []
+        for plot, plant_type in accepted:
+            ready_at = now + timedelta(
+                seconds=self._apply_tool_bonus(plant_type.growth_seconds, state.stats.tool_bonus_percent)
+            )
+            planted[plot.id] = (plant_type, ready_at)
+            rows.append(
+                {
+                    "plot_id": plot.id,
+                    "plant_type_id": plant_type.id,
+                    "planted_at": now,
+                    "ready_at": ready_at,
+                    "state": "growing",
+                }
+            )
+        inserted = self._session.execute(
+            insert(PlantedCrop).values(rows).returning(PlantedCrop.id, PlantedCrop.plot_id)
+        ).all()
+        CROPS_PLANTED.inc(amount=len(inserted))
+
+        # attach the new rows to the loaded plots so the response needs no reload
+        for crop_id, plot_id in inserted:
+            plot = self._plot_by_id(state.plots, plot_id)
+            plant_type, ready_at = planted[plot_id]
+            crop = PlantedCrop(
+                id=crop_id,
+                plot_id=plot_id,
+                plant_type_id=plant_type.id,
+                planted_at=now,
+                ready_at=ready_at,
+                harvested_at=None,
+                state="growing",
+            )
+            make_transient_to_detached(crop)
+            self._session.add(crop)
+            set_committed_value(crop, "plant_type", plant_type)
+            set_committed_value(crop, "plot", plot)
+            set_committed_value(plot, "crop", crop)
+            state.changed_plot_ids.add(plot_id)
+        self._session.flush()
+
+        for result in results:
+            if result.status != "planted":
+                continue
+            plant_type, ready_at = planted[result.plot_id]
+            result.message = f"Ви посадили {plant_type.name}. Врожай буде готовий приблизно о {ready_at:%H:%M}."
+            if result.plot_id in starter_used_for:
+                result.message += " Використано подарункове насіння."
+        return state, results
+
+    def harvest_all(
+        self,
+        player_id: int,
+        now: Optional[datetime] = None,
+    ) -> Tuple[FarmStateData, List[PlotActionResult], str]:
+        """Harvest every ready plot with one DELETE and a single XP/gold grant."""
+        now = now or datetime.now(timezone.utc)
+        state = self.get_farm_state(player_id, now)
+        results: List[PlotActionResult] = []
+        ready_plots: List[FarmPlot] = []
+        for plot in state.plots:
+            crop = plot.crop
+            if crop is None:
+                continue
+            if crop.state_at(now) == "ready":
+                ready_plots.append(plot)
+                plant = crop.plant_type
+                results.append(
+                    PlotActionResult(
+                        plot_id=plot.id,
+                        status="harvested",
+                        message=f"Ви зібрали {plant.name} і заробили {plant.sell_price} золотих.",
+                    )
+                )
+            else:
+                remaining = self._seconds_until(crop.ready_at, now)
+                results.append(
+                    PlotActionResult(
+                        plot_id=plot.id,
+                        status="skipped",
+                        message=f"Врожай ще росте. Залишилось приблизно {remaining // 60} хв.",
+                    )
+                )
+
+        if not ready_plots:
+            return state, results, "Немає врожаю, готового до збору."
+
+        total_gold = sum(plot.crop.plant_type.sell_price for plot in ready_plots)
+        total_xp = sum(plot.crop.plant_type.xp_reward for plot in ready_plots)
+        xp_gain, levels_gained = self._grant_farming_xp(state.stats, total_xp)
+        state.wallet.gold += total_gold
+        state.player.gold = state.wallet.gold
+
+        crop_ids = [plot.crop.id for plot in ready_plots]
+        self._session.execute(
+            delete(PlantedCrop)
+            .where(PlantedCrop.id.in_(crop_ids))
+            .execution_options(synchronize_session=False)
+        )
+        for plot in ready_plots:
+            self._session.expunge(plot.crop)
+            set_committed_value(plot, "crop", None)
+            state.changed_plot_ids.add(plot.id)
+        self._session.flush()
+        CROPS_HARVESTED.inc(amount=len(ready_plots))
+
+        message_parts = [
+            f"Зібрано врожай з {len(ready_plots)} ділянок: {total_gold} золотих.",
+            f"Отримано {xp_gain} досвіду фермерства.",
+        ]
+        if levels_gained:
+            message_parts.append(f"Рівень ферми підвищено до {state.stats.level}!")
+        return state, results, " ".join(message_parts)
+
+    def unlock_plot(
+        self,
+        player_id: int,
+        plot_id: int,
+        now: Optional[datetime] = None,
+    ) -> Tuple[FarmStateData, str]:
+        state = self.get_farm_state(player_id, now)
         plot = self._plot_by_id(state.plots, plot_id)
         if plot.unlocked:
             return state, "Ділянка вже відкрита."
@@ -260,14 +386,21 @@ class FarmService:
         if wallet.gold < plot.unlock_cost:
             raise InsufficientFunds(wallet.gold, plot.unlock_cost)
 
-        wallet.gold -= plot.unlock_cost
-        state.player.gold = wallet.gold
+        if isinstance(plot, LockedPlot):
+            plot, created = self._insert_plot(state.player, plot.slot_index)
+            if not created and plot.unlocked:
+                # a concurrent request unlocked (and paid for) the slot first
+                return self.get_farm_state(player_id, now), "Ділянка вже відкрита."
+        # rows created before plots became virtual are unlocked in place
         plot.unlocked = True
         self._session.add(plot)
+        wallet.gold -= plot.unlock_cost
+        state.player.gold = wallet.gold
         self._session.flush()
 
         message = "Нова ділянка готова до посадки!"
-        refreshed = self.get_farm_state(player_id)
+        refreshed = self.get_farm_state(player_id, now)
+        refreshed.changed_plot_ids.add(plot.id)
         return refreshed, message
 
     def refill_energy(self, player_id: int, amount: int) -> Tuple[FarmStateData, str]:
@@ -299,8 +432,8 @@ class FarmService:
         refreshed = self.get_farm_state(player_id)
         return refreshed, message
 
-    def upgrade_tool(self, player_id: int) -> Tuple[FarmStateData, str]:
-        state = self.get_farm_state(player_id)
+    def upgrade_tool(self, player_id: int, now: Optional[datetime] = None) -> Tuple[FarmStateData, str]:
+        state = self.get_farm_state(player_id, now)
         current_tool_level = state.stats.tool_level
         next_tool = self._find_tool_upgrade(current_tool_level + 1)
         if next_tool is None:
@@ -322,19 +455,40 @@ class FarmService:
         self._session.flush()
 
         message = f"Інструмент покращено до рівня {next_tool['level']}."
-        refreshed = self.get_farm_state(player_id)
+        refreshed = self.get_farm_state(player_id, now)
         return refreshed, message
 
     # --- internal helpers -------------------------------------------------
 
     def _load_player(self, player_id: int) -> Player:
+        # one-to-one rows are joined; plots and crops come in their own narrow SELECTs so the
+        # player columns are not repeated for every plot
         stmt = (
             select(Player)
             .where(Player.id == player_id)
             .options(
+                load_only(Player.id, Player.level, Player.gold),
                 joinedload(Player.farming_stats),
                 joinedload(Player.wallet),
-                joinedload(Player.farm_plots).joinedload(FarmPlot.crop).joinedload(PlantedCrop.plant_type),
+                selectinload(Player.farm_plots)
+                .load_only(
+                    FarmPlot.id,
+                    FarmPlot.player_id,
+                    FarmPlot.slot_index,
+                    FarmPlot.unlocked,
+                    FarmPlot.unlock_cost,
+                    FarmPlot.unlock_level_requirement,
+                    FarmPlot.unlock_farming_level_requirement,
+                )
+                .selectinload(FarmPlot.crop)
+                .load_only(
+                    PlantedCrop.id,
+                    PlantedCrop.plot_id,
+                    PlantedCrop.plant_type_id,
+                    PlantedCrop.planted_at,
+                    PlantedCrop.ready_at,
+                    PlantedCrop.state,
+                ),
             )
         )
         result = self._session.execute(stmt)
@@ -372,61 +526,56 @@ class FarmService:
             self._session.add(stats)
         return stats
 
-    def _ensure_plots(self, player: Player) -> List[FarmPlot]:
-        plots = sorted(player.farm_plots or [], key=lambda p: p.slot_index)
-        if len(plots) >= BASE_PLOTS:
-            return plots
-
-        for slot in range(1, TOTAL_PLOTS + 1):
-            plot = next((p for p in plots if p.slot_index == slot), None)
-            if plot is None:
-                plot = FarmPlot(
-                    player_id=player.id,
-                    slot_index=slot,
-                    unlocked=True if slot <= BASE_PLOTS else False,
-                    unlock_cost=BASE_PLOT_UNLOCK_COST + (slot - BASE_PLOTS) * 250,
-                    unlock_level_requirement=max(1, slot),
-                    unlock_farming_level_requirement=max(1, slot // 2 + 1),
-                )
-                if slot <= BASE_PLOTS:
-                    plot.unlock_cost = 0
-                    plot.unlock_level_requirement = 1
-                    plot.unlock_farming_level_requirement = 1
-                    plot.unlocked = True
-                else:
-                    plot.unlocked = False
+    def _ensure_plots(self, player: Player) -> List[PlotView]:
+        """Stored plots plus a ``LockedPlot`` for every slot without a row; base slots get rows."""
+        stored = {plot.slot_index: plot for plot in player.farm_plots or []}
+        for slot in range(1, BASE_PLOTS + 1):
+            if slot not in stored:
+                stored[slot], _created = self._insert_plot(player, slot)
+        return [stored.get(slot) or LockedPlot.for_slot(player.id, slot) for slot in range(1, TOTAL_PLOTS + 1)]
+
+    def _insert_plot(self, player: Player, slot_index: int) -> Tuple[FarmPlot, bool]:
+        """Create the slot's row, or return the one a concurrent request created first (``False``)."""
+        terms = farm_rules.PLOT_SLOT_RULES[slot_index - 1]
+        plot = FarmPlot(
+            player_id=player.id,
+            slot_index=slot_index,
+            unlocked=True,
+            unlock_cost=terms.unlock_cost,
+            unlock_level_requirement=terms.unlock_level_requirement,
+            unlock_farming_level_requirement=terms.unlock_farming_level_requirement,
+        )
+        try:
+            with self._session.begin_nested():
                 self._session.add(plot)
-                plots.append(plot)
-
-        plots.sort(key=lambda p: p.slot_index)
-        self._session.flush()
-        return plots
-
-    def _update_crop_states(self, plots: Iterable[FarmPlot], now: datetime) -> None:
-        for plot in plots:
-            if plot.crop:
-                plot.crop.mark_ready(now)
+        except IntegrityError:
+            # uq_farm_plots_player_id_slot_index: the other request's row wins
+            plot = self._session.execute(
+                select(FarmPlot).where(FarmPlot.player_id == player.id, FarmPlot.slot_index == slot_index)
+            ).scalar_one()
+            created = False
+        else:
+            created = True
+        # through the collection, so a second load in the same session sees the row
+        set_committed_value(player, "farm_plots", [*player.farm_plots, plot])
+        return plot, created
 
     def _ensure_default_plants(self) -> List[PlantType]:
-        existing = self._session.execute(select(PlantType).order_by(PlantType.id))
-        plants = existing.scalars().all()
+        plants = plant_catalog_cache.attach(self._session)
         if plants:
-            return list(plants)
-
-        created: List[PlantType] = []
-        for plant_data in DEFAULT_PLANTS:
-            plant = PlantType(**plant_data)
-            self._session.add(plant)
-            created.append(plant)
-        self._session.flush()
+            return plants
+
+        created: List[PlantType] = [PlantType(**plant_data) for plant_data in DEFAULT_PLANTS]
+        try:
+            with self._session.begin_nested():
+                self._session.add_all(created)
+        except IntegrityError:
+            # another request seeded the catalog first; use its rows
+            return plant_catalog_cache.attach(self._session)
         return created
 
     def _apply_tool_bonus(self, base_seconds: int, bonus_percent: int) -> int:
-        if bonus_percent <= 0:
-            return base_seconds
-        reduction = base_seconds * bonus_percent // 100
-        adjusted = max(60, base_seconds - reduction)
-        return adjusted
+        return farm_rules.apply_tool_bonus(base_seconds, bonus_percent)
 
     def _guard_plant_requirements(
         self,
@@ -434,7 +583,7 @@ class FarmService:
         stats: PlayerFarmingStats,
         plant_type: PlantType,
     ) -> None:
-        if player.level < plant_type.unlock_level or stats.level < plant_type.unlock_farming_level:
+        if not self._is_plant_unlocked(player, stats, plant_type):
             raise FarmPlantLocked("Ця культура поки що недоступна.")
 
     def _spend_energy(self, stats: PlayerFarmingStats, amount: int, now: datetime) -> None:
@@ -444,7 +593,7 @@ class FarmService:
         stats.last_energy_refill_at = now
         self._session.add(stats)
 
-    def _plot_by_id(self, plots: Iterable[FarmPlot], plot_id: int) -> FarmPlot:
+    def _plot_by_id(self, plots: Iterable[PlotView], plot_id: int) -> PlotView:
         for plot in plots:
             if plot.id == plot_id:
                 return plot
@@ -461,23 +610,19 @@ class FarmService:
         raise FarmPlantLocked("Рослина не знайдена.")
 
     def _grant_farming_xp(self, stats: PlayerFarmingStats, amount: int) -> Tuple[int, int]:
-        if amount <= 0:
-            return 0, 0
-
-        stats.xp += amount
-        levels_gained = 0
-        while stats.xp >= self._xp_required_for_next_level(stats.level):
-            stats.xp -= self._xp_required_for_next_level(stats.level)
-            stats.level += 1
-            levels_gained += 1
-            stats.max_energy = min(FARM_ENERGY_MAX_CAP, stats.max_energy + 2)
-            stats.energy = min(stats.max_energy, stats.energy + 2)
-        self._session.add(stats)
-        return amount, levels_gained
+        xp_gain, levels_gained = farm_rules.grant_farming_xp(stats, amount)
+        if xp_gain:
+            self._session.add(stats)
+        return xp_gain, levels_gained
+
+    @staticmethod
+    def _seconds_until(moment: datetime, now: datetime) -> int:
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return max(int((moment - now).total_seconds()), 0)
 
     def _xp_required_for_next_level(self, level: int) -> int:
-        threshold = FARM_XP_BASE_THRESHOLD * (FARM_XP_GROWTH_FACTOR ** (level - 1))
-        return max(10, int(threshold))
+        return farm_rules.xp_required_for_next_level(level)
 
     def _ensure_wallet(self, player: Player) -> Wallet:
         wallet = player.wallet
@@ -489,44 +634,21 @@ class FarmService:
         return wallet
 
     def _find_tool_upgrade(self, tool_level: int) -> Optional[Dict[str, object]]:
-        for upgrade in TOOL_UPGRADES:
-            if upgrade["level"] == tool_level:
-                return upgrade
-        return None
+        return farm_rules.find_tool_upgrade(tool_level)
 
     def _apply_passive_energy_regen(self, stats: PlayerFarmingStats, now: datetime) -> None:
-        if stats.energy >= stats.max_energy:
-            stats.last_energy_refill_at = now
-            self._session.add(stats)
-            return
-
         last_update = stats.last_energy_refill_at
-        if last_update is None:
-            stats.last_energy_refill_at = now
-            self._session.add(stats)
-            return
-
-        if last_update.tzinfo is None:
+        if last_update is not None and last_update.tzinfo is None:
             last_update = last_update.replace(tzinfo=timezone.utc)
 
-        elapsed_seconds = (now - last_update).total_seconds()
-        if elapsed_seconds < FARM_ENERGY_REGEN_SECONDS:
-            return
-
-        energy_points = int(elapsed_seconds // FARM_ENERGY_REGEN_SECONDS)
-        if energy_points <= 0:
-            return
-
-        stats.energy = min(stats.max_energy, stats.energy + energy_points)
-        consumed_seconds = energy_points * FARM_ENERGY_REGEN_SECONDS
-        stats.last_energy_refill_at = last_update + timedelta(seconds=consumed_seconds)
-        if stats.energy >= stats.max_energy:
-            stats.last_energy_refill_at = now
-        self._session.add(stats)
+        energy, refill_at = farm_rules.regen_energy(stats.energy, stats.max_energy, last_update, now)
+        if energy != stats.energy or refill_at != last_update:
+            stats.energy = energy
+            stats.last_energy_refill_at = refill_at
+            self._session.add(stats)
 
     def build_public_state(self, data: FarmStateData) -> Dict[str, object]:
         """Convert internal state into JSON-ready payload."""
-        xp_to_next = self._xp_required_for_next_level(data.stats.level)
         plots_public: List[Dict[str, object]] = []
         for plot in data.plots:
             crop_public: Optional[Dict[str, object]] = None
@@ -536,7 +658,7 @@ class FarmService:
                     "id": plot.crop.id,
                     "planted_at": plot.crop.planted_at,
                     "ready_at": plot.crop.ready_at,
-                    "state": plot.crop.state,
+                    "state": plot.crop.state_at(data.now),
                     "plant_type": self._plant_public(plant, data.player, data.stats),
                 }
             plots_public.append(
@@ -553,24 +675,78 @@ class FarmService:
 
         return {
             "player_id": data.player.id,
-            "stats": {
-                "level": data.stats.level,
-                "xp": data.stats.xp,
-                "xp_to_next_level": xp_to_next,
-                "energy": data.stats.energy,
-                "max_energy": data.stats.max_energy,
-                "tool": {
-                    "level": data.stats.tool_level,
-                    "name": data.stats.tool_name,
-                    "bonus_percent": data.stats.tool_bonus_percent,
-                },
-                "starter_seed_charges": data.stats.starter_seed_charges,
-            },
+            "stats": self._stats_public(data.stats),
             "plots": plots_public,
             "available_plants": [self._plant_public(plant, data.player, data.stats) for plant in data.plants],
             "wallet_gold": data.wallet.gold,
         }
 
+    def build_compact_changes(self, data: FarmStateData) -> Dict[str, object]:
+        """Only what an action changed: touched plots, stats and gold; plants are referenced by id."""
+        plots_public: List[Dict[str, object]] = []
+        for plot in data.plots:
+            if plot.id not in data.changed_plot_ids:
+                continue
+            crop_public: Optional[Dict[str, object]] = None
+            if plot.crop:
+                crop_public = {
+                    "id": plot.crop.id,
+                    "plant_type_id": plot.crop.plant_type_id,
+                    "planted_at": plot.crop.planted_at,
+                    "ready_at": plot.crop.ready_at,
+                    "state": plot.crop.state_at(data.now),
+                }
+            plots_public.append(
+                {
+                    "id": plot.id,
+                    "slot_index": plot.slot_index,
+                    "unlocked": plot.unlocked,
+                    "crop": crop_public,
+                }
+            )
+
+        return {
+            "player_id": data.player.id,
+            "player_level": data.player.level,
+            "stats": self._stats_public(data.stats),
+            "plots": plots_public,
+            "wallet_gold": data.wallet.gold,
+        }
+
+    def _stats_public(self, stats: PlayerFarmingStats) -> Dict[str, object]:
+        return {
+            "level": stats.level,
+            "xp": stats.xp,
+            "xp_to_next_level": self._xp_required_for_next_level(stats.level),
+            "energy": stats.energy,
+            "max_energy": stats.max_energy,
+            "tool": {
+                "level": stats.tool_level,
+                "name": stats.tool_name,
+                "bonus_percent": stats.tool_bonus_percent,
+            },
+            "starter_seed_charges": stats.starter_seed_charges,
+        }
+
+    def list_plant_catalog(self) -> List[Dict[str, object]]:
+        """Player-independent plant catalog that compact responses point into."""
+        return [
+            {
+                "id": plant.id,
+                "name": plant.name,
+                "description": plant.description,
+                "growth_seconds": plant.growth_seconds,
+                "xp_reward": plant.xp_reward,
+                "energy_cost": plant.energy_cost,
+                "seed_cost": plant.seed_cost,
+                "sell_price": plant.sell_price,
+                "unlock_level": plant.unlock_level,
+                "unlock_farming_level": plant.unlock_farming_level,
+                "icon": plant.icon,
+            }
+            for plant in self._ensure_default_plants()
+        ]
+
     def _plant_public(self, plant: PlantType, player: Player, stats: PlayerFarmingStats) -> Dict[str, object]:
         return {
             "id": plant.id,
@@ -588,4 +764,4 @@ class FarmService:
         }
 
     def _is_plant_unlocked(self, player: Player, stats: PlayerFarmingStats, plant: PlantType) -> bool:
-        return player.level >= plant.unlock_level and stats.level >= plant.unlock_farming_level
+        return farm_rules.is_plant_unlocked(player.level, stats.level, plant.unlock_level, plant.unlock_farming_level)
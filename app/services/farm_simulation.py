@@ -0,0 +1,513 @@
+"""Deterministic, DB-free farm simulation built on ``farm_rules``.
+
+A simulated player checks in every ``checkin_seconds`` and does what the API would let them do in
+one visit: harvest everything that is ready, optionally buy tool upgrades and plots, then plant
+every empty plot with the best crop the strategy can afford. Between visits nothing is stepped;
+energy is caught up in closed form exactly like ``FarmService`` does for an offline player.
+
+``simulate_player`` is the scalar reference. ``simulate_population`` runs the same visit on NumPy
+state arrays (one row per player) when NumPy is installed and falls back to the scalar loop
+otherwise; both produce identical numbers.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from app.services import farm_rules
+from app.services.farm_rules import (
+    BASE_PLOTS,
+    DEFAULT_PLANTS,
+    FARM_ENERGY_MAX_CAP,
+    FARM_ENERGY_REGEN_SECONDS,
+    FARM_LEVEL_UP_ENERGY_BONUS,
+    MIN_GROWTH_SECONDS,
+    TOOL_UPGRADES,
+    TOTAL_PLOTS,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+SECONDS_PER_DAY = 86_400
+# far above anything a farm reaches; the XP curve overflows int64 around level 190
+SIMULATION_MAX_FARMING_LEVEL = 150
+
+
+@dataclass(frozen=True)
+class SimPlant:
+    name: str
+    growth_seconds: int
+    xp_reward: int
+    energy_cost: int
+    seed_cost: int
+    sell_price: int
+    unlock_level: int
+    unlock_farming_level: int
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, object]) -> "SimPlant":
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__})
+
+
+@dataclass(frozen=True)
+class FarmStrategy:
+    name: str
+    # what a planted plot maximises per second of growth: "gold", "xp" or "free" (cheapest seed)
+    goal: str
+    checkin_seconds: int
+    unlock_plots: bool = False
+    upgrade_tool: bool = False
+
+    def plant_score(self, plant: SimPlant) -> float:
+        if self.goal == "gold":
+            return (plant.sell_price - plant.seed_cost) / plant.growth_seconds
+        if self.goal == "xp":
+            return plant.xp_reward / plant.growth_seconds
+        if self.goal == "free":
+            return -float(plant.seed_cost)
+        raise ValueError(f"Unknown strategy goal: {self.goal}")
+
+
+STRATEGIES: Dict[str, FarmStrategy] = {
+    strategy.name: strategy
+    for strategy in (
+        FarmStrategy(name="casual", goal="free", checkin_seconds=4 * 3600),
+        FarmStrategy(name="trader", goal="gold", checkin_seconds=30 * 60, unlock_plots=True, upgrade_tool=True),
+        FarmStrategy(name="grinder", goal="xp", checkin_seconds=15 * 60, unlock_plots=True, upgrade_tool=True),
+    )
+}
+
+
+@dataclass
+class FarmSimState:
+    """One player's farm; defaults match a freshly created ``PlayerFarmingStats`` row."""
+
+    gold: int = 0
+    level: int = 1
+    xp: int = 0
+    energy: int = 30
+    max_energy: int = 30
+    tool_level: int = 1
+    tool_bonus_percent: int = 0
+    starter_seed_charges: int = 1
+    last_energy_refill_at: Optional[float] = 0.0
+    unlocked_plots: int = BASE_PLOTS
+    xp_earned: int = 0
+    plot_plants: List[Optional[int]] = field(default_factory=lambda: [None] * TOTAL_PLOTS)
+    plot_ready_at: List[float] = field(default_factory=lambda: [0.0] * TOTAL_PLOTS)
+
+
+@dataclass
+class SimulationResult:
+    strategy: str
+    # one entry per simulated day, taken after the last visit of that day
+    gold: List[int]
+    xp_earned: List[int]
+    level: List[int]
+
+
+@dataclass
+class PopulationResult:
+    strategy: str
+    players: int
+    days: int
+    mean_gold: List[float]
+    mean_xp_earned: List[float]
+    mean_level: List[float]
+    vectorized: bool
+
+
+def default_plants() -> List[SimPlant]:
+    return [SimPlant.from_mapping(data) for data in DEFAULT_PLANTS]
+
+
+def _regen(state: FarmSimState, now: float) -> None:
+    state.energy, state.last_energy_refill_at = farm_rules.regen_energy(
+        state.energy, state.max_energy, state.last_energy_refill_at, now
+    )
+
+
+def choose_plant(
+    state: FarmSimState,
+    plants: Sequence[SimPlant],
+    scores: Sequence[float],
+    player_level: int,
+) -> Optional[int]:
+    best: Optional[int] = None
+    for index, plant in enumerate(plants):
+        if not farm_rules.is_plant_unlocked(player_level, state.level, plant.unlock_level, plant.unlock_farming_level):
+            continue
+        if state.energy < plant.energy_cost:
+            continue
+        if plant.seed_cost > 0 and state.gold < plant.seed_cost and state.starter_seed_charges <= 0:
+            continue
+        if best is None or scores[index] > scores[best]:
+            best = index
+    return best
+
+
+def checkin(
+    state: FarmSimState,
+    now: float,
+    strategy: FarmStrategy,
+    plants: Sequence[SimPlant],
+    player_level: int,
+    scores: Optional[Sequence[float]] = None,
+) -> None:
+    """Play one visit at ``now`` (seconds since the start of the simulation)."""
+    if scores is None:
+        scores = [strategy.plant_score(plant) for plant in plants]
+    _regen(state, now)
+
+    ready_slots = [
+        slot
+        for slot, plant_index in enumerate(state.plot_plants)
+        if plant_index is not None and state.plot_ready_at[slot] <= now
+    ]
+    if ready_slots:
+        state.gold += sum(plants[state.plot_plants[slot]].sell_price for slot in ready_slots)
+        xp_gain = sum(plants[state.plot_plants[slot]].xp_reward for slot in ready_slots)
+        farm_rules.grant_farming_xp(state, xp_gain)
+        state.xp_earned += xp_gain
+        for slot in ready_slots:
+            state.plot_plants[slot] = None
+
+    while strategy.upgrade_tool:
+        upgrade = farm_rules.find_tool_upgrade(state.tool_level + 1)
+        if upgrade is None or state.level < upgrade["required_farming_level"] or state.gold < upgrade["cost"]:
+            break
+        state.gold -= int(upgrade["cost"])
+        state.tool_level = int(upgrade["level"])
+        state.tool_bonus_percent = int(upgrade["bonus_percent"])
+
+    while strategy.unlock_plots and state.unlocked_plots < TOTAL_PLOTS:
+        terms = farm_rules.plot_terms(state.unlocked_plots + 1)
+        if (
+            player_level < terms.unlock_level_requirement
+            or state.level < terms.unlock_farming_level_requirement
+            or state.gold < terms.unlock_cost
+        ):
+            break
+        state.gold -= terms.unlock_cost
+        state.unlocked_plots += 1
+
+    for slot in range(state.unlocked_plots):
+        if state.plot_plants[slot] is not None:
+            continue
+        _regen(state, now)
+        index = choose_plant(state, plants, scores, player_level)
+        if index is None:
+            break
+        plant = plants[index]
+        state.energy -= plant.energy_cost
+        state.last_energy_refill_at = now
+        if plant.seed_cost > 0:
+            if state.gold < plant.seed_cost:
+                state.starter_seed_charges -= 1
+            else:
+                state.gold -= plant.seed_cost
+        state.plot_plants[slot] = index
+        state.plot_ready_at[slot] = now + farm_rules.apply_tool_bonus(plant.growth_seconds, state.tool_bonus_percent)
+
+
+def _validate(days: int, checkin_seconds: int) -> None:
+    if days <= 0:
+        raise ValueError("days must be positive")
+    if not 0 < checkin_seconds <= SECONDS_PER_DAY:
+        raise ValueError("checkin_seconds must be between 1 second and one day")
+
+
+def simulate_player(
+    strategy: FarmStrategy,
+    days: int,
+    *,
+    plants: Optional[Sequence[SimPlant]] = None,
+    player_level: int = 5,
+    start_gold: int = 0,
+    checkin_seconds: Optional[int] = None,
+) -> SimulationResult:
+    plants = list(plants) if plants is not None else default_plants()
+    interval = checkin_seconds or strategy.checkin_seconds
+    _validate(days, interval)
+    scores = [strategy.plant_score(plant) for plant in plants]
+    state = FarmSimState(gold=start_gold)
+    result = SimulationResult(strategy=strategy.name, gold=[0] * days, xp_earned=[0] * days, level=[0] * days)
+
+    horizon = days * SECONDS_PER_DAY
+    visit = 0
+    while visit * interval < horizon:
+        now = float(visit * interval)
+        checkin(state, now, strategy, plants, player_level, scores)
+        day = int(now // SECONDS_PER_DAY)
+        if int((now + interval) // SECONDS_PER_DAY) > day:
+            result.gold[day] = state.gold
+            result.xp_earned[day] = state.xp_earned
+            result.level[day] = state.level
+        visit += 1
+    return result
+
+
+def checkin_intervals(strategy: FarmStrategy, players: int, spread: float = 0.5) -> List[int]:
+    """Deterministic per-player visit intervals spread evenly around the strategy's cadence."""
+    if players <= 0:
+        raise ValueError("players must be positive")
+    if players == 1:
+        factors = [1.0]
+    else:
+        factors = [1.0 - spread + 2 * spread * index / (players - 1) for index in range(players)]
+    return [
+        min(SECONDS_PER_DAY, max(MIN_GROWTH_SECONDS, round(strategy.checkin_seconds * factor)))
+        for factor in factors
+    ]
+
+
+def simulate_population(
+    strategy: FarmStrategy,
+    days: int,
+    players: int,
+    *,
+    plants: Optional[Sequence[SimPlant]] = None,
+    player_level: int = 5,
+    start_gold: int = 0,
+    spread: float = 0.5,
+    vectorized: Optional[bool] = None,
+) -> PopulationResult:
+    plants = list(plants) if plants is not None else default_plants()
+    intervals = checkin_intervals(strategy, players, spread)
+    for interval in intervals:
+        _validate(days, interval)
+    if vectorized is None:
+        vectorized = np is not None
+    if vectorized:
+        if np is None:
+            raise RuntimeError("NumPy is not installed; pass vectorized=False")
+        return _simulate_population_numpy(strategy, days, plants, player_level, start_gold, intervals)
+
+    runs = [
+        simulate_player(
+            strategy,
+            days,
+            plants=plants,
+            player_level=player_level,
+            start_gold=start_gold,
+            checkin_seconds=interval,
+        )
+        for interval in intervals
+    ]
+    return PopulationResult(
+        strategy=strategy.name,
+        players=players,
+        days=days,
+        mean_gold=[sum(run.gold[day] for run in runs) / players for day in range(days)],
+        mean_xp_earned=[sum(run.xp_earned[day] for run in runs) / players for day in range(days)],
+        mean_level=[sum(run.level[day] for run in runs) / players for day in range(days)],
+        vectorized=False,
+    )
+
+
+# --- NumPy backend ---------------------------------------------------------
+
+
+class _PopulationArrays:
+    """``FarmSimState`` for many players at once: one array element per player."""
+
+    def __init__(self, players: int, start_gold: int) -> None:
+        defaults = FarmSimState()
+        self.gold = np.full(players, start_gold, dtype=np.int64)
+        self.level = np.full(players, defaults.level, dtype=np.int64)
+        self.xp = np.full(players, defaults.xp, dtype=np.int64)
+        self.energy = np.full(players, defaults.energy, dtype=np.int64)
+        self.max_energy = np.full(players, defaults.max_energy, dtype=np.int64)
+        self.tool_level = np.full(players, defaults.tool_level, dtype=np.int64)
+        self.tool_bonus_percent = np.full(players, defaults.tool_bonus_percent, dtype=np.int64)
+        self.starter_seed_charges = np.full(players, defaults.starter_seed_charges, dtype=np.int64)
+        self.last_energy_refill_at = np.full(players, defaults.last_energy_refill_at, dtype=np.int64)
+        self.unlocked_plots = np.full(players, defaults.unlocked_plots, dtype=np.int64)
+        self.xp_earned = np.zeros(players, dtype=np.int64)
+        self.plot_plants = np.full((players, TOTAL_PLOTS), -1, dtype=np.int64)
+        self.plot_ready_at = np.zeros((players, TOTAL_PLOTS), dtype=np.int64)
+
+
+def _np_regen(arrays: _PopulationArrays, now, mask) -> None:
+    full = arrays.energy >= arrays.max_energy
+    points = (now - arrays.last_energy_refill_at) // FARM_ENERGY_REGEN_SECONDS
+    gains = mask & ~full & (points > 0)
+    energy = np.minimum(arrays.max_energy, arrays.energy + points)
+    refill_at = np.where(
+        energy >= arrays.max_energy,
+        now,
+        arrays.last_energy_refill_at + points * FARM_ENERGY_REGEN_SECONDS,
+    )
+    arrays.last_energy_refill_at = np.where(
+        mask & full, now, np.where(gains, refill_at, arrays.last_energy_refill_at)
+    )
+    arrays.energy = np.where(gains, energy, arrays.energy)
+
+
+def _np_grant_xp(arrays: _PopulationArrays, amount, xp_table) -> None:
+    arrays.xp = arrays.xp + amount
+    rewarded = amount > 0
+    while True:
+        required = xp_table[np.minimum(arrays.level, SIMULATION_MAX_FARMING_LEVEL)]
+        level_up = rewarded & (arrays.xp >= required)
+        if not level_up.any():
+            return
+        arrays.xp = np.where(level_up, arrays.xp - required, arrays.xp)
+        arrays.level = arrays.level + level_up
+        arrays.max_energy = np.where(
+            level_up,
+            np.minimum(FARM_ENERGY_MAX_CAP, arrays.max_energy + FARM_LEVEL_UP_ENERGY_BONUS),
+            arrays.max_energy,
+        )
+        arrays.energy = np.where(
+            level_up,
+            np.minimum(arrays.max_energy, arrays.energy + FARM_LEVEL_UP_ENERGY_BONUS),
+            arrays.energy,
+        )
+
+
+def _simulate_population_numpy(
+    strategy: FarmStrategy,
+    days: int,
+    plants: Sequence[SimPlant],
+    player_level: int,
+    start_gold: int,
+    intervals: Sequence[int],
+) -> PopulationResult:
+    players = len(intervals)
+    # whole seconds throughout, so integer arithmetic matches the scalar float maths exactly
+    interval = np.asarray(intervals, dtype=np.int64)
+    horizon = days * SECONDS_PER_DAY
+    arrays = _PopulationArrays(players, start_gold)
+    rows = np.arange(players)
+
+    # rule lookups are built with the scalar functions so both backends share one definition
+    xp_table = np.array(
+        [farm_rules.xp_required_for_next_level(level) for level in range(SIMULATION_MAX_FARMING_LEVEL + 1)],
+        dtype=np.int64,
+    )
+    impossible = np.iinfo(np.int64).max
+    tool_terms = [farm_rules.find_tool_upgrade(level + 1) for level in range(len(TOOL_UPGRADES) + 2)]
+    tool_cost = np.array([int(t["cost"]) if t else impossible for t in tool_terms], dtype=np.int64)
+    tool_required = np.array([int(t["required_farming_level"]) if t else impossible for t in tool_terms], dtype=np.int64)
+    tool_bonus = np.array([int(t["bonus_percent"]) if t else 0 for t in tool_terms], dtype=np.int64)
+    plot_terms = [farm_rules.plot_terms(count + 1) for count in range(TOTAL_PLOTS)]
+    plot_cost = np.array([terms.unlock_cost for terms in plot_terms] + [impossible], dtype=np.int64)
+    plot_level = np.array([terms.unlock_level_requirement for terms in plot_terms] + [impossible], dtype=np.int64)
+    plot_farming_level = np.array(
+        [terms.unlock_farming_level_requirement for terms in plot_terms] + [impossible], dtype=np.int64
+    )
+
+    scores = [strategy.plant_score(plant) for plant in plants]
+    growth = np.array([plant.growth_seconds for plant in plants], dtype=np.int64)
+    xp_reward = np.array([plant.xp_reward for plant in plants] + [0], dtype=np.int64)
+    energy_cost = np.array([plant.energy_cost for plant in plants], dtype=np.int64)
+    seed_cost = np.array([plant.seed_cost for plant in plants], dtype=np.int64)
+    sell_price = np.array([plant.sell_price for plant in plants] + [0], dtype=np.int64)
+    preference = [
+        index
+        for index in sorted(range(len(plants)), key=lambda index: -scores[index])
+        if player_level >= plants[index].unlock_level
+    ]
+
+    gold_curve = np.zeros((players, days), dtype=np.int64)
+    xp_curve = np.zeros((players, days), dtype=np.int64)
+    level_curve = np.zeros((players, days), dtype=np.int64)
+
+    visit = 0
+    while True:
+        now = visit * interval
+        active = now < horizon
+        if not active.any():
+            break
+        _np_regen(arrays, now, active)
+
+        ready = (arrays.plot_plants >= 0) & (arrays.plot_ready_at <= now[:, None]) & active[:, None]
+        if ready.any():
+            # index -1 hits the trailing zero of the price tables, so unready plots add nothing
+            planted = np.where(ready, arrays.plot_plants, -1)
+            arrays.gold = arrays.gold + sell_price[planted].sum(axis=1)
+            xp_gain = xp_reward[planted].sum(axis=1)
+            _np_grant_xp(arrays, xp_gain, xp_table)
+            arrays.xp_earned = arrays.xp_earned + xp_gain
+            arrays.plot_plants = np.where(ready, -1, arrays.plot_plants)
+
+        for _ in range(len(TOOL_UPGRADES) if strategy.upgrade_tool else 0):
+            tool = arrays.tool_level
+            upgrading = active & (arrays.level >= tool_required[tool]) & (arrays.gold >= tool_cost[tool])
+            if not upgrading.any():
+                break
+            arrays.gold = np.where(upgrading, arrays.gold - tool_cost[tool], arrays.gold)
+            arrays.tool_bonus_percent = np.where(upgrading, tool_bonus[tool], arrays.tool_bonus_percent)
+            arrays.tool_level = arrays.tool_level + upgrading
+
+        for _ in range(TOTAL_PLOTS if strategy.unlock_plots else 0):
+            count = arrays.unlocked_plots
+            unlocking = (
+                active
+                & (player_level >= plot_level[count])
+                & (arrays.level >= plot_farming_level[count])
+                & (arrays.gold >= plot_cost[count])
+            )
+            if not unlocking.any():
+                break
+            arrays.gold = np.where(unlocking, arrays.gold - plot_cost[count], arrays.gold)
+            arrays.unlocked_plots = arrays.unlocked_plots + unlocking
+
+        for slot in range(TOTAL_PLOTS):
+            empty = active & (slot < arrays.unlocked_plots) & (arrays.plot_plants[:, slot] < 0)
+            if not empty.any():
+                continue
+            # no regen here: the visit already caught up at ``now`` and planting resets the clock
+            # best score first; the stable sort keeps the scalar tie-break (lowest index wins)
+            choice = np.full(players, -1, dtype=np.int64)
+            for index in preference:
+                plant = plants[index]
+                affordable = (
+                    empty
+                    & (choice < 0)
+                    & (arrays.level >= plant.unlock_farming_level)
+                    & (arrays.energy >= plant.energy_cost)
+                )
+                if plant.seed_cost > 0:
+                    affordable &= (arrays.gold >= plant.seed_cost) | (arrays.starter_seed_charges > 0)
+                choice = np.where(affordable, index, choice)
+            planting = choice >= 0
+            if not planting.any():
+                continue
+            seed = seed_cost[choice]
+            pays_gold = planting & (seed > 0) & (arrays.gold >= seed)
+            uses_starter = planting & (seed > 0) & (arrays.gold < seed)
+            arrays.energy = np.where(planting, arrays.energy - energy_cost[choice], arrays.energy)
+            arrays.last_energy_refill_at = np.where(planting, now, arrays.last_energy_refill_at)
+            arrays.gold = np.where(pays_gold, arrays.gold - seed, arrays.gold)
+            arrays.starter_seed_charges = arrays.starter_seed_charges - uses_starter
+
+            base = growth[choice]
+            bonus = arrays.tool_bonus_percent
+            grow_seconds = np.where(bonus > 0, np.maximum(MIN_GROWTH_SECONDS, base - base * bonus // 100), base)
+            arrays.plot_plants[:, slot] = np.where(planting, choice, arrays.plot_plants[:, slot])
+            arrays.plot_ready_at[:, slot] = np.where(planting, now + grow_seconds, arrays.plot_ready_at[:, slot])
+
+        day = now // SECONDS_PER_DAY
+        closing = active & ((now + interval) // SECONDS_PER_DAY > day)
+        who = rows[closing]
+        gold_curve[who, day[who]] = arrays.gold[who]
+        xp_curve[who, day[who]] = arrays.xp_earned[who]
+        level_curve[who, day[who]] = arrays.level[who]
+        visit += 1
+
+    return PopulationResult(
+        strategy=strategy.name,
+        players=players,
+        days=days,
+        mean_gold=gold_curve.mean(axis=0).tolist(),
+        mean_xp_earned=xp_curve.mean(axis=0).tolist(),
+        mean_level=level_curve.mean(axis=0).tolist(),
+        vectorized=True,
+    )
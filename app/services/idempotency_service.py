@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.models.idempotency import IdempotencyKey
+from app.utils.exceptions import IdempotencyKeyReused, IdempotencyRequestInProgress
+
+
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+# how often a process sweeps expired keys while reserving new ones
+IDEMPOTENCY_PURGE_INTERVAL = timedelta(minutes=10)
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: Any
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class IdempotencyService:
+    """Reserves Idempotency-Key values inside the caller's transaction and replays stored responses.
+
+    The reservation row is written in the same transaction as the action it guards, so a failed
+    action rolls the key back with it and a retry simply runs again. Expired rows are swept by
+    ``begin`` at most once per ``IDEMPOTENCY_PURGE_INTERVAL`` per process.
+    """
+
+    _next_purge_at: Optional[datetime] = None
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    @staticmethod
+    def fingerprint(payload: Any) -> str:
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def begin(
+        self,
+        scope: str,
+        key: str,
+        request_hash: str,
+        now: Optional[datetime] = None,
+    ) -> Optional[StoredResponse]:
+        """Return the stored response for a duplicate, or reserve the key and return ``None``."""
+        now = now or datetime.now(timezone.utc)
+        self._purge_if_due(now)
+        existing = self._lookup(scope, key)
+        if existing is not None and _as_utc(existing.expires_at) <= now:
+            self.session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            )
+            existing = None
+
+        if existing is None:
+            if self._reserve(scope, key, request_hash, now):
+                return None
+            # a concurrent request with the same key committed first
+            existing = self._lookup(scope, key)
+            if existing is None:
+                raise IdempotencyRequestInProgress("Request with this Idempotency-Key is still in progress")
+
+        return self._stored_response(existing, request_hash)
+
+    def replay(
+        self,
+        scope: str,
+        key: str,
+        request_hash: str,
+        now: Optional[datetime] = None,
+    ) -> Optional[StoredResponse]:
+        """Read-only counterpart of :meth:`begin`: never reserves the key."""
+        now = now or datetime.now(timezone.utc)
+        existing = self._lookup(scope, key)
+        if existing is None or _as_utc(existing.expires_at) <= now:
+            return None
+        return self._stored_response(existing, request_hash)
+
+    def complete(self, scope: str, key: str, status_code: int, body: Any) -> None:
+        self.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            .values(status_code=status_code, response_body=json.dumps(body, ensure_ascii=False))
+            .execution_options(synchronize_session=False)
+        )
+
+    def purge_expired(self, now: Optional[datetime] = None) -> int:
+        now = now or datetime.now(timezone.utc)
+        result = self.session.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+        return result.rowcount or 0
+
+    def _purge_if_due(self, now: datetime) -> None:
+        next_purge_at = IdempotencyService._next_purge_at
+        if next_purge_at is not None and now < next_purge_at:
+            return
+        IdempotencyService._next_purge_at = now + IDEMPOTENCY_PURGE_INTERVAL
+        self.purge_expired(now)
+
+    @staticmethod
+    def _stored_response(existing: Any, request_hash: str) -> StoredResponse:
+        if existing.request_hash != request_hash:
+            raise IdempotencyKeyReused("Idempotency-Key was already used with a different request")
+        if existing.status_code is None:
+            raise IdempotencyRequestInProgress("Request with this Idempotency-Key is still in progress")
+        return StoredResponse(status_code=existing.status_code, body=json.loads(existing.response_body))
+
+    def _lookup(self, scope: str, key: str):
+        stmt = select(
+            IdempotencyKey.request_hash,
+            IdempotencyKey.status_code,
+            IdempotencyKey.response_body,
+            IdempotencyKey.expires_at,
+        ).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+        return self.session.execute(stmt).first()
+
+    def _reserve(self, scope: str, key: str, request_hash: str, now: datetime) -> bool:
+        values = {
+            "scope": scope,
+            "key": key,
+            "request_hash": request_hash,
+            "created_at": now,
+            "expires_at": now + IDEMPOTENCY_KEY_TTL,
+        }
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            try:
+                with self.session.begin_nested():
+                    self.session.execute(insert(IdempotencyKey).values(**values))
+            except IntegrityError:
+                return False
+            return True
+
+        stmt = (
+            dialect_insert(IdempotencyKey)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=["scope", "key"])
+            .returning(IdempotencyKey.id)
+        )
+        return self.session.execute(stmt).first() is not None
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import case, false, func, or_, select, text, true, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session
 
 from app.db.models.inventory import InventoryItem, InventoryItemCatalog
 from app.db.models.player import Player
 from app.utils.exceptions import InventoryItemNotFound
+from app.constants.inventory import STACKABLE_SLOTS
 from app.constants.player_stats import DEFAULT_BASE_STATS
 
 
@@ -18,6 +19,38 @@ class GrantedItem:
     item_id: int
     catalog_item_id: int
     name: str
+    quantity: int = 1
+
+
+def is_stackable(catalog_item: InventoryItemCatalog) -> bool:
+    """Non-equippable items and cosmetics are kept as one row per catalog item with a quantity."""
+    return catalog_item.slot in STACKABLE_SLOTS or bool(catalog_item.cosmetic)
+
+
+def build_stack_upsert_statement(dialect_name: str, owner_id: int, catalog_item: InventoryItemCatalog, amount: int = 1):
+    """INSERT of a stack row that grows the existing one on conflict, returning ``(id, quantity)``.
+
+    The partial unique index on ``(owner_id, catalog_item_id) WHERE stackable`` is the conflict
+    target, so concurrent grants of the same item land in one row instead of racing to insert.
+    """
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(InventoryItem).values(
+        owner_id=owner_id,
+        catalog_item_id=catalog_item.id,
+        slot=catalog_item.slot,
+        is_equipped=False,
+        quantity=amount,
+        stackable=True,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[InventoryItem.owner_id, InventoryItem.catalog_item_id],
+        index_where=text("stackable"),
+        set_={"quantity": InventoryItem.quantity + stmt.excluded.quantity},
+    ).returning(InventoryItem.id, InventoryItem.quantity)
 
 
 class InventoryService:
@@ -31,7 +64,22 @@ class InventoryService:
         if catalog_item is None:
             raise InventoryItemNotFound(f"Catalog item {catalog_item_id} does not exist")
 
-        inventory_item = InventoryItem(owner_id=player.id, catalog_item_id=catalog_item.id)
+        if is_stackable(catalog_item):
+            dialect_name = self._session.get_bind().dialect.name
+            stack = self._session.execute(build_stack_upsert_statement(dialect_name, player.id, catalog_item)).one()
+            return GrantedItem(
+                item_id=stack.id,
+                catalog_item_id=catalog_item.id,
+                name=catalog_item.name,
+                quantity=stack.quantity,
+            )
+
+        inventory_item = InventoryItem(
+            owner_id=player.id,
+            catalog_item_id=catalog_item.id,
+            slot=catalog_item.slot,
+            quantity=1,
+        )
         self._session.add(inventory_item)
 
         if auto_flush:
@@ -44,7 +92,7 @@ class InventoryService:
         )
 
 
-def _build_base_stats(player: Optional[Player]) -> Dict[str, int]:
+def _build_base_stats(player: Optional[Any]) -> Dict[str, int]:
     """Return base stats dict with safe defaults."""
     if player is None:
         return {key: value for key, value in DEFAULT_BASE_STATS.items()}
@@ -56,87 +104,222 @@ def _build_base_stats(player: Optional[Player]) -> Dict[str, int]:
     return stats
 
 
+INVENTORY_FIELDS: Tuple[str, ...] = (
+    "id",
+    "name",
+    "slot",
+    "rarity",
+    "cosmetic",
+    "is_equipped",
+    "quantity",
+    "icon",
+    "description",
+)
+INVENTORY_PAGE_SIZE = 50
+INVENTORY_PREVIEW_SIZE = 4
+
+_ITEM_COLUMNS = {
+    "slot": InventoryItem.slot,
+    "is_equipped": InventoryItem.is_equipped,
+    "quantity": InventoryItem.quantity,
+}
+_CATALOG_COLUMNS = {
+    "name": InventoryItemCatalog.name,
+    "rarity": InventoryItemCatalog.rarity,
+    "cosmetic": InventoryItemCatalog.cosmetic,
+    "icon": InventoryItemCatalog.icon,
+    "description": InventoryItemCatalog.description,
+}
+_UNKNOWN_CATALOG_ITEM = {
+    "name": "Невідомий предмет",
+    "rarity": "common",
+    "cosmetic": False,
+    "icon": None,
+    "description": None,
+}
+
+
+@dataclass
+class InventoryFilters:
+    slot: Optional[str] = None
+    rarity: Optional[str] = None
+    equipped: Optional[bool] = None
+    cosmetic: Optional[bool] = None
+
+
+def _inventory_statement(
+    player_id: int,
+    fields: Sequence[str],
+    filters: Optional[InventoryFilters] = None,
+):
+    """Column projection of the player's items; the catalog is joined only when it is needed."""
+    filters = filters or InventoryFilters()
+    columns: List[Any] = [InventoryItem.id]
+    columns.extend(_ITEM_COLUMNS[field] for field in fields if field in _ITEM_COLUMNS)
+
+    catalog_fields = [field for field in fields if field in _CATALOG_COLUMNS]
+    filters_on_catalog = filters.rarity is not None or filters.cosmetic is not None
+    if catalog_fields:
+        columns.append(InventoryItemCatalog.id.label("catalog_id"))
+        columns.extend(_CATALOG_COLUMNS[field] for field in catalog_fields)
+
+    stmt = select(*columns).where(InventoryItem.owner_id == player_id)
+    join_condition = InventoryItemCatalog.id == InventoryItem.catalog_item_id
+    if filters_on_catalog:
+        stmt = stmt.join(InventoryItemCatalog, join_condition)
+    elif catalog_fields:
+        stmt = stmt.outerjoin(InventoryItemCatalog, join_condition)
+
+    if filters.slot is not None:
+        stmt = stmt.where(InventoryItem.slot == filters.slot)
+    if filters.equipped is not None:
+        stmt = stmt.where(InventoryItem.is_equipped.is_(filters.equipped))
+    if filters.rarity is not None:
+        stmt = stmt.where(InventoryItemCatalog.rarity == filters.rarity)
+    if filters.cosmetic is not None:
+        stmt = stmt.where(InventoryItemCatalog.cosmetic.is_(filters.cosmetic))
+    return stmt
+
+
+def _serialize_inventory_row(row: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    values = row._mapping
+    known = values.get("catalog_id") is not None
+    entry: Dict[str, Any] = {}
+    for field in fields:
+        if field in _CATALOG_COLUMNS:
+            entry[field] = values[field] if known else _UNKNOWN_CATALOG_ITEM[field]
+        elif field == "slot":
+            entry[field] = values[field] or "misc"
+        else:
+            entry[field] = values[field]
+    return entry
+
+
 async def build_inventory_public(session: AsyncSession, player_id: int) -> Dict[str, Any]:
-    """Return a public representation of player's inventory suitable for the UI."""
-    player = await session.get(Player, player_id)
+    """Return a public representation of player's inventory suitable for the UI.
 
+    One statement: the player's base stats are outer-joined onto every item row, so a player
+    without items still yields a single row and an unknown player yields none.
+    """
+    items = _inventory_statement(player_id, INVENTORY_FIELDS).subquery()
     stmt = (
-        select(InventoryItem)
-        .where(InventoryItem.owner_id == player_id)
-        .options(selectinload(InventoryItem.catalog_item))
+        select(*(getattr(Player, key) for key in DEFAULT_BASE_STATS), items)
+        .select_from(Player)
+        .outerjoin(items, true())
+        .where(Player.id == player_id)
+        .order_by(items.c.id)
     )
-    result = await session.execute(stmt)
-    items = result.scalars().all()
-
-    inventory_public: List[Dict[str, Any]] = []
-    for item in items:
-        catalog_item = item.catalog_item
-        inventory_public.append(
-            {
-                "id": item.id,
-                "name": catalog_item.name if catalog_item else "Невідомий предмет",
-                "slot": catalog_item.slot if catalog_item else "misc",
-                "rarity": catalog_item.rarity if catalog_item else "common",
-                "cosmetic": catalog_item.cosmetic if catalog_item else False,
-                "is_equipped": item.is_equipped,
-                "icon": catalog_item.icon if catalog_item else None,
-                "description": catalog_item.description if catalog_item else None,
-            }
-        )
+    rows = (await session.execute(stmt)).all()
 
     return {
-        "items": inventory_public,
+        "items": [_serialize_inventory_row(row, INVENTORY_FIELDS) for row in rows if row.id is not None],
+        "base_stats": _build_base_stats(rows[0] if rows else None),
+    }
+
+
+async def list_inventory_page(
+    session: AsyncSession,
+    player_id: int,
+    *,
+    limit: int = INVENTORY_PAGE_SIZE,
+    cursor: Optional[int] = None,
+    filters: Optional[InventoryFilters] = None,
+    fields: Sequence[str] = INVENTORY_FIELDS,
+) -> Dict[str, Any]:
+    """Keyset-paginated slice of the inventory; ``next_cursor`` is the last returned item id."""
+    player = await session.get(Player, player_id)
+
+    stmt = _inventory_statement(player_id, fields, filters)
+    if cursor is not None:
+        stmt = stmt.where(InventoryItem.id > cursor)
+    stmt = stmt.order_by(InventoryItem.id).limit(limit + 1)
+    rows = (await session.execute(stmt)).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "items": [_serialize_inventory_row(row, fields) for row in rows],
         "base_stats": _build_base_stats(player),
+        "next_cursor": rows[-1].id if has_more else None,
     }
 
 
-async def equip_inventory_item(session: AsyncSession, player_id: int, item_id: int) -> Optional[InventoryItem]:
-    """Equip the specified inventory item, unequipping others in the same slot."""
+async def build_inventory_preview(
+    session: AsyncSession,
+    player_id: int,
+    limit: int = INVENTORY_PREVIEW_SIZE,
+) -> List[Dict[str, Any]]:
+    """Equipped items first, then by slot and name.
+
+    Only ``limit`` rows come back, but the database still sorts the player's whole inventory to
+    find them: the order spans the catalog join, so no index can deliver it.
+    """
     stmt = (
-        select(InventoryItem)
-        .where(InventoryItem.id == item_id, InventoryItem.owner_id == player_id)
-        .options(selectinload(InventoryItem.catalog_item))
+        _inventory_statement(player_id, INVENTORY_FIELDS)
+        .order_by(InventoryItem.is_equipped.desc(), InventoryItem.slot, InventoryItemCatalog.name)
+        .limit(limit)
     )
     result = await session.execute(stmt)
-    item = result.scalars().first()
-    if item is None:
-        return None
+    return [_serialize_inventory_row(row, INVENTORY_FIELDS) for row in result]
 
-    slot = item.catalog_item.slot if item.catalog_item else None
 
-    if slot:
-        other_items_stmt = (
-            select(InventoryItem)
-            .join(InventoryItem.catalog_item)
-            .where(
-                InventoryItem.owner_id == player_id,
-                InventoryItem.id != item.id,
-                InventoryItemCatalog.slot == slot,
-            )
+async def has_unequipped_items(session: AsyncSession, player_id: int) -> bool:
+    stmt = (
+        select(InventoryItem.id)
+        .where(InventoryItem.owner_id == player_id, InventoryItem.is_equipped.is_(False))
+        .limit(1)
+    )
+    result = await session.execute(stmt)
+    return result.scalar() is not None
+
+
+def build_equip_statement(player_id: int, item_id: int):
+    """UPDATE that equips ``item_id`` and unequips the rest of its slot via ix_inventory_items_owner_id_slot."""
+    target_slot = (
+        select(InventoryItem.slot)
+        .where(InventoryItem.id == item_id, InventoryItem.owner_id == player_id)
+        .scalar_subquery()
+    )
+    return (
+        update(InventoryItem)
+        .where(
+            InventoryItem.owner_id == player_id,
+            InventoryItem.slot == target_slot,
+            or_(InventoryItem.id == item_id, InventoryItem.is_equipped.is_(True)),
         )
-        others_result = await session.execute(other_items_stmt)
-        for other in others_result.scalars().all():
-            other.is_equipped = False
+        .values(is_equipped=case((InventoryItem.id == item_id, true()), else_=false()))
+    )
 
-    item.is_equipped = True
-    await session.flush()
-    await session.refresh(item)
-    return item
 
+async def equip_inventory_item(session: AsyncSession, player_id: int, item_id: int) -> Optional[Dict[int, bool]]:
+    """Equip the item and unequip the rest of its slot in a single UPDATE.
 
-async def unequip_inventory_item(session: AsyncSession, player_id: int, item_id: int) -> Optional[InventoryItem]:
-    """Unequip the specified inventory item for the player."""
+    Returns ``{item_id: is_equipped}`` for every row the statement touched, or ``None``
+    when the item does not belong to the player.
+    """
     stmt = (
-        select(InventoryItem)
-        .where(InventoryItem.id == item_id, InventoryItem.owner_id == player_id)
-        .options(selectinload(InventoryItem.catalog_item))
+        build_equip_statement(player_id, item_id)
+        .returning(InventoryItem.id, InventoryItem.is_equipped)
+        .execution_options(synchronize_session=False)
     )
     result = await session.execute(stmt)
-    item = result.scalars().first()
-    if item is None:
+    changes = {row.id: bool(row.is_equipped) for row in result}
+    if item_id not in changes:
         return None
+    return changes
 
-    item.is_equipped = False
-    await session.flush()
-    await session.refresh(item)
-    return item
+
+async def unequip_inventory_item(session: AsyncSession, player_id: int, item_id: int) -> Optional[Dict[int, bool]]:
+    """Unequip the specified inventory item for the player in a single UPDATE."""
+    stmt = (
+        update(InventoryItem)
+        .where(InventoryItem.id == item_id, InventoryItem.owner_id == player_id)
+        .values(is_equipped=False)
+        .returning(InventoryItem.id)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.execute(stmt)
+    updated_ids = result.scalars().all()
+    if not updated_ids:
+        return None
+    return {updated_id: False for updated_id in updated_ids}
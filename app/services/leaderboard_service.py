@@ -0,0 +1,254 @@
+"""Level, farming and gold leaderboards kept in memory and updated as players change.
+
+Each board is a ``RankedSet`` of ``(-score..., player_id)`` keys, so the best player sits at
+position 0 and ties go to the older account. Top-N, a player's rank and their neighbours are
+O(log n) lookups instead of ``ORDER BY`` scans over ``players``.
+
+The boards are built from the database on first use (``rebuild``). After that, flushes record the
+new scores of every touched ``Player``/``PlayerFarmingStats`` in ``session.info`` and commits
+apply them, the same way the shop and plant caches learn about their changes. Every worker keeps
+its own copy, so writes made by other processes only show up after that worker rebuilds.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.constants.leaderboard import (
+    LEADERBOARD_BOARDS,
+    LEADERBOARD_FARMING,
+    LEADERBOARD_GOLD,
+    LEADERBOARD_LEVEL,
+)
+from app.db.models.farm import PlayerFarmingStats
+from app.db.models.player import Player
+from app.utils.ranking import RankedSet
+
+Score = Tuple[int, ...]
+# board name -> new score (None: the player leaves the board), plus "username" -> display name
+ScoreChanges = Dict[str, Any]
+
+
+@dataclass(frozen=True)
+class RankedPlayer:
+    rank: int
+    player_id: int
+    username: Optional[str]
+    score: Score
+
+
+@dataclass(frozen=True)
+class PlayerStanding:
+    rank: int
+    total: int
+    player: RankedPlayer
+    neighbours: List[RankedPlayer]
+
+
+class Leaderboard:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._ranks: RankedSet[Tuple[int, ...]] = RankedSet()
+        self._keys: Dict[int, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    @staticmethod
+    def _key(player_id: int, score: Score) -> Tuple[int, ...]:
+        return (*(-value for value in score), player_id)
+
+    def set(self, player_id: int, score: Optional[Score]) -> None:
+        key = None if score is None else self._key(player_id, score)
+        previous = self._keys.get(player_id)
+        if previous == key:
+            return
+        if previous is not None:
+            self._ranks.remove(previous)
+            del self._keys[player_id]
+        if key is not None:
+            self._ranks.add(key)
+            self._keys[player_id] = key
+
+    def rank(self, player_id: int) -> Optional[int]:
+        """One-based rank, or None when the player is not on this board."""
+        key = self._keys.get(player_id)
+        return None if key is None else self._ranks.index(key) + 1
+
+    def page(self, offset: int, limit: int) -> List[Tuple[int, int, Score]]:
+        """``(rank, player_id, score)`` for ranks ``offset + 1`` to ``offset + limit``."""
+        return [
+            (offset + position + 1, key[-1], tuple(-value for value in key[:-1]))
+            for position, key in enumerate(self._ranks.slice(offset, offset + limit))
+        ]
+
+
+class LeaderboardRegistry:
+    """Process-wide boards plus the usernames they display."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        # single flight: one rebuild at a time, so a second one cannot reset the first one's backlog
+        self._rebuild_lock = threading.Lock()
+        self._boards = {name: Leaderboard(name) for name in LEADERBOARD_BOARDS}
+        self._usernames: Dict[int, Optional[str]] = {}
+        self._loaded = False
+        # changes committed while a rebuild was reading the tables; replayed on top of it
+        self._backlog: Optional[List[Dict[int, ScoreChanges]]] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def reset(self) -> None:
+        with self._lock:
+            self._boards = {name: Leaderboard(name) for name in LEADERBOARD_BOARDS}
+            self._usernames = {}
+            self._loaded = False
+            self._backlog = None
+
+    def ensure_loaded(self, session: Session) -> None:
+        if self._loaded:
+            return
+        with self._rebuild_lock:
+            # a concurrent cold start may have loaded the boards while this one waited
+            if not self._loaded:
+                self._rebuild(session)
+
+    def rebuild(self, session: Session) -> Dict[str, int]:
+        """Reload every board from the database; returns the number of players per board."""
+        with self._rebuild_lock:
+            return self._rebuild(session)
+
+    def _rebuild(self, session: Session) -> Dict[str, int]:
+        with self._lock:
+            self._backlog = []
+        try:
+            boards = {name: Leaderboard(name) for name in LEADERBOARD_BOARDS}
+            usernames: Dict[int, Optional[str]] = {}
+            rows = session.execute(
+                select(Player.id, Player.username, Player.level, Player.xp, Player.gold, PlayerFarmingStats.level, PlayerFarmingStats.xp)
+                .outerjoin(PlayerFarmingStats, PlayerFarmingStats.player_id == Player.id)
+            )
+            for player_id, username, level, xp, gold, farming_level, farming_xp in rows:
+                usernames[player_id] = username
+                boards[LEADERBOARD_LEVEL].set(player_id, (level, xp))
+                boards[LEADERBOARD_GOLD].set(player_id, (gold,))
+                if farming_level is not None:
+                    boards[LEADERBOARD_FARMING].set(player_id, (farming_level, farming_xp))
+        except BaseException:
+            with self._lock:
+                self._backlog = None
+            raise
+
+        with self._lock:
+            backlog, self._backlog = self._backlog or [], None
+            self._boards, self._usernames, self._loaded = boards, usernames, True
+            for changes in backlog:
+                self._apply(changes)
+            return {name: len(board) for name, board in boards.items()}
+
+    def apply(self, changes: Dict[int, ScoreChanges]) -> None:
+        with self._lock:
+            if self._backlog is not None:
+                self._backlog.append(changes)
+            elif self._loaded:
+                self._apply(changes)
+
+    def _apply(self, changes: Dict[int, ScoreChanges]) -> None:
+        for player_id, player_changes in changes.items():
+            for name, value in player_changes.items():
+                if name == "username":
+                    self._usernames[player_id] = value
+                else:
+                    self._boards[name].set(player_id, value)
+
+    def _ranked(self, rows: Iterable[Tuple[int, int, Score]]) -> List[RankedPlayer]:
+        return [RankedPlayer(rank, player_id, self._usernames.get(player_id), score) for rank, player_id, score in rows]
+
+    def top(self, name: str, limit: int, offset: int = 0) -> Tuple[int, List[RankedPlayer]]:
+        with self._lock:
+            board = self._boards[name]
+            return len(board), self._ranked(board.page(offset, limit))
+
+    def standing(self, name: str, player_id: int, around: int) -> Optional[PlayerStanding]:
+        with self._lock:
+            board = self._boards[name]
+            rank = board.rank(player_id)
+            if rank is None:
+                return None
+            start = max(0, rank - 1 - around)
+            window = self._ranked(board.page(start, rank - start + around))
+            player = window[rank - 1 - start]
+            neighbours = [entry for entry in window if entry.player_id != player_id]
+            return PlayerStanding(rank=rank, total=len(board), player=player, neighbours=neighbours)
+
+
+leaderboards = LeaderboardRegistry()
+
+_PENDING_KEY = "leaderboard_changes"
+
+
+def _loaded(instance: Any) -> Dict[str, Any]:
+    # only what the flush already has in memory; never trigger a load from an event hook
+    return inspect(instance).dict
+
+
+def _player_changes(values: Dict[str, Any]) -> ScoreChanges:
+    # each board is staged from its own columns, so a narrow load_only still updates the
+    # boards it did load (the farm flows load only id, level and gold)
+    changes: ScoreChanges = {}
+    if "level" in values and "xp" in values:
+        changes[LEADERBOARD_LEVEL] = (values["level"], values["xp"])
+    if "gold" in values:
+        changes[LEADERBOARD_GOLD] = (values["gold"],)
+    if "username" in values:
+        changes["username"] = values["username"]
+    return changes
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_score_changes(session: Session, _flush_context: Any) -> None:
+    pending: Optional[Dict[int, ScoreChanges]] = None
+    for instance in (*session.new, *session.dirty):
+        if isinstance(instance, Player):
+            values = _loaded(instance)
+            player_id = values.get("id")
+            changes = _player_changes(values)
+        elif isinstance(instance, PlayerFarmingStats):
+            values = _loaded(instance)
+            player_id = values.get("player_id")
+            if "level" not in values or "xp" not in values:
+                continue
+            changes = {LEADERBOARD_FARMING: (values["level"], values["xp"])}
+        else:
+            continue
+        if player_id is None or not changes:
+            continue
+        if pending is None:
+            pending = session.info.setdefault(_PENDING_KEY, {})
+        pending.setdefault(player_id, {}).update(changes)
+
+    for instance in session.deleted:
+        if isinstance(instance, Player):
+            removed: ScoreChanges = {name: None for name in LEADERBOARD_BOARDS}
+            session.info.setdefault(_PENDING_KEY, {}).setdefault(instance.id, {}).update(removed)
+        elif isinstance(instance, PlayerFarmingStats):
+            session.info.setdefault(_PENDING_KEY, {}).setdefault(instance.player_id, {})[LEADERBOARD_FARMING] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session: Session) -> None:
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        leaderboards.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
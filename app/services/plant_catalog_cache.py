@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from app.constants.farm import PLANT_CATALOG_CACHE_MAX_AGE_SECONDS
+from app.db.models.farm import PlantType
+from app.services.snapshot_cache import SnapshotCache
+
+
+PLANT_COLUMNS: Tuple[str, ...] = tuple(column.key for column in PlantType.__table__.columns)
+
+
+class PlantCatalogCache(SnapshotCache[Tuple[Dict[str, Any], ...]]):
+    """Copy of ``farm_plant_catalog``.
+
+    ``attach`` puts the cached rows into a session's identity map without a query, so
+    ``PlantedCrop.plant_type`` resolves from memory as well.
+    """
+
+    def __init__(self) -> None:
+        super().__init__("plant_catalog", (PlantType,), PLANT_CATALOG_CACHE_MAX_AGE_SECONDS)
+
+    def rows(self, session: Session) -> Tuple[Dict[str, Any], ...]:
+        rows, generation = self.lookup()
+        if rows is None:
+            result = session.execute(select(*PlantType.__table__.columns).order_by(PlantType.id))
+            rows = tuple(dict(row._mapping) for row in result)
+            # an empty catalog is about to be seeded
+            if rows:
+                self.store(generation, rows)
+        return rows
+
+    def attach(self, session: Session) -> List[PlantType]:
+        plants: List[PlantType] = []
+        for row in self.rows(session):
+            existing = session.identity_map.get(identity_key(PlantType, row["id"]))
+            if existing is not None:
+                plants.append(existing)
+                continue
+            plant = PlantType(**row)
+            make_transient_to_detached(plant)
+            plants.append(session.merge(plant, load=False))
+        return plants
+
+
+plant_catalog_cache = PlantCatalogCache()
@@ -18,6 +18,7 @@ def build_player_profile(player: Player) -> PlayerProfile:
             rarity=item.catalog_item.rarity if item.catalog_item else "common",
             cosmetic=item.catalog_item.cosmetic if item.catalog_item else False,
             is_equipped=item.is_equipped,
+            quantity=item.quantity or 1,
             icon=item.catalog_item.icon if item.catalog_item else None,
             description=item.catalog_item.description if item.catalog_item else None,
         )
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models.player import Player
 from app.utils.exceptions import DailyRewardUnavailable
+from app.utils.metrics import DAILY_CLAIMS
 
 
 BASE_XP_THRESHOLD = 100
@@ -16,6 +19,7 @@ DAILY_REWARD_COOLDOWN = timedelta(hours=24)
 DAILY_REWARD_XP = 50
 DAILY_REWARD_ENERGY = 5
 DAILY_REWARD_GOLD = 100
+DAILY_CLAIMABLE_BATCH_SIZE = 1000
 
 
 @dataclass
@@ -140,6 +144,7 @@ class ProgressionService:
 
         player.last_daily_claim_at = now
         self._session.add(player)
+        DAILY_CLAIMS.inc()
 
         return DailyRewardResult(
             xp_gained=DAILY_REWARD_XP,
@@ -175,3 +180,47 @@ class ProgressionService:
             "target": target,
             "reward_preview": "Епічний Плащ Ночі",
         }
+
+
+async def iter_claimable_player_ids(
+    session: AsyncSession,
+    now: Optional[datetime] = None,
+    batch_size: int = DAILY_CLAIMABLE_BATCH_SIZE,
+) -> AsyncIterator[List[int]]:
+    """Yield ids of players who can claim the daily reward at ``now``, ``batch_size`` at a time.
+
+    Two keyset-paginated range scans over ``ix_players_last_daily_claim_at_id``: players who never
+    claimed (by id), then players whose last claim is older than the cooldown (by claim time, id).
+    Every batch is one bounded index query, so memory stays flat however many players qualify.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - DAILY_REWARD_COOLDOWN
+
+    last_id: Optional[int] = None
+    while True:
+        stmt = select(Player.id).where(Player.last_daily_claim_at.is_(None)).order_by(Player.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(Player.id > last_id)
+        player_ids = list((await session.scalars(stmt)).all())
+        if player_ids:
+            yield player_ids
+        if len(player_ids) < batch_size:
+            break
+        last_id = player_ids[-1]
+
+    position = None
+    while True:
+        stmt = (
+            select(Player.last_daily_claim_at, Player.id)
+            .where(Player.last_daily_claim_at <= cutoff)
+            .order_by(Player.last_daily_claim_at, Player.id)
+            .limit(batch_size)
+        )
+        if position is not None:
+            stmt = stmt.where(tuple_(Player.last_daily_claim_at, Player.id) > tuple_(*position))
+        rows = (await session.execute(stmt)).all()
+        if rows:
+            yield [row.id for row in rows]
+        if len(rows) < batch_size:
+            return
+        position = tuple(rows[-1])
@@ -1,17 +1,37 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from typing import TYPE_CHECKING
+
+from sqlalchemy import event, select
 from sqlalchemy.orm import Session
 
-from app.content.fallen_crown import (
-    FALLEN_CROWN_START_NODE_ID,
-    fallen_crown_blueprint,
-)
 from app.constants.onboarding import ONBOARDING_QUEST_ID
+from app.constants.quests import FALLEN_CROWN_START_NODE_ID
 from app.db.models.player import Player
 from app.db.models.quest import QuestNode, QuestProgress
-from app.services.quest_content_builder import QuestContentBuilder, QuestSpec
 from app.utils.exceptions import QuestNotConfigured
+from app.utils.metrics import CACHE_LOOKUPS
+
+if TYPE_CHECKING:
+    from app.services.quest_content_builder import QuestSpec
+
+
+class QuestContentCache:
+    """Remembers that this process has already synced the code-defined quests into the database.
+
+    Quest content only changes with a deploy, so one committed sync per process is enough.
+    """
+
+    def __init__(self) -> None:
+        self.synced = False
+
+    def reset(self) -> None:
+        self.synced = False
+
+
+quest_content_cache = QuestContentCache()
+
+_SYNCED_FLAG = "quest_content_synced"
 
 
 class QuestContentService:
@@ -19,12 +39,19 @@ class QuestContentService:
 
     def __init__(self, session: Session) -> None:
         self._session = session
-        self._builder = QuestContentBuilder(session)
 
     def ensure_fallen_crown_saga(self) -> None:
         """Ensure the Saga of the Fallen Crown quests exist and are up to date."""
-        quest_specs = fallen_crown_blueprint()
-        self._sync_specs(quest_specs)
+        if quest_content_cache.synced:
+            CACHE_LOOKUPS.inc("quest_content", "hit")
+        else:
+            CACHE_LOOKUPS.inc("quest_content", "miss")
+            # the blueprint is large and only needed for a sync, so it is imported (and built) here
+            from app.content.fallen_crown import fallen_crown_blueprint
+
+            self._sync_specs(fallen_crown_blueprint())
+            # trusted only once this transaction commits
+            self._session.info[_SYNCED_FLAG] = True
         self._migrate_players_to_saga()
 
     def ensure_fallen_crown_start_node(self) -> QuestNode:
@@ -40,8 +67,11 @@ class QuestContentService:
     # ------------------------------------------------------------------
 
     def _sync_specs(self, specs: list[QuestSpec]) -> None:
+        from app.services.quest_content_builder import QuestContentBuilder
+
+        builder = QuestContentBuilder(self._session)
         for spec in specs:
-            self._builder.sync_quest(spec)
+            builder.sync_quest(spec)
         self._session.flush()
 
     def _migrate_players_to_saga(self) -> None:
@@ -76,3 +106,14 @@ class QuestContentService:
             self._session.add(progress)
 
         self._session.flush()
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_synced_content(session: Session) -> None:
+    if session.info.pop(_SYNCED_FLAG, False):
+        quest_content_cache.synced = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_unsynced_content(session: Session) -> None:
+    session.info.pop(_SYNCED_FLAG, None)
@@ -6,7 +6,7 @@ from typing import Optional, Tuple
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
 
-from app.content.fallen_crown import FALLEN_CROWN_START_NODE_ID
+from app.constants.quests import FALLEN_CROWN_START_NODE_ID
 from app.db.models.inventory import InventoryItemCatalog
 from app.db.models.player import Player
 from app.db.models.quest import QuestChoice, QuestNode, QuestProgress
@@ -20,6 +20,7 @@ from app.utils.exceptions import (
     QuestNodeNotFound,
     QuestNotConfigured,
 )
+from app.utils.metrics import QUEST_CHOICES
 
 
 @dataclass
@@ -111,6 +112,7 @@ class QuestEngine:
 
         self._session.add_all([progress, player])
         self._session.flush()
+        QUEST_CHOICES.inc()
 
         level_up = xp_result.levels_gained > 0
         reward_message = getattr(choice, "result_message", None)
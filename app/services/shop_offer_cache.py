@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.shop import SHOP_OFFER_CACHE_MAX_AGE_SECONDS
+from app.db.models.inventory import InventoryItemCatalog
+from app.db.models.shop import ShopOffer
+from app.services.snapshot_cache import SnapshotCache
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass(frozen=True)
+class ShopOfferSnapshot:
+    """Active offers rendered without the player-specific ``owned`` flag.
+
+    Stock is not part of the snapshot: purchases decrement it with a bulk UPDATE that never
+    invalidates the cache, so callers read ``stock_remaining`` for ``stocked_offer_ids`` per request.
+    """
+
+    offers: Tuple[Tuple[Optional[int], Dict[str, Any]], ...]
+    catalog_item_ids: Tuple[int, ...]
+    stocked_offer_ids: Tuple[int, ...]
+    valid_until: Optional[datetime]
+
+    def is_current(self, now: datetime) -> bool:
+        return self.valid_until is None or now < self.valid_until
+
+
+class ShopOfferCache(SnapshotCache[ShopOfferSnapshot]):
+    """The shop window, rebuilt when the earliest offer expires."""
+
+    def __init__(self) -> None:
+        super().__init__("shop_offers", (ShopOffer, InventoryItemCatalog), SHOP_OFFER_CACHE_MAX_AGE_SECONDS)
+
+    async def get(self, session: AsyncSession, now: Optional[datetime] = None) -> ShopOfferSnapshot:
+        now = now or datetime.now(timezone.utc)
+        snapshot, generation = self.lookup(lambda cached: cached.is_current(now))
+        if snapshot is None:
+            snapshot = await self._load(session, now)
+            self.store(generation, snapshot)
+        return snapshot
+
+    async def _load(self, session: AsyncSession, now: datetime) -> ShopOfferSnapshot:
+        stmt = (
+            select(
+                ShopOffer.id,
+                ShopOffer.price_gold,
+                ShopOffer.expires_at,
+                ShopOffer.is_limited,
+                ShopOffer.stock_remaining,
+                InventoryItemCatalog.id.label("catalog_id"),
+                InventoryItemCatalog.name,
+                InventoryItemCatalog.rarity,
+                InventoryItemCatalog.slot,
+                InventoryItemCatalog.cosmetic,
+                InventoryItemCatalog.description,
+                InventoryItemCatalog.icon,
+            )
+            .outerjoin(InventoryItemCatalog, InventoryItemCatalog.id == ShopOffer.catalog_item_id)
+            .where(or_(ShopOffer.expires_at.is_(None), ShopOffer.expires_at > now))
+            .order_by(ShopOffer.id)
+        )
+        rows = (await session.execute(stmt)).all()
+
+        offers: List[Tuple[Optional[int], Dict[str, Any]]] = []
+        catalog_item_ids: List[int] = []
+        stocked_offer_ids: List[int] = []
+        expiries: List[datetime] = []
+        for row in rows:
+            known = row.catalog_id is not None
+            if known:
+                catalog_item_ids.append(row.catalog_id)
+            if row.expires_at is not None:
+                expiries.append(_as_utc(row.expires_at))
+            if row.stock_remaining is not None:
+                stocked_offer_ids.append(row.id)
+            offers.append(
+                (
+                    row.catalog_id,
+                    {
+                        "offer_id": row.id,
+                        "item_name": row.name if known else "Невідомий предмет",
+                        "rarity": row.rarity if known else "common",
+                        "price_gold": row.price_gold,
+                        "expires_at": row.expires_at.isoformat() if row.expires_at else None,
+                        "owned": False,
+                        "is_limited": row.is_limited,
+                        "stock_remaining": None,
+                        "slot": row.slot if known else "misc",
+                        "cosmetic": row.cosmetic if known else False,
+                        "description": row.description if known else None,
+                        "icon": row.icon if known else None,
+                    },
+                )
+            )
+
+        return ShopOfferSnapshot(
+            offers=tuple(offers),
+            catalog_item_ids=tuple(sorted(set(catalog_item_ids))),
+            stocked_offer_ids=tuple(stocked_offer_ids),
+            valid_until=min(expiries) if expiries else None,
+        )
+
+
+shop_offer_cache = ShopOfferCache()
@@ -1,18 +1,72 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from sqlalchemy import or_, select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.db.models.inventory import InventoryItem, InventoryItemCatalog
+from app.constants.shop import SHOP_OFFER_PURCHASE_CONCURRENCY, SHOP_SOLD_OUT_MEMO_SECONDS
+from app.db.models.inventory import InventoryItem
 from app.db.models.player import Player
 from app.db.models.shop import ShopOffer
 from app.db.models.wallet import Wallet
+from app.services.inventory_service import build_stack_upsert_statement, is_stackable
 from app.services.player_service import create_player_if_not_exists
-from app.utils.exceptions import InsufficientFunds, ShopOfferUnavailable
+from app.services.shop_offer_cache import shop_offer_cache
+from app.utils.exceptions import InsufficientFunds, ShopOfferSoldOut, ShopOfferUnavailable
+
+
+class OfferPurchaseQueue:
+    """Per-offer gate that bounds how many purchase transactions of one offer reach the database.
+
+    A flash sale turns every buyer into a writer of the same ``shop_offers`` row; queueing them
+    in-process keeps row-lock waits short, and a remembered sell-out answers late buyers without
+    a transaction at all.
+    """
+
+    def __init__(self, concurrency: int = SHOP_OFFER_PURCHASE_CONCURRENCY) -> None:
+        self.concurrency = concurrency
+        self._gates: Dict[int, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sold_out: Dict[int, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, offer_id: int) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # semaphores belong to the loop they first waited on
+            self._gates.clear()
+            self._loop = loop
+        gate = self._gates.get(offer_id)
+        if gate is None:
+            gate = self._gates[offer_id] = asyncio.Semaphore(self.concurrency)
+        async with gate:
+            yield
+
+    def mark_sold_out(self, offer_id: int) -> None:
+        self._sold_out[offer_id] = time.monotonic()
+
+    def is_sold_out(self, offer_id: int) -> bool:
+        marked_at = self._sold_out.get(offer_id)
+        if marked_at is None:
+            return False
+        if time.monotonic() - marked_at >= SHOP_SOLD_OUT_MEMO_SECONDS:
+            del self._sold_out[offer_id]
+            return False
+        return True
+
+    def reset(self) -> None:
+        self._gates.clear()
+        self._sold_out.clear()
+        self._loop = None
+
+
+offer_purchase_queue = OfferPurchaseQueue()
 
 
 async def ensure_wallet(session: AsyncSession, player: Player) -> Wallet:
@@ -28,38 +82,33 @@ async def list_shop_offers(session: AsyncSession, player_id: int) -> Tuple[Walle
     player = await create_player_if_not_exists(session, player_id)
     wallet = await ensure_wallet(session, player)
 
-    now = datetime.now(timezone.utc)
-
-    offers_stmt = (
-        select(ShopOffer)
-        .options(selectinload(ShopOffer.catalog_item))
-        .where(or_(ShopOffer.expires_at.is_(None), ShopOffer.expires_at > now))
-        .order_by(ShopOffer.id)
-    )
-    offers_result = await session.execute(offers_stmt)
-    offers = offers_result.scalars().all()
-
-    owned_stmt = select(InventoryItem.catalog_item_id).where(InventoryItem.owner_id == player_id)
-    owned_result = await session.execute(owned_stmt)
-    owned_item_ids = {row[0] for row in owned_result.all()}
+    snapshot = await shop_offer_cache.get(session)
+
+    owned_item_ids: set[int] = set()
+    if snapshot.catalog_item_ids:
+        owned_stmt = (
+            select(InventoryItem.catalog_item_id)
+            .where(
+                InventoryItem.owner_id == player_id,
+                InventoryItem.catalog_item_id.in_(snapshot.catalog_item_ids),
+            )
+            .distinct()
+        )
+        owned_result = await session.execute(owned_stmt)
+        owned_item_ids = set(owned_result.scalars().all())
+
+    # live stock: purchases change it far more often than the cached shop window
+    stock: Dict[int, Optional[int]] = {}
+    if snapshot.stocked_offer_ids:
+        stock_result = await session.execute(
+            select(ShopOffer.id, ShopOffer.stock_remaining).where(ShopOffer.id.in_(snapshot.stocked_offer_ids))
+        )
+        stock = dict(stock_result.all())
 
     offers_public: List[Dict[str, object]] = []
-    for offer in offers:
-        catalog_item: InventoryItemCatalog = offer.catalog_item
+    for catalog_item_id, offer in snapshot.offers:
         offers_public.append(
-            {
-                "offer_id": offer.id,
-                "item_name": catalog_item.name if catalog_item else "Невідомий предмет",
-                "rarity": catalog_item.rarity if catalog_item else "common",
-                "price_gold": offer.price_gold,
-                "expires_at": offer.expires_at.isoformat() if offer.expires_at else None,
-                "owned": catalog_item.id in owned_item_ids if catalog_item else False,
-                "is_limited": offer.is_limited,
-                "slot": catalog_item.slot if catalog_item else "misc",
-                "cosmetic": catalog_item.cosmetic if catalog_item else False,
-                "description": catalog_item.description if catalog_item else None,
-                "icon": catalog_item.icon if catalog_item else None,
-            }
+            {**offer, "owned": catalog_item_id in owned_item_ids, "stock_remaining": stock.get(offer["offer_id"])}
         )
 
     return wallet, offers_public
@@ -83,27 +132,56 @@ async def buy_offer(session: AsyncSession, player_id: int, offer_id: int) -> Tup
     if wallet.gold < offer.price_gold:
         raise InsufficientFunds(available=wallet.gold, required=offer.price_gold)
 
-    owned_stmt = select(InventoryItem).where(
-        InventoryItem.owner_id == player_id,
-        InventoryItem.catalog_item_id == offer.catalog_item_id,
+    owned_stmt = (
+        select(InventoryItem.id)
+        .where(
+            InventoryItem.owner_id == player_id,
+            InventoryItem.catalog_item_id == offer.catalog_item_id,
+        )
+        .limit(1)
     )
     owned_result = await session.execute(owned_stmt)
-    already_owned = owned_result.scalars().first()
+    already_owned = owned_result.scalar() is not None
     if offer.is_limited and already_owned:
         raise ShopOfferUnavailable("Offer already purchased")
 
+    if offer.stock_remaining is not None:
+        # the WHERE clause makes the decrement and the stock check one atomic step
+        stock_result = await session.execute(
+            update(ShopOffer)
+            .where(ShopOffer.id == offer.id, ShopOffer.stock_remaining > 0)
+            .values(stock_remaining=ShopOffer.stock_remaining - 1)
+            .returning(ShopOffer.stock_remaining)
+            .execution_options(synchronize_session=False)
+        )
+        if stock_result.scalar() is None:
+            raise ShopOfferSoldOut("Offer is sold out")
+
     wallet.gold -= offer.price_gold
     player.gold = wallet.gold
 
-    new_item = InventoryItem(owner_id=player.id, catalog_item_id=offer.catalog_item_id, is_equipped=False)
-    session.add(new_item)
-    await session.flush()
-    await session.refresh(new_item)
+    if offer.catalog_item is not None and is_stackable(offer.catalog_item):
+        stack_result = await session.execute(
+            build_stack_upsert_statement(session.get_bind().dialect.name, player.id, offer.catalog_item)
+        )
+        inventory_item_id, quantity = stack_result.one()
+    else:
+        new_item = InventoryItem(
+            owner_id=player.id,
+            catalog_item_id=offer.catalog_item_id,
+            slot=offer.catalog_item.slot if offer.catalog_item else "misc",
+            is_equipped=False,
+            quantity=1,
+        )
+        session.add(new_item)
+        await session.flush()
+        inventory_item_id, quantity = new_item.id, new_item.quantity
 
     await session.flush()
 
     granted = {
-        "inventory_item_id": new_item.id if new_item else already_owned.id,
+        "inventory_item_id": inventory_item_id,
         "catalog_item_id": offer.catalog_item_id,
+        "quantity": quantity,
     }
     return wallet, granted
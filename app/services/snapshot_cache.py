@@ -0,0 +1,76 @@
+"""Process-wide snapshots of rarely changing tables.
+
+A ``SnapshotCache`` keeps one immutable snapshot together with the monotonic time it was loaded.
+The snapshot is dropped when a session that flushed one of the cache's ``models`` commits, and it
+expires after ``max_age_seconds`` regardless, as a safety net for writes made outside this process.
+Every invalidation bumps a generation counter, so a load that raced with one is served once but
+never kept.
+"""
+
+from __future__ import annotations
+
+import time
+import weakref
+from typing import Any, Callable, Generic, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.utils.metrics import CACHE_LOOKUPS
+
+SnapshotT = TypeVar("SnapshotT")
+
+_CACHES: "weakref.WeakSet[SnapshotCache[Any]]" = weakref.WeakSet()
+_CHANGED_CACHES = "snapshot_caches_changed"
+
+
+class SnapshotCache(Generic[SnapshotT]):
+    """Holds the current snapshot; subclasses load it and decide when it is worth keeping."""
+
+    def __init__(self, name: str, models: Tuple[type, ...], max_age_seconds: float) -> None:
+        self.name = name
+        self.models = models
+        self.max_age_seconds = max_age_seconds
+        self._entry: Optional[Tuple[SnapshotT, float]] = None
+        self._generation = 0
+        _CACHES.add(self)
+
+    @property
+    def snapshot(self) -> Optional[SnapshotT]:
+        entry = self._entry
+        return entry[0] if entry is not None else None
+
+    def invalidate(self) -> None:
+        self._entry = None
+        self._generation += 1
+
+    def lookup(self, is_current: Optional[Callable[[SnapshotT], bool]] = None) -> Tuple[Optional[SnapshotT], int]:
+        """Return the fresh snapshot, or ``None`` and the generation a new load must be stored under."""
+        entry = self._entry
+        if entry is not None and time.monotonic() - entry[1] < self.max_age_seconds:
+            if is_current is None or is_current(entry[0]):
+                CACHE_LOOKUPS.inc(self.name, "hit")
+                return entry[0], self._generation
+        CACHE_LOOKUPS.inc(self.name, "miss")
+        return None, self._generation
+
+    def store(self, generation: int, snapshot: SnapshotT) -> None:
+        if generation == self._generation:
+            self._entry = (snapshot, time.monotonic())
+
+
+@event.listens_for(Session, "after_flush")
+def _track_snapshot_changes(session: Session, _flush_context: Any) -> None:
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if not changed:
+        return
+    staged: Set[SnapshotCache[Any]] = session.info.setdefault(_CHANGED_CACHES, set())
+    for cache in list(_CACHES):
+        if cache not in staged and any(isinstance(instance, cache.models) for instance in changed):
+            staged.add(cache)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for cache in session.info.pop(_CHANGED_CACHES, ()):
+        cache.invalidate()
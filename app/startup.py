@@ -0,0 +1,182 @@
+"""Boot-time schema verification and warm-up.
+
+``DB_SCHEMA_MODE`` picks what happens to the schema at startup:
+
+* ``check`` (default for Postgres) — compare the database's Alembic revision with the migration head
+  and refuse to start on a mismatch. One cheap query, no catalog introspection, no locks.
+* ``create`` (default for SQLite) — ``Base.metadata.create_all``. The Alembic chain cannot run on
+  SQLite (the baseline migration alters constraints), so dev databases are built from the models;
+  ``scripts/migrate.py`` does the same and stamps the head so ``check`` passes on the result (it
+  runs ``alembic upgrade head`` instead on an existing non-SQLite database).
+* ``off`` — do nothing (tests, or when another process owns the schema).
+
+``APP_WARMUP=1`` additionally opens the pool connections and primes the process caches before the
+worker accepts traffic, so the first requests after a deploy run at steady-state speed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base, SessionLocal, engine
+from app.db.session import ASYNC_ENGINE, AsyncSessionLocal
+from app.services.leaderboard_service import leaderboards
+from app.services.plant_catalog_cache import plant_catalog_cache
+from app.services.quest_content_service import QuestContentService
+from app.services.shop_offer_cache import shop_offer_cache
+
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DB_SCHEMA_MODES = ("check", "create", "off")
+# imported lazily by request handlers; loading them here keeps that cost off the first request
+WARMUP_MODULES = (
+    "sqlalchemy.dialects.postgresql",
+    "sqlalchemy.dialects.sqlite",
+    "app.content.fallen_crown",
+    "app.services.admin_service",
+)
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def schema_mode(bind: Engine = engine) -> str:
+    default = "create" if bind.dialect.name == "sqlite" else "check"
+    mode = os.getenv("DB_SCHEMA_MODE", default).strip().lower()
+    if mode not in DB_SCHEMA_MODES:
+        raise ValueError(f"DB_SCHEMA_MODE must be one of {', '.join(DB_SCHEMA_MODES)}, got {mode!r}")
+    return mode
+
+
+def alembic_config():
+    # alembic costs ~200 ms to import; only the schema check and scripts/migrate.py need it
+    from alembic.config import Config
+
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "migrations"))
+    return config
+
+
+@lru_cache(maxsize=1)
+def alembic_script():
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(alembic_config())
+
+
+def alembic_heads() -> Tuple[str, ...]:
+    return tuple(sorted(alembic_script().get_heads()))
+
+
+def database_revisions(bind: Engine) -> Tuple[str, ...]:
+    from alembic.runtime.migration import MigrationContext
+
+    with bind.connect() as connection:
+        return tuple(sorted(MigrationContext.configure(connection).get_current_heads()))
+
+
+def ensure_schema(bind: Engine = engine, mode: Optional[str] = None) -> None:
+    mode = mode or schema_mode(bind)
+    if mode == "off":
+        return
+    if mode == "create":
+        Base.metadata.create_all(bind=bind)
+        return
+
+    expected = alembic_heads()
+    current = database_revisions(bind)
+    if current != expected:
+        raise SchemaOutOfDate(
+            f"Database schema is at {', '.join(current) or 'no revision'}, "
+            f"the code expects {', '.join(expected)}. Run `make migrate` "
+            "(`python -m scripts.migrate` on SQLite)."
+        )
+
+
+def _import_modules() -> None:
+    for name in WARMUP_MODULES:
+        importlib.import_module(name)
+
+
+def _pool_size(bind: Union[Engine, AsyncEngine]) -> int:
+    size = getattr(bind.pool, "size", None)
+    return size() if callable(size) else 1
+
+
+def _prime_pool(bind: Engine) -> None:
+    connections = [bind.connect() for _ in range(_pool_size(bind))]
+    try:
+        for connection in connections:
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+async def _prime_async_pool(bind: AsyncEngine) -> None:
+    connections = [await bind.connect() for _ in range(_pool_size(bind))]
+    try:
+        for connection in connections:
+            await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+def _prime_sync_caches(session_factory: sessionmaker[Session]) -> None:
+    with session_factory() as session:
+        plant_catalog_cache.rows(session)
+        QuestContentService(session).ensure_fallen_crown_saga()
+        session.commit()
+
+
+def _build_leaderboards(session_factory: sessionmaker[Session]) -> None:
+    with session_factory() as session:
+        leaderboards.rebuild(session)
+
+
+async def _prime_shop_cache(async_session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async with async_session_factory() as session:
+        await shop_offer_cache.get(session)
+
+
+async def warm_up(
+    *,
+    sync_engine: Engine = engine,
+    async_engine: AsyncEngine = ASYNC_ENGINE,
+    session_factory: sessionmaker[Session] = SessionLocal,
+    async_session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+) -> Dict[str, float]:
+    """Run every warm-up step; returns seconds per step. A failing step is logged and skipped."""
+    steps: Tuple[Tuple[str, Callable[[], Awaitable[None]]], ...] = (
+        ("modules", lambda: asyncio.to_thread(_import_modules)),
+        ("sync_pool", lambda: asyncio.to_thread(_prime_pool, sync_engine)),
+        ("async_pool", lambda: _prime_async_pool(async_engine)),
+        ("plant_and_quest_caches", lambda: asyncio.to_thread(_prime_sync_caches, session_factory)),
+        ("shop_cache", lambda: _prime_shop_cache(async_session_factory)),
+        ("leaderboards", lambda: asyncio.to_thread(_build_leaderboards, session_factory)),
+    )
+    timings: Dict[str, float] = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            await step()
+        except Exception:  # noqa: BLE001 - a cold cache is slower, not broken; keep booting
+            logger.exception("Warm-up step %s failed", name)
+        timings[name] = time.perf_counter() - started
+    logger.info("Warm-up finished: %s", ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in timings.items()))
+    return timings
@@ -30,6 +30,10 @@ class ShopOfferUnavailable(GameLogicError):
     """Raised when a shop offer cannot be purchased (expired or already owned)."""
 
 
+class ShopOfferSoldOut(ShopOfferUnavailable):
+    """Raised when a stock-limited shop offer has no units left."""
+
+
 class InsufficientFunds(GameLogicError):
     """Raised when a wallet balance is not enough for the requested purchase."""
 
@@ -61,3 +65,15 @@ class NotEnoughFarmEnergy(GameLogicError):
 
 class FarmingToolUpgradeUnavailable(GameLogicError):
     """Raised when the farming tool cannot be upgraded further."""
+
+
+class IdempotencyConflict(GameLogicError):
+    """Raised when an Idempotency-Key cannot be replayed for the current request."""
+
+
+class IdempotencyKeyReused(IdempotencyConflict):
+    """Raised when an Idempotency-Key is sent again with a different request payload."""
+
+
+class IdempotencyRequestInProgress(IdempotencyConflict):
+    """Raised when the original request for an Idempotency-Key has not finished yet."""
@@ -0,0 +1,288 @@
+"""Prometheus text-format metrics without a client library.
+
+Writes never take a lock: every thread increments its own shard (a plain dict reached through
+``threading.local``), and a scrape sums the shards. The event loop is one thread, so async routes
+share a shard; sync routes write to their threadpool thread's shard. When a thread exits (AnyIO
+prunes idle threadpool workers) its shard is folded into a retired aggregate, so counters never go
+backwards and the number of live shards stays bounded by the number of live threads.
+
+Values are per worker process. Scrape each worker (or run one worker per container) — there is
+no cross-process aggregation.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Shard:
+    __slots__ = ("values", "histograms")
+
+    def __init__(self) -> None:
+        self.values: Dict[Tuple[str, LabelValues], float] = {}
+        # key -> [bucket counts..., +Inf count, sum]
+        self.histograms: Dict[Tuple[str, LabelValues], List[float]] = {}
+
+
+class _ShardOwner:
+    """Lives in the thread-local next to the shard; it is dropped when the thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        # totals of shards whose threads have exited
+        self._retired = _Shard()
+        # re-entrant: a finalizer may retire a shard on whichever thread drops its owner
+        self._shards_lock = threading.RLock()
+        self._metrics: List["_Metric"] = []
+        self._collectors: List[Tuple[str, str, str, Callable[[], Iterable[Sample]]]] = []
+
+    def shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            owner = _ShardOwner()
+            self._local.shard, self._local.owner = shard, owner
+            # once per thread, never on the hot path
+            with self._shards_lock:
+                self._shards.append(shard)
+            weakref.finalize(owner, self._retire, shard)
+        return shard
+
+    def _retire(self, shard: _Shard) -> None:
+        # the owning thread has exited, so nothing writes to the shard any more
+        with self._shards_lock:
+            self._shards.remove(shard)
+            _add_into(self._retired.values, self._retired.histograms, shard.values, shard.histograms)
+
+    def register(self, metric: "_Metric") -> None:
+        self._metrics.append(metric)
+
+    def collector(self, name: str, kind: str, help_text: str, collect: Callable[[], Iterable[Sample]]) -> None:
+        """Register values read at scrape time (pool usage, cache ratios, ...)."""
+        self._collectors.append((name, kind, help_text, collect))
+
+    def reset(self) -> None:
+        with self._shards_lock:
+            for shard in (*self._shards, self._retired):
+                shard.values.clear()
+                shard.histograms.clear()
+
+    def _merged(self) -> Tuple[Dict[Tuple[str, LabelValues], float], Dict[Tuple[str, LabelValues], List[float]]]:
+        values: Dict[Tuple[str, LabelValues], float] = {}
+        histograms: Dict[Tuple[str, LabelValues], List[float]] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+            # copied with the list: a shard retired after this point is counted once, from the list
+            _add_into(values, histograms, self._retired.values, self._retired.histograms)
+        for shard in shards:
+            # copies taken under the GIL; a write racing the copy lands in the next scrape
+            _add_into(values, histograms, shard.values, shard.histograms)
+        return values, histograms
+
+    def value(self, name: str, *labels: str) -> float:
+        return self._merged()[0].get((name, labels), 0.0)
+
+    def render(self) -> str:
+        values, histograms = self._merged()
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                lines.extend(metric.render(histograms))
+            else:
+                for (name, labels), value in sorted(values.items()):
+                    if name == metric.name:
+                        lines.append(f"{name}{_labels(metric.labelnames, labels)} {_number(value)}")
+        for name, kind, help_text, collect in self._collectors:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in collect():
+                lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _add_into(
+    values: Dict[Tuple[str, LabelValues], float],
+    histograms: Dict[Tuple[str, LabelValues], List[float]],
+    shard_values: Dict[Tuple[str, LabelValues], float],
+    shard_histograms: Dict[Tuple[str, LabelValues], List[float]],
+) -> None:
+    for key, value in list(shard_values.items()):
+        values[key] = values.get(key, 0.0) + value
+    for key, buckets in list(shard_histograms.items()):
+        merged = histograms.setdefault(key, [0.0] * len(buckets))
+        for index, value in enumerate(list(buckets)):
+            merged[index] += value
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._registry = registry or REGISTRY
+        self._registry.register(self)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        values = self._registry.shard().values
+        key = (self.name, labels)
+        values[key] = values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """A gauge moved up and down by the code (in-flight work); shards sum to the current value."""
+
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        values = self._registry.shard().values
+        key = (self.name, labels)
+        values[key] = values.get(key, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        registry: Optional[MetricsRegistry] = None,
+    ) -> None:
+        super().__init__(name, help_text, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        histograms = self._registry.shard().histograms
+        key = (self.name, labels)
+        counts = histograms.get(key)
+        if counts is None:
+            counts = histograms[key] = [0.0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def render(self, histograms: Dict[Tuple[str, LabelValues], List[float]]) -> List[str]:
+        lines = []
+        for (name, labels), counts in sorted(histograms.items()):
+            if name != self.name:
+                continue
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"{name}_bucket{_labels((*self.labelnames, 'le'), (*labels, le))} {_number(cumulative)}"
+                )
+            lines.append(f"{name}_sum{_labels(self.labelnames, labels)} {_number(counts[-1])}")
+            lines.append(f"{name}_count{_labels(self.labelnames, labels)} {_number(cumulative)}")
+        return lines
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "app_http_request_duration_seconds", "Request latency by route template", ("method", "route")
+)
+HTTP_RESPONSES = Counter("app_http_responses_total", "Responses by route template and status", ("method", "route", "status"))
+HTTP_IN_FLIGHT = Gauge("app_http_requests_in_flight", "Requests being handled right now")
+CACHE_LOOKUPS = Counter("app_cache_lookups_total", "Process cache lookups", ("cache", "result"))
+CROPS_PLANTED = Counter("app_farm_crops_planted_total", "Crops planted")
+CROPS_HARVESTED = Counter("app_farm_crops_harvested_total", "Crops harvested")
+SHOP_PURCHASES = Counter("app_shop_purchases_total", "Completed shop purchases")
+QUEST_CHOICES = Counter("app_quest_choices_total", "Quest choices applied")
+DAILY_CLAIMS = Counter("app_daily_reward_claims_total", "Daily rewards claimed")
+PASSWORD_HASHES_IN_FLIGHT = Gauge(
+    "app_password_hashes_in_flight", "PBKDF2 hashes running or waiting for the GIL (each holds a threadpool slot)"
+)
+
+
+def _cache_hit_ratios() -> Iterable[Sample]:
+    values, _ = REGISTRY._merged()
+    lookups: Dict[str, Dict[str, float]] = {}
+    for (name, labels), value in values.items():
+        if name == CACHE_LOOKUPS.name:
+            cache, result = labels
+            lookups.setdefault(cache, {})[result] = value
+    for cache, results in sorted(lookups.items()):
+        total = sum(results.values())
+        yield {"cache": cache}, (results.get("hit", 0.0) / total) if total else 0.0
+
+
+REGISTRY.collector("app_cache_hit_ratio", "gauge", "Share of cache lookups served from memory", _cache_hit_ratios)
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and in-flight requests per route template."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = ["500"]
+
+        async def send_with_status(message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or "<unmatched>"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, scope["method"], template)
+            HTTP_RESPONSES.inc(scope["method"], template, status[0])
@@ -0,0 +1,185 @@
+"""On-demand sampling profiler for a running worker.
+
+A session runs a daemon thread that reads ``sys._current_frames()`` every few milliseconds and
+counts each stack in the collapsed format consumed by ``flamegraph.pl`` and speedscope
+(``frame;frame;frame count``). Nothing is hooked into the interpreter, so sampling costs roughly
+one stack walk per thread per interval, and only while a session is running.
+
+With a ``route`` filter the sampler only records while a matching request is in flight. Stacks
+cannot be tied to a request (sync routes run in the threadpool), so requests to other routes
+running at the same moment show up too. Idle threads (parked in ``threading``/``selectors``/
+``queue``) are skipped.
+
+``ProfilerMiddleware`` costs one attribute check per request when no session is running.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Pattern
+
+from app.constants.profiler import PROFILER_MAX_DISTINCT_STACKS
+
+_IDLE_FILES = ("threading.py", "selectors.py", "queue.py")
+_TEMPLATE_PARAM = re.compile(r"\\\{[^}]+\\\}")
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+def route_pattern(template: str) -> Pattern[str]:
+    """``/farm/{player_id}`` -> a regex matching concrete paths of that route."""
+    return re.compile("^" + _TEMPLATE_PARAM.sub("[^/]+", re.escape(template)) + "$")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    marker = filename.rfind("/app/")
+    if marker >= 0:
+        filename = filename[marker + 1 :]
+    else:
+        filename = filename.rsplit("/", 1)[-1]
+    return f"{filename}:{code.co_name}"
+
+
+@dataclass
+class ProfileSession:
+    interval: float
+    deadline: float
+    route: Optional[str] = None
+    max_requests: Optional[int] = None
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    samples: int = 0
+    dropped_samples: int = 0
+    requests_seen: int = 0
+    in_flight: int = 0
+    stacks: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._pattern = route_pattern(self.route) if self.route else None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self.finished_at is None
+
+    def matches(self, path: str) -> bool:
+        return self._pattern is None or self._pattern.match(path) is not None
+
+    def request_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.requests_seen += 1
+            if self.max_requests is not None and self.requests_seen >= self.max_requests:
+                self._stop.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]))
+
+    def _sample(self, own_thread: int) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                continue
+            labels: List[str] = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(thread_id, "thread"))
+            stack = ";".join(reversed(labels))
+            if stack in self.stacks:
+                self.stacks[stack] += 1
+            elif len(self.stacks) < PROFILER_MAX_DISTINCT_STACKS:
+                self.stacks[stack] = 1
+            else:
+                self.dropped_samples += 1
+                continue
+            self.samples += 1
+
+    def _run(self) -> None:
+        own_thread = threading.get_ident()
+        while not self._stop.wait(self.interval) and time.monotonic() < self.deadline:
+            if self._pattern is None or self.in_flight > 0:
+                self._sample(own_thread)
+        self.finished_at = datetime.now(timezone.utc)
+
+
+class SamplingProfiler:
+    """Holds at most one running session plus the last finished one."""
+
+    def __init__(self) -> None:
+        self.session: Optional[ProfileSession] = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> Optional[ProfileSession]:
+        session = self.session
+        return session if session is not None and session.running else None
+
+    def start(
+        self,
+        seconds: float,
+        interval: float,
+        route: Optional[str] = None,
+        max_requests: Optional[int] = None,
+    ) -> ProfileSession:
+        with self._lock:
+            if self.active is not None:
+                raise ProfilerBusy("A profiling session is already running")
+            session = ProfileSession(
+                interval=interval,
+                deadline=time.monotonic() + seconds,
+                route=route,
+                max_requests=max_requests,
+            )
+            self.session = session
+        threading.Thread(target=session._run, name="sampling-profiler", daemon=True).start()
+        return session
+
+    def stop(self) -> Optional[ProfileSession]:
+        session = self.session
+        if session is not None:
+            session.stop()
+        return session
+
+    def reset(self) -> None:
+        self.stop()
+        self.session = None
+
+
+sampling_profiler = SamplingProfiler()
+
+
+class ProfilerMiddleware:
+    """Counts matching requests in flight so a route-filtered session samples only while they run."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        session = sampling_profiler.active
+        if session is None or scope["type"] != "http" or not session.matches(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        session.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            session.request_finished()
@@ -0,0 +1,147 @@
+"""Order-statistics skip list: sorted keys with positional access.
+
+Besides the usual forward pointers every node stores, per level, how many level-0 steps its
+pointer skips. Summing those widths on the way down gives a key's position, and following them
+finds the key at a position, so ``add``, ``remove``, ``index`` and ``__getitem__`` are all
+O(log n) expected. Keys must be unique and mutually comparable.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Generic, Iterator, List, Optional, Tuple, TypeVar
+
+K = TypeVar("K")
+
+_MAX_LEVEL = 32
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, level: int) -> None:
+        self.key = key
+        self.next: List[Optional[_Node]] = [None] * level
+        # level-0 steps to ``next[level]``; to one past the last key when ``next`` is None
+        self.width: List[int] = [1] * level
+
+
+class RankedSet(Generic[K]):
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self._head = _Node(None, _MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: K) -> bool:
+        return self._find(key) is not None
+
+    def __iter__(self) -> Iterator[K]:
+        node = self._head.next[0]
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < _MAX_LEVEL and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def _predecessors(self, key: K) -> Tuple[List[_Node], List[int]]:
+        """Last node before ``key`` on every level, and each one's position (head is 0)."""
+        update: List[_Node] = [self._head] * _MAX_LEVEL
+        positions = [0] * _MAX_LEVEL
+        node, position = self._head, 0
+        for level in reversed(range(self._level)):
+            following = node.next[level]
+            while following is not None and following.key < key:
+                position += node.width[level]
+                node, following = following, following.next[level]
+            update[level], positions[level] = node, position
+        return update, positions
+
+    def _find(self, key: K) -> Optional[int]:
+        update, positions = self._predecessors(key)
+        candidate = update[0].next[0]
+        if candidate is None or candidate.key != key:
+            return None
+        return positions[0]
+
+    def add(self, key: K) -> None:
+        update, positions = self._predecessors(key)
+        following = update[0].next[0]
+        if following is not None and following.key == key:
+            raise KeyError(key)
+
+        level = self._random_level()
+        if level > self._level:
+            for unused in range(self._level, level):
+                self._head.width[unused] = self._size + 1
+            self._level = level
+
+        node = _Node(key, level)
+        position = positions[0] + 1
+        for current in range(level):
+            before = update[current]
+            node.next[current] = before.next[current]
+            before.next[current] = node
+            node.width[current] = positions[current] + before.width[current] + 1 - position
+            before.width[current] = position - positions[current]
+        for current in range(level, self._level):
+            update[current].width[current] += 1
+        self._size += 1
+
+    def remove(self, key: K) -> None:
+        update, _ = self._predecessors(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+
+        for current in range(self._level):
+            before = update[current]
+            if before.next[current] is node:
+                before.width[current] += node.width[current] - 1
+                before.next[current] = node.next[current]
+            else:
+                before.width[current] -= 1
+        self._size -= 1
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+
+    def index(self, key: K) -> int:
+        """Zero-based position of ``key``; ``KeyError`` when it is missing."""
+        position = self._find(key)
+        if position is None:
+            raise KeyError(key)
+        return position
+
+    def __getitem__(self, index: int) -> K:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return self._node_at(index).key
+
+    def _node_at(self, index: int) -> _Node:
+        node, position, target = self._head, 0, index + 1
+        for level in reversed(range(self._level)):
+            while node.next[level] is not None and position + node.width[level] <= target:
+                position += node.width[level]
+                node = node.next[level]
+        return node
+
+    def slice(self, start: int, stop: int) -> List[K]:
+        """Keys at positions ``start`` to ``stop - 1``: one O(log n) seek, then a linear walk."""
+        start, stop = max(0, start), min(self._size, stop)
+        if start >= stop:
+            return []
+        node: Optional[_Node] = self._node_at(start)
+        keys: List[K] = []
+        while node is not None and len(keys) < stop - start:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
@@ -7,6 +7,8 @@ import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Tuple
 
+from app.utils.metrics import PASSWORD_HASHES_IN_FLIGHT
+
 PBKDF2_ITERATIONS = 390000
 TOKEN_BYTES = 32
 
@@ -20,7 +22,11 @@ def hash_password(password: str, salt: bytes) -> bytes:
         raise TypeError("password must be a string")
     if not isinstance(salt, (bytes, bytearray)):
         raise TypeError("salt must be bytes")
-    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PBKDF2_ITERATIONS)
+    PASSWORD_HASHES_IN_FLIGHT.inc()
+    try:
+        return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PBKDF2_ITERATIONS)
+    finally:
+        PASSWORD_HASHES_IN_FLIGHT.dec()
 
 
 def create_password_digest(password: str) -> Tuple[bytes, bytes]:
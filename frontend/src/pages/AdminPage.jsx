@@ -43,6 +43,18 @@ const createEmptyNode = ({ isStart = false, isFinal = false } = {}) => ({
   choices: [],
 });
 
+const summarizeQuest = (quest) => {
+  const nodes = quest?.nodes ?? [];
+  return {
+    id: quest.id,
+    title: quest.title,
+    is_repeatable: quest.is_repeatable,
+    start_node_id: nodes.find((node) => node.is_start)?.id ?? null,
+    node_count: nodes.length,
+    choice_count: nodes.reduce((total, node) => total + (node.choices?.length ?? 0), 0),
+  };
+};
+
 const createQuestForm = () => ({
   title: '',
   description: '',
@@ -61,6 +73,8 @@ function AdminPage() {
   const [equipmentItems, setEquipmentItems] = useState([]);
   const [plants, setPlants] = useState([]);
   const [quests, setQuests] = useState([]);
+  const [questsNextAfter, setQuestsNextAfter] = useState(null);
+  const [questDetails, setQuestDetails] = useState({});
   const [editingEquipmentId, setEditingEquipmentId] = useState(null);
   const [editingPlantId, setEditingPlantId] = useState(null);
   const [editingQuestId, setEditingQuestId] = useState(null);
@@ -71,15 +85,16 @@ function AdminPage() {
     let cancelled = false;
     async function loadAdminData() {
       try {
-        const [equipment, plantCatalog, questList] = await Promise.all([
+        const [equipment, plantCatalog, questPage] = await Promise.all([
           apiGet('/admin/equipment'),
           apiGet('/admin/plants'),
-          apiGet('/admin/quests'),
+          apiGet('/admin/quests/page'),
         ]);
         if (!cancelled) {
           setEquipmentItems(equipment);
           setPlants(plantCatalog);
-          setQuests(questList);
+          setQuests(questPage.items);
+          setQuestsNextAfter(questPage.next_after);
           setLoadError(null);
         }
       } catch (error) {
@@ -252,7 +267,36 @@ function AdminPage() {
     setQuestForm((prev) => ({ ...prev, [field]: value }));
   };
 
-  const startQuestEdit = (quest) => {
+  const loadMoreQuests = async () => {
+    try {
+      const page = await apiGet(`/admin/quests/page?after=${questsNextAfter}`);
+      setQuests((prev) => [...prev, ...page.items]);
+      setQuestsNextAfter(page.next_after);
+    } catch (error) {
+      toast.error(error?.details || 'Не вдалося завантажити квести.');
+    }
+  };
+
+  // вузли з текстами тягнемо лише для квестів, які відкрили або редагують
+  const loadQuestDetails = async (questId) => {
+    if (questDetails[questId]) {
+      return questDetails[questId];
+    }
+    try {
+      const quest = await apiGet(`/admin/quests/${questId}`);
+      setQuestDetails((prev) => ({ ...prev, [questId]: quest }));
+      return quest;
+    } catch (error) {
+      toast.error(error?.details || 'Не вдалося завантажити квест.');
+      return null;
+    }
+  };
+
+  const startQuestEdit = async (summary) => {
+    const quest = await loadQuestDetails(summary.id);
+    if (!quest) {
+      return;
+    }
     const nodes = (quest?.nodes ?? []).map((node) => ({
       id: node?.id ?? '',
       title: node?.title ?? '',
@@ -444,13 +488,15 @@ function AdminPage() {
     try {
       if (editingQuestId != null) {
         const updated = await apiPut(`/admin/quests/${editingQuestId}`, payload);
-        setQuests((prev) => prev.map((quest) => (quest.id === updated.id ? updated : quest)));
+        setQuests((prev) => prev.map((quest) => (quest.id === updated.id ? summarizeQuest(updated) : quest)));
+        setQuestDetails((prev) => ({ ...prev, [updated.id]: updated }));
         setQuestForm(createQuestForm());
         setEditingQuestId(null);
         toast.success(`Оновлено квест: ${updated.title}`);
       } else {
         const created = await apiPost('/admin/quests', payload);
-        setQuests((prev) => [...prev, created]);
+        setQuests((prev) => [...prev, summarizeQuest(created)]);
+        setQuestDetails((prev) => ({ ...prev, [created.id]: created }));
         setQuestForm(createQuestForm());
         toast.success(`Додано новий квест: ${created.title}`);
       }
@@ -776,7 +822,10 @@ function AdminPage() {
       <section className="card admin-section">
         <div className="card__header">
           <h2>Квести</h2>
-          <span className="card__meta">Усього: {quests.length}</span>
+          <span className="card__meta">
+            Завантажено: {quests.length}
+            {questsNextAfter != null ? '+' : ''}
+          </span>
         </div>
         <form className="admin-form" onSubmit={handleQuestSubmit}>
           <div className="admin-form__grid">
@@ -995,11 +1044,22 @@ function AdminPage() {
             <div className="admin-table__empty">Ще немає квестів.</div>
           ) : (
             quests.map((quest) => (
-              <details key={quest.id} className="admin-quest">
+              <details
+                key={quest.id}
+                className="admin-quest"
+                onToggle={(event) => {
+                  if (event.currentTarget.open) {
+                    loadQuestDetails(quest.id);
+                  }
+                }}
+              >
                 <summary>
                   <div className="admin-quest__summary">
                     <div className="admin-quest__summary-info">
                       <strong>{quest.title}</strong>
+                      <span className="card__meta">
+                        вузлів: {quest.node_count}, переходів: {quest.choice_count}
+                      </span>
                       {quest.is_repeatable ? <span className="admin-badge">repeatable</span> : null}
                       {editingQuestId === quest.id ? (
                         <span className="admin-badge admin-badge--highlight">редагується</span>
@@ -1018,48 +1078,59 @@ function AdminPage() {
                     </button>
                   </div>
                 </summary>
-                <p>{quest.description || '—'}</p>
-                <ul>
-                  {quest.nodes.map((node) => (
-                    <li key={node.id} className="admin-quest__node">
-                      <div className="admin-quest__node-title">
-                        <strong>{node.id}</strong> — {node.title}{' '}
-                        {node.is_start ? <span className="admin-badge admin-badge--highlight">start</span> : null}
-                        {node.is_final ? <span className="admin-badge">final</span> : null}
-                      </div>
-                      <p>{node.body}</p>
-                      {node.choices.length > 0 ? (
-                        <table className="admin-table admin-table--dense">
-                          <thead>
-                            <tr>
-                              <th>ID</th>
-                              <th>Текст</th>
-                              <th>Next</th>
-                              <th>XP</th>
-                              <th>Item</th>
-                            </tr>
-                          </thead>
-                          <tbody>
-                            {node.choices.map((choice) => (
-                              <tr key={choice.id}>
-                                <td>{choice.id}</td>
-                                <td>{choice.label}</td>
-                                <td>{choice.next_node_id || '—'}</td>
-                                <td>{choice.reward_xp}</td>
-                                <td>{choice.reward_item_id || '—'}</td>
-                              </tr>
-                            ))}
-                          </tbody>
-                        </table>
-                      ) : (
-                        <div className="admin-table__empty">Немає варіантів переходу.</div>
-                      )}
-                    </li>
-                  ))}
-                </ul>
+                {questDetails[quest.id] ? (
+                  <>
+                    <p>{questDetails[quest.id].description || '—'}</p>
+                    <ul>
+                      {questDetails[quest.id].nodes.map((node) => (
+                        <li key={node.id} className="admin-quest__node">
+                          <div className="admin-quest__node-title">
+                            <strong>{node.id}</strong> — {node.title}{' '}
+                            {node.is_start ? <span className="admin-badge admin-badge--highlight">start</span> : null}
+                            {node.is_final ? <span className="admin-badge">final</span> : null}
+                          </div>
+                          <p>{node.body}</p>
+                          {node.choices.length > 0 ? (
+                            <table className="admin-table admin-table--dense">
+                              <thead>
+                                <tr>
+                                  <th>ID</th>
+                                  <th>Текст</th>
+                                  <th>Next</th>
+                                  <th>XP</th>
+                                  <th>Item</th>
+                                </tr>
+                              </thead>
+                              <tbody>
+                                {node.choices.map((choice) => (
+                                  <tr key={choice.id}>
+                                    <td>{choice.id}</td>
+                                    <td>{choice.label}</td>
+                                    <td>{choice.next_node_id || '—'}</td>
+                                    <td>{choice.reward_xp}</td>
+                                    <td>{choice.reward_item_id || '—'}</td>
+                                  </tr>
+                                ))}
+                              </tbody>
+                            </table>
+                          ) : (
+                            <div className="admin-table__empty">Немає варіантів переходу.</div>
+                          )}
+                        </li>
+                      ))}
+                    </ul>
+                  </>
+                ) : (
+                  <div className="admin-table__empty">Завантаження вузлів…</div>
+                )}
               </details>
             ))
           )}
+          {questsNextAfter != null ? (
+            <button type="button" className="btn btn--secondary" onClick={loadMoreQuests}>
+              Завантажити ще
+            </button>
+          ) : null}
         </div>
       </section>
     </div>
@@ -426,8 +426,16 @@ function InventoryPage() {
     setLoading(true);
     setError(null);
     try {
-      const data = await apiGet(`/player/${playerId}/inventory`);
-      setItems(data?.items ?? []);
+      const collected = [];
+      let cursor = null;
+      let data = null;
+      do {
+        const query = cursor === null ? '' : `?cursor=${cursor}`;
+        data = await apiGet(`/player/${playerId}/inventory${query}`);
+        collected.push(...(data?.items ?? []));
+        cursor = data?.next_cursor ?? null;
+      } while (cursor !== null);
+      setItems(collected);
       setBaseStats({ ...DEFAULT_BASE_STATS, ...(data?.base_stats ?? {}) });
     } catch (err) {
       const message = err?.message ?? 'Failed to load inventory';
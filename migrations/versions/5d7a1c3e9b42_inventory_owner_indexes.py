@@ -0,0 +1,60 @@
+"""inventory owner indexes and denormalised slot
+
+Revision ID: 5d7a1c3e9b42
+Revises: c0d1c389a1d5
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "5d7a1c3e9b42"
+down_revision = "c0d1c389a1d5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("inventory_items", sa.Column("slot", sa.String(), nullable=True))
+    op.execute(
+        """
+        UPDATE inventory_items
+        SET slot = (
+            SELECT inventory_items_catalog.slot
+            FROM inventory_items_catalog
+            WHERE inventory_items_catalog.id = inventory_items.catalog_item_id
+        )
+        """
+    )
+    op.execute("UPDATE inventory_items SET slot = 'misc' WHERE slot IS NULL")
+    with op.batch_alter_table("inventory_items") as batch_op:
+        batch_op.alter_column("slot", existing_type=sa.String(), nullable=False)
+
+    op.create_index(
+        "ix_inventory_items_owner_id_catalog_item_id",
+        "inventory_items",
+        ["owner_id", "catalog_item_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_inventory_items_owner_id_is_equipped",
+        "inventory_items",
+        ["owner_id", "is_equipped"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_inventory_items_owner_id_slot",
+        "inventory_items",
+        ["owner_id", "slot"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventory_items_owner_id_slot", table_name="inventory_items")
+    op.drop_index("ix_inventory_items_owner_id_is_equipped", table_name="inventory_items")
+    op.drop_index("ix_inventory_items_owner_id_catalog_item_id", table_name="inventory_items")
+    with op.batch_alter_table("inventory_items") as batch_op:
+        batch_op.drop_column("slot")
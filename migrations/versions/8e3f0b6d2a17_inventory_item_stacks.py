@@ -0,0 +1,150 @@
+"""inventory item stacks
+
+Revision ID: 8e3f0b6d2a17
+Revises: 5d7a1c3e9b42
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "8e3f0b6d2a17"
+down_revision = "5d7a1c3e9b42"
+branch_labels = None
+depends_on = None
+
+
+# frozen copy of app.constants.inventory.STACKABLE_SLOTS at the time of this revision
+STACKABLE_SLOTS = ("consumable", "material", "resource")
+OWNER_BATCH_SIZE = 500
+
+inventory_items = sa.table(
+    "inventory_items",
+    sa.column("id", sa.Integer()),
+    sa.column("owner_id", sa.Integer()),
+    sa.column("catalog_item_id", sa.Integer()),
+    sa.column("slot", sa.String()),
+    sa.column("is_equipped", sa.Boolean()),
+    sa.column("quantity", sa.Integer()),
+)
+catalog = sa.table(
+    "inventory_items_catalog",
+    sa.column("id", sa.Integer()),
+    sa.column("slot", sa.String()),
+    sa.column("cosmetic", sa.Boolean()),
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "inventory_items",
+        sa.Column("quantity", sa.Integer(), nullable=False, server_default="1"),
+    )
+    _compact_duplicates()
+
+
+def downgrade() -> None:
+    _expand_stacks()
+    with op.batch_alter_table("inventory_items") as batch_op:
+        batch_op.drop_column("quantity")
+
+
+def _owner_batches():
+    bind = op.get_bind()
+    last_owner_id = None
+    while True:
+        stmt = sa.select(inventory_items.c.owner_id).distinct().order_by(inventory_items.c.owner_id)
+        if last_owner_id is not None:
+            stmt = stmt.where(inventory_items.c.owner_id > last_owner_id)
+        owner_ids = bind.execute(stmt.limit(OWNER_BATCH_SIZE)).scalars().all()
+        if not owner_ids:
+            return
+        yield owner_ids[0], owner_ids[-1]
+        last_owner_id = owner_ids[-1]
+
+
+def _compact_duplicates() -> None:
+    """Fold duplicate stackable rows into the lowest id, one batch of owners at a time."""
+    bind = op.get_bind()
+    equipped_flag = sa.func.max(sa.case((inventory_items.c.is_equipped.is_(True), 1), else_=0))
+
+    for first_owner_id, last_owner_id in _owner_batches():
+        groups_stmt = (
+            sa.select(
+                inventory_items.c.owner_id,
+                inventory_items.c.catalog_item_id,
+                sa.func.min(inventory_items.c.id).label("keep_id"),
+                sa.func.sum(inventory_items.c.quantity).label("total"),
+                equipped_flag.label("equipped"),
+            )
+            .join(catalog, catalog.c.id == inventory_items.c.catalog_item_id)
+            .where(
+                inventory_items.c.owner_id.between(first_owner_id, last_owner_id),
+                sa.or_(catalog.c.cosmetic.is_(True), catalog.c.slot.in_(STACKABLE_SLOTS)),
+            )
+            .group_by(inventory_items.c.owner_id, inventory_items.c.catalog_item_id)
+            .having(sa.func.count() > 1)
+        )
+        groups = bind.execute(groups_stmt).all()
+        if not groups:
+            continue
+
+        bind.execute(
+            inventory_items.update()
+            .where(inventory_items.c.id == sa.bindparam("b_keep_id"))
+            .values(quantity=sa.bindparam("b_total"), is_equipped=sa.bindparam("b_equipped")),
+            [
+                {"b_keep_id": row.keep_id, "b_total": row.total, "b_equipped": bool(row.equipped)}
+                for row in groups
+            ],
+        )
+        bind.execute(
+            inventory_items.delete().where(
+                inventory_items.c.owner_id == sa.bindparam("b_owner_id"),
+                inventory_items.c.catalog_item_id == sa.bindparam("b_catalog_item_id"),
+                inventory_items.c.id != sa.bindparam("b_keep_id"),
+            ),
+            [
+                {"b_owner_id": row.owner_id, "b_catalog_item_id": row.catalog_item_id, "b_keep_id": row.keep_id}
+                for row in groups
+            ],
+        )
+
+
+def _expand_stacks() -> None:
+    """Recreate one row per unit so the pre-stacking schema keeps the same item counts."""
+    bind = op.get_bind()
+    for first_owner_id, last_owner_id in _owner_batches():
+        stacks = bind.execute(
+            sa.select(
+                inventory_items.c.id,
+                inventory_items.c.owner_id,
+                inventory_items.c.catalog_item_id,
+                inventory_items.c.slot,
+                inventory_items.c.quantity,
+            ).where(
+                inventory_items.c.owner_id.between(first_owner_id, last_owner_id),
+                inventory_items.c.quantity > 1,
+            )
+        ).all()
+        copies = [
+            {
+                "owner_id": row.owner_id,
+                "catalog_item_id": row.catalog_item_id,
+                "slot": row.slot,
+                "is_equipped": False,
+                "quantity": 1,
+            }
+            for row in stacks
+            for _ in range(row.quantity - 1)
+        ]
+        if copies:
+            bind.execute(inventory_items.insert(), copies)
+        if stacks:
+            bind.execute(
+                inventory_items.update()
+                .where(inventory_items.c.id.in_([row.id for row in stacks]))
+                .values(quantity=1)
+            )
@@ -0,0 +1,98 @@
+"""virtual locked plots
+
+Revision ID: a6c2e19d4f83
+Revises: f19b6d3a7c52
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a6c2e19d4f83"
+down_revision = "f19b6d3a7c52"
+branch_labels = None
+depends_on = None
+
+
+# frozen copy of app.services.farm_rules plot terms at the time of this revision
+BASE_PLOTS = 3
+TOTAL_PLOTS = 8
+BASE_PLOT_UNLOCK_COST = 400
+PLOT_UNLOCK_COST_STEP = 250
+BATCH_SIZE = 1000
+
+farm_plots = sa.table(
+    "farm_plots",
+    sa.column("id", sa.Integer()),
+    sa.column("player_id", sa.BigInteger()),
+    sa.column("slot_index", sa.Integer()),
+    sa.column("unlocked", sa.Boolean()),
+    sa.column("unlock_cost", sa.Integer()),
+    sa.column("unlock_level_requirement", sa.Integer()),
+    sa.column("unlock_farming_level_requirement", sa.Integer()),
+)
+planted_crops = sa.table("farm_planted_crops", sa.column("plot_id", sa.Integer()))
+
+
+def upgrade() -> None:
+    """Locked plots are now computed from the slot rules; drop the rows nobody has touched."""
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        plot_ids = bind.execute(
+            sa.select(farm_plots.c.id)
+            .where(
+                farm_plots.c.id > last_id,
+                farm_plots.c.unlocked.is_(False),
+                ~sa.exists().where(planted_crops.c.plot_id == farm_plots.c.id),
+            )
+            .order_by(farm_plots.c.id)
+            .limit(BATCH_SIZE)
+        ).scalars().all()
+        if not plot_ids:
+            return
+        bind.execute(farm_plots.delete().where(farm_plots.c.id.in_(plot_ids)))
+        last_id = plot_ids[-1]
+
+
+def downgrade() -> None:
+    """Give every player who has a farm a row for each slot again, as the old code expects."""
+    bind = op.get_bind()
+    last_player_id = None
+    while True:
+        stmt = sa.select(farm_plots.c.player_id).distinct().order_by(farm_plots.c.player_id)
+        if last_player_id is not None:
+            stmt = stmt.where(farm_plots.c.player_id > last_player_id)
+        player_ids = bind.execute(stmt.limit(BATCH_SIZE)).scalars().all()
+        if not player_ids:
+            return
+
+        existing = set(
+            bind.execute(
+                sa.select(farm_plots.c.player_id, farm_plots.c.slot_index).where(
+                    farm_plots.c.player_id.between(player_ids[0], player_ids[-1])
+                )
+            ).all()
+        )
+        rows = [
+            _locked_row(player_id, slot)
+            for player_id in player_ids
+            for slot in range(BASE_PLOTS + 1, TOTAL_PLOTS + 1)
+            if (player_id, slot) not in existing
+        ]
+        if rows:
+            bind.execute(farm_plots.insert(), rows)
+        last_player_id = player_ids[-1]
+
+
+def _locked_row(player_id: int, slot: int) -> dict:
+    return {
+        "player_id": player_id,
+        "slot_index": slot,
+        "unlocked": False,
+        "unlock_cost": BASE_PLOT_UNLOCK_COST + (slot - BASE_PLOTS) * PLOT_UNLOCK_COST_STEP,
+        "unlock_level_requirement": slot,
+        "unlock_farming_level_requirement": slot // 2 + 1,
+    }
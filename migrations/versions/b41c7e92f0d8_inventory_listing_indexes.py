@@ -0,0 +1,28 @@
+"""inventory keyset listing index
+
+Revision ID: b41c7e92f0d8
+Revises: 8e3f0b6d2a17
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from alembic import op
+
+
+revision = "b41c7e92f0d8"
+down_revision = "8e3f0b6d2a17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_inventory_items_owner_id_id",
+        "inventory_items",
+        ["owner_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventory_items_owner_id_id", table_name="inventory_items")
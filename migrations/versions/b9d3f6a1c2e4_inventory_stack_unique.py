@@ -0,0 +1,127 @@
+"""inventory stack unique index
+
+Revision ID: b9d3f6a1c2e4
+Revises: e7b4d2a9c613
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "b9d3f6a1c2e4"
+down_revision = "e7b4d2a9c613"
+branch_labels = None
+depends_on = None
+
+
+# frozen copy of app.constants.inventory.STACKABLE_SLOTS at the time of this revision
+STACKABLE_SLOTS = ("consumable", "material", "resource")
+OWNER_BATCH_SIZE = 500
+
+inventory_items = sa.table(
+    "inventory_items",
+    sa.column("id", sa.Integer()),
+    sa.column("owner_id", sa.Integer()),
+    sa.column("catalog_item_id", sa.Integer()),
+    sa.column("is_equipped", sa.Boolean()),
+    sa.column("quantity", sa.Integer()),
+    sa.column("stackable", sa.Boolean()),
+)
+catalog = sa.table(
+    "inventory_items_catalog",
+    sa.column("id", sa.Integer()),
+    sa.column("slot", sa.String()),
+    sa.column("cosmetic", sa.Boolean()),
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "inventory_items",
+        sa.Column("stackable", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    _mark_and_fold_stacks()
+    op.create_index(
+        "uq_inventory_items_owner_id_catalog_item_id_stackable",
+        "inventory_items",
+        ["owner_id", "catalog_item_id"],
+        unique=True,
+        postgresql_where=sa.text("stackable"),
+        sqlite_where=sa.text("stackable"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_inventory_items_owner_id_catalog_item_id_stackable", table_name="inventory_items")
+    with op.batch_alter_table("inventory_items") as batch_op:
+        batch_op.drop_column("stackable")
+
+
+def _owner_batches():
+    # same owner-keyed batching as 8e3f0b6d2a17, so no statement locks the whole table
+    bind = op.get_bind()
+    last_owner_id = None
+    while True:
+        stmt = sa.select(inventory_items.c.owner_id).distinct().order_by(inventory_items.c.owner_id)
+        if last_owner_id is not None:
+            stmt = stmt.where(inventory_items.c.owner_id > last_owner_id)
+        owner_ids = bind.execute(stmt.limit(OWNER_BATCH_SIZE)).scalars().all()
+        if not owner_ids:
+            return
+        yield owner_ids[0], owner_ids[-1]
+        last_owner_id = owner_ids[-1]
+
+
+def _mark_and_fold_stacks() -> None:
+    """Flag stack rows, then merge stacks that concurrent grants split into the lowest id.
+
+    Both steps run one batch of owners at a time.
+    """
+    bind = op.get_bind()
+    stackable_catalog_ids = sa.select(catalog.c.id).where(
+        sa.or_(catalog.c.cosmetic.is_(True), catalog.c.slot.in_(STACKABLE_SLOTS))
+    )
+    equipped_flag = sa.func.max(sa.case((inventory_items.c.is_equipped.is_(True), 1), else_=0))
+
+    for first_owner_id, last_owner_id in _owner_batches():
+        in_batch = inventory_items.c.owner_id.between(first_owner_id, last_owner_id)
+        bind.execute(
+            inventory_items.update()
+            .where(in_batch, inventory_items.c.catalog_item_id.in_(stackable_catalog_ids))
+            .values(stackable=True)
+        )
+        groups = bind.execute(
+            sa.select(
+                inventory_items.c.owner_id,
+                inventory_items.c.catalog_item_id,
+                sa.func.min(inventory_items.c.id).label("keep_id"),
+                sa.func.sum(inventory_items.c.quantity).label("total"),
+                equipped_flag.label("equipped"),
+            )
+            .where(in_batch, inventory_items.c.stackable.is_(True))
+            .group_by(inventory_items.c.owner_id, inventory_items.c.catalog_item_id)
+            .having(sa.func.count() > 1)
+        ).all()
+        if not groups:
+            continue
+
+        bind.execute(
+            inventory_items.update()
+            .where(inventory_items.c.id == sa.bindparam("b_keep_id"))
+            .values(quantity=sa.bindparam("b_total"), is_equipped=sa.bindparam("b_equipped")),
+            [{"b_keep_id": row.keep_id, "b_total": row.total, "b_equipped": bool(row.equipped)} for row in groups],
+        )
+        bind.execute(
+            inventory_items.delete().where(
+                inventory_items.c.owner_id == sa.bindparam("b_owner_id"),
+                inventory_items.c.catalog_item_id == sa.bindparam("b_catalog_item_id"),
+                inventory_items.c.stackable.is_(True),
+                inventory_items.c.id != sa.bindparam("b_keep_id"),
+            ),
+            [
+                {"b_owner_id": row.owner_id, "b_catalog_item_id": row.catalog_item_id, "b_keep_id": row.keep_id}
+                for row in groups
+            ],
+        )
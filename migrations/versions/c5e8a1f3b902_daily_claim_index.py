@@ -0,0 +1,28 @@
+"""daily claim index
+
+Revision ID: c5e8a1f3b902
+Revises: a6c2e19d4f83
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+
+from alembic import op
+
+
+revision = "c5e8a1f3b902"
+down_revision = "a6c2e19d4f83"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_players_last_daily_claim_at_id",
+        "players",
+        ["last_daily_claim_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_players_last_daily_claim_at_id", table_name="players")
@@ -0,0 +1,64 @@
+"""farm plot slot unique
+
+Revision ID: d2a7e5c8f1b3
+Revises: b9d3f6a1c2e4
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d2a7e5c8f1b3"
+down_revision = "b9d3f6a1c2e4"
+branch_labels = None
+depends_on = None
+
+
+farm_plots = sa.table(
+    "farm_plots",
+    sa.column("id", sa.Integer()),
+    sa.column("player_id", sa.BigInteger()),
+    sa.column("slot_index", sa.Integer()),
+    sa.column("unlocked", sa.Boolean()),
+)
+planted_crops = sa.table("farm_planted_crops", sa.column("plot_id", sa.Integer()))
+
+
+def upgrade() -> None:
+    _drop_duplicate_slots()
+    with op.batch_alter_table("farm_plots") as batch_op:
+        batch_op.create_unique_constraint("uq_farm_plots_player_id_slot_index", ["player_id", "slot_index"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("farm_plots") as batch_op:
+        batch_op.drop_constraint("uq_farm_plots_player_id_slot_index", type_="unique")
+
+
+def _drop_duplicate_slots() -> None:
+    """Keep one row per (player, slot) that concurrent lazy inserts duplicated: planted first, then unlocked, then lowest id."""
+    bind = op.get_bind()
+    duplicated = (
+        sa.select(farm_plots.c.player_id, farm_plots.c.slot_index)
+        .group_by(farm_plots.c.player_id, farm_plots.c.slot_index)
+        .having(sa.func.count() > 1)
+        .subquery()
+    )
+    has_crop = sa.exists().where(planted_crops.c.plot_id == farm_plots.c.id)
+    rows = bind.execute(
+        sa.select(farm_plots.c.id, farm_plots.c.player_id, farm_plots.c.slot_index, farm_plots.c.unlocked, has_crop.label("planted"))
+        .join(
+            duplicated,
+            sa.and_(duplicated.c.player_id == farm_plots.c.player_id, duplicated.c.slot_index == farm_plots.c.slot_index),
+        )
+    ).all()
+
+    keep = {}
+    for row in sorted(rows, key=lambda row: (not row.planted, not row.unlocked, row.id)):
+        keep.setdefault((row.player_id, row.slot_index), row.id)
+    drop_ids = [row.id for row in rows if keep[(row.player_id, row.slot_index)] != row.id]
+    if drop_ids:
+        bind.execute(planted_crops.delete().where(planted_crops.c.plot_id.in_(drop_ids)))
+        bind.execute(farm_plots.delete().where(farm_plots.c.id.in_(drop_ids)))
@@ -0,0 +1,25 @@
+"""shop offer stock
+
+Revision ID: e3a8c4d91b27
+Revises: d7f2a95c3e61
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "e3a8c4d91b27"
+down_revision = "d7f2a95c3e61"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("shop_offers", sa.Column("stock_remaining", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("shop_offers") as batch_op:
+        batch_op.drop_column("stock_remaining")
@@ -0,0 +1,25 @@
+"""quest admin indexes
+
+Revision ID: e7b4d2a9c613
+Revises: c5e8a1f3b902
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+
+from alembic import op
+
+
+revision = "e7b4d2a9c613"
+down_revision = "c5e8a1f3b902"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_quest_nodes_quest_id_id", "quest_nodes", ["quest_id", "id"], unique=False)
+    op.create_index("ix_quest_choices_node_id", "quest_choices", ["node_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_quest_choices_node_id", table_name="quest_choices")
+    op.drop_index("ix_quest_nodes_quest_id_id", table_name="quest_nodes")
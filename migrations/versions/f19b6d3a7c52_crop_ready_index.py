@@ -0,0 +1,28 @@
+"""crop ready index
+
+Revision ID: f19b6d3a7c52
+Revises: e3a8c4d91b27
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from alembic import op
+
+
+revision = "f19b6d3a7c52"
+down_revision = "e3a8c4d91b27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_farm_planted_crops_state_ready_at",
+        "farm_planted_crops",
+        ["state", "ready_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_farm_planted_crops_state_ready_at", table_name="farm_planted_crops")
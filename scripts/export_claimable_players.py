@@ -0,0 +1,79 @@
+"""Export the ids of players who can claim the daily reward right now (CSV, one id per line).
+
+Reads in keyset-paginated batches (``iter_claimable_player_ids``), so the list can be piped into a
+push campaign for millions of players without holding it in memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, TextIO
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.base import _normalize_database_url
+from app.db.session import _make_async_url
+from app.services.progression_service import DAILY_CLAIMABLE_BATCH_SIZE, iter_claimable_player_ids
+
+
+async def export_claimable(
+    database_url: str,
+    output: TextIO,
+    *,
+    now: Optional[datetime] = None,
+    batch_size: int = DAILY_CLAIMABLE_BATCH_SIZE,
+    header: bool = True,
+) -> int:
+    """Write claimable player ids to ``output``; returns how many were written."""
+    engine = create_async_engine(_make_async_url(_normalize_database_url(database_url)))
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession)
+    written = 0
+    try:
+        async with session_factory() as session:
+            if header:
+                output.write("player_id\n")
+            async for batch in iter_claimable_player_ids(session, now=now, batch_size=batch_size):
+                output.write("".join(f"{player_id}\n" for player_id in batch))
+                written += len(batch)
+    finally:
+        await engine.dispose()
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Експорт гравців, які зараз можуть забрати щоденну нагороду")
+    parser.add_argument("--database-url", help="База (за замовчуванням — DATABASE_URL)")
+    parser.add_argument("--output", type=Path, help="Файл CSV (за замовчуванням — stdout)")
+    parser.add_argument("--now", type=datetime.fromisoformat, help="Момент перевірки (за замовчуванням — зараз, UTC)")
+    parser.add_argument("--batch-size", type=int, default=DAILY_CLAIMABLE_BATCH_SIZE, help="Гравців за один запит")
+    parser.add_argument("--no-header", action="store_true", help="Без рядка заголовка")
+    args = parser.parse_args(argv)
+
+    database_url = args.database_url or os.getenv("DATABASE_URL", "sqlite:///./ultimate_app.db")
+    now = args.now
+    if now is not None and now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    output = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        written = asyncio.run(
+            export_claimable(database_url, output, now=now, batch_size=args.batch_size, header=not args.no_header)
+        )
+    finally:
+        if args.output:
+            output.close()
+    print(f"{written} claimable players", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
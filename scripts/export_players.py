@@ -0,0 +1,97 @@
+"""Export player state (players, wallets, farms, inventory) as NDJSON or CSV, optionally gzipped.
+
+Rows are read in keyset-paginated pages through a server-side cursor (``export_dataset``), so a
+table of tens of millions of rows streams to disk with flat memory. ``--after`` resumes an
+interrupted export from the last key written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import BinaryIO, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.constants.export import EXPORT_PAGE_SIZE
+from app.db.base import _normalize_database_url
+from app.db.session import _make_async_url
+from app.services.export_service import EXPORT_DATASETS, EXPORT_FORMATS, UnknownExportColumns, export_dataset
+
+
+async def export_to(
+    database_url: str,
+    dataset: str,
+    output: BinaryIO,
+    *,
+    columns: Optional[Sequence[str]] = None,
+    fmt: str = "ndjson",
+    compress: bool = False,
+    after: Optional[int] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> int:
+    """Write ``dataset`` to ``output``; returns the number of bytes written."""
+    export = EXPORT_DATASETS[dataset]
+    selected = export.resolve(columns)
+    engine = create_async_engine(_make_async_url(_normalize_database_url(database_url)))
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession)
+    written = 0
+    try:
+        async with session_factory() as session:
+            async for chunk in export_dataset(
+                session, export, selected, fmt=fmt, compress=compress, after=after, page_size=page_size
+            ):
+                output.write(chunk)
+                written += len(chunk)
+    finally:
+        await engine.dispose()
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Потоковий експорт стану гравців у NDJSON або CSV")
+    parser.add_argument("dataset", choices=sorted(EXPORT_DATASETS), help="Що експортувати")
+    parser.add_argument("--database-url", help="База (за замовчуванням — DATABASE_URL)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson", help="Формат рядків")
+    parser.add_argument("--columns", help="Колонки через кому (за замовчуванням — усі)")
+    parser.add_argument("--gzip", action="store_true", help="Стиснути вивід gzip")
+    parser.add_argument("--after", type=int, help="Продовжити після цього значення ключа")
+    parser.add_argument("--page-size", type=int, default=EXPORT_PAGE_SIZE, help="Рядків за один запит")
+    parser.add_argument("--output", type=Path, help="Файл (за замовчуванням — stdout)")
+    args = parser.parse_args(argv)
+
+    database_url = args.database_url or os.getenv("DATABASE_URL", "sqlite:///./ultimate_app.db")
+    columns = [name.strip() for name in args.columns.split(",") if name.strip()] if args.columns else None
+
+    output = args.output.open("wb") if args.output else sys.stdout.buffer
+    try:
+        written = asyncio.run(
+            export_to(
+                database_url,
+                args.dataset,
+                output,
+                columns=columns,
+                fmt=args.format,
+                compress=args.gzip,
+                after=args.after,
+                page_size=args.page_size,
+            )
+        )
+    except UnknownExportColumns as exc:
+        parser.error(str(exc))
+    finally:
+        if args.output:
+            output.close()
+    print(f"{written} bytes written", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import models  # noqa: F401  # ensure metadata is registered
+from app.db.base import Base
+from app.db.models.player import Player
+from app.schemas.farm import FarmActionResponse, FarmCompactActionResponse, FarmState, FarmStateChanges
+from app.services.farm_service import FarmService, FarmStateData
+
+
+def _prepare_farm(session: Session, player_id: int = 1) -> FarmStateData:
+    """A late-game farm: every plot unlocked and planted, one plot touched by the last action."""
+    session.add(Player(id=player_id, username="benchmark", level=10, gold=100_000))
+    session.flush()
+    service = FarmService(session)
+    state = service.get_farm_state(player_id)
+    for plot in state.plots:
+        plot.unlocked = True
+    state.stats.energy = state.stats.max_energy = 60
+    session.flush()
+
+    plant_id = state.plants[0].id
+    state, _ = service.plant_batch(player_id, [(plot.id, plant_id) for plot in state.plots])
+    state.changed_plot_ids = {state.plots[0].id}
+    return state
+
+
+def _full_payload(service: FarmService, state: FarmStateData) -> bytes:
+    response = FarmActionResponse(state=FarmState(**service.build_public_state(state)), message="")
+    return json.dumps(jsonable_encoder(response), ensure_ascii=False).encode("utf-8")
+
+
+def _compact_payload(service: FarmService, state: FarmStateData) -> bytes:
+    response = FarmCompactActionResponse(changes=FarmStateChanges(**service.build_compact_changes(state)), message="")
+    return json.dumps(jsonable_encoder(response), ensure_ascii=False).encode("utf-8")
+
+
+def measure(iterations: int = 500) -> Dict[str, Dict[str, float]]:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, future=True)()
+    try:
+        state = _prepare_farm(session)
+        service = FarmService(session)
+        modes: Dict[str, Callable[[FarmService, FarmStateData], bytes]] = {
+            "full": _full_payload,
+            "compact": _compact_payload,
+        }
+        report: Dict[str, Dict[str, float]] = {}
+        for name, build in modes.items():
+            payload = build(service, state)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                build(service, state)
+            elapsed = time.perf_counter() - started
+            report[name] = {"bytes": len(payload), "serialise_us": elapsed / iterations * 1_000_000}
+        return report
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Порівняння розміру та часу серіалізації повної і компактної відповіді ферми")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    report = measure(args.iterations)
+    print(f"{'mode':<10}{'bytes':>10}{'serialise, us':>16}")
+    for name, row in report.items():
+        print(f"{name:<10}{row['bytes']:>10.0f}{row['serialise_us']:>16.1f}")
+    ratio = report["full"]["bytes"] / report["compact"]["bytes"]
+    print(f"compact payload is {ratio:.1f}x smaller")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
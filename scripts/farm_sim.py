@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from app.services.farm_simulation import STRATEGIES, PopulationResult, simulate_population
+
+
+def render(result: PopulationResult, every: int = 1) -> str:
+    lines = [
+        f"strategy {result.strategy}: {result.players} players x {result.days} days"
+        f" ({'numpy' if result.vectorized else 'scalar'})",
+        f"{'day':>5}{'gold':>12}{'farm xp':>12}{'level':>8}",
+    ]
+    for day in range(result.days):
+        if (day + 1) % every and day + 1 != result.days:
+            continue
+        lines.append(
+            f"{day + 1:>5}{result.mean_gold[day]:>12.0f}{result.mean_xp_earned[day]:>12.0f}{result.mean_level[day]:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Симуляція економіки ферми: криві золота та досвіду для кожної стратегії")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--players", type=int, default=1000, help="Гравців на стратегію; інтервали візитів розкидані ±50%%")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), action="append", help="За замовчуванням — усі стратегії")
+    parser.add_argument("--player-level", type=int, default=5, help="Основний рівень персонажа (відкриває рослини й ділянки)")
+    parser.add_argument("--start-gold", type=int, default=0)
+    parser.add_argument("--every", type=int, default=1, help="Друкувати кожен N-й день")
+    parser.add_argument("--scalar", action="store_true", help="Не використовувати NumPy навіть якщо він встановлений")
+    args = parser.parse_args(argv)
+
+    for name in args.strategy or sorted(STRATEGIES):
+        started = time.perf_counter()
+        result = simulate_population(
+            STRATEGIES[name],
+            args.days,
+            args.players,
+            player_level=args.player_level,
+            start_gold=args.start_gold,
+            vectorized=False if args.scalar else None,
+        )
+        elapsed = time.perf_counter() - started
+        print(render(result, max(1, args.every)))
+        print(f"{args.players * args.days / elapsed:,.0f} player-days/s\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db import models  # noqa: F401  # ensure metadata is registered
+from app.db.base import Base
+from app.db.models.inventory import InventoryItem, InventoryItemCatalog
+from app.db.models.player import Player
+from app.db.models.shop import ShopOffer
+from app.db.models.wallet import Wallet
+from app.db.session import _make_async_url
+from app.services.shop_service import OfferPurchaseQueue, buy_offer
+from app.utils.exceptions import ShopOfferSoldOut
+
+
+@dataclass
+class FlashSaleReport:
+    stock: int
+    attempts: int
+    elapsed_seconds: float = 0.0
+    outcomes: Dict[str, int] = field(default_factory=lambda: {"purchased": 0, "sold_out": 0, "error": 0})
+    errors: List[str] = field(default_factory=list)
+    granted_rows: int = 0
+    stock_left: int = 0
+
+    @property
+    def oversell(self) -> int:
+        return max(0, self.granted_rows - self.stock)
+
+    @property
+    def throughput(self) -> float:
+        return self.attempts / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def render(self) -> str:
+        lines = [
+            f"attempts          {self.attempts}",
+            f"purchased         {self.outcomes['purchased']}",
+            f"sold out          {self.outcomes['sold_out']}",
+            f"errors            {self.outcomes['error']}",
+            f"granted rows      {self.granted_rows}",
+            f"stock left        {self.stock_left}",
+            f"oversell          {self.oversell}",
+            f"elapsed           {self.elapsed_seconds:.3f}s",
+            f"throughput        {self.throughput:.1f} req/s",
+        ]
+        lines.extend(f"  error: {message}" for message in self.errors[:5])
+        return "\n".join(lines)
+
+
+async def _seed(maker: async_sessionmaker[AsyncSession], players: int, stock: int, price: int, first_id: int) -> int:
+    async with maker() as session:
+        item = InventoryItemCatalog(name="Корона Флеш-розпродажу", slot="head", rarity="legendary", cosmetic=True)
+        session.add(item)
+        await session.flush()
+        offer = ShopOffer(catalog_item_id=item.id, price_gold=price, is_limited=True, stock_remaining=stock)
+        session.add(offer)
+        for player_id in range(first_id, first_id + players):
+            session.add(Player(id=player_id, username=f"buyer-{player_id}", gold=price))
+            session.add(Wallet(player_id=player_id, gold=price))
+        await session.commit()
+        return offer.id
+
+
+async def _buy(
+    maker: async_sessionmaker[AsyncSession],
+    queue: OfferPurchaseQueue,
+    client_slots: asyncio.Semaphore,
+    player_id: int,
+    offer_id: int,
+    report: FlashSaleReport,
+) -> None:
+    async with client_slots:
+        # same flow as POST /player/{id}/shop/buy, without the HTTP layer
+        if queue.is_sold_out(offer_id):
+            report.outcomes["sold_out"] += 1
+            return
+        async with queue.slot(offer_id):
+            async with maker() as session:
+                try:
+                    await buy_offer(session, player_id, offer_id)
+                    await session.commit()
+                except ShopOfferSoldOut:
+                    await session.rollback()
+                    queue.mark_sold_out(offer_id)
+                    report.outcomes["sold_out"] += 1
+                    return
+                except Exception as exc:  # noqa: BLE001 - every failure is part of the report
+                    await session.rollback()
+                    report.outcomes["error"] += 1
+                    report.errors.append(f"{type(exc).__name__}: {exc}")
+                    return
+        report.outcomes["purchased"] += 1
+
+
+async def run_flash_sale(
+    database_url: str,
+    *,
+    players: int,
+    stock: int,
+    price: int = 10,
+    concurrency: int = 200,
+    gate_concurrency: int = 4,
+    first_player_id: int = 900_000,
+) -> FlashSaleReport:
+    engine = create_async_engine(_make_async_url(database_url), future=True, pool_size=max(5, gate_concurrency))
+    maker = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        offer_id = await _seed(maker, players, stock, price, first_player_id)
+
+        report = FlashSaleReport(stock=stock, attempts=players)
+        queue = OfferPurchaseQueue(gate_concurrency)
+        client_slots = asyncio.Semaphore(concurrency)
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _buy(maker, queue, client_slots, player_id, offer_id, report)
+                for player_id in range(first_player_id, first_player_id + players)
+            )
+        )
+        report.elapsed_seconds = time.perf_counter() - started
+
+        async with maker() as session:
+            offer = await session.get(ShopOffer, offer_id)
+            report.stock_left = offer.stock_remaining
+            report.granted_rows = await session.scalar(
+                select(func.count()).select_from(InventoryItem).where(InventoryItem.catalog_item_id == offer.catalog_item_id)
+            )
+        return report
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Навантажувальний тест флеш-розпродажу: перевіряє, що запас не продається двічі")
+    parser.add_argument(
+        "--database-url",
+        help="Порожня тестова база (Postgres або SQLite). За замовчуванням — тимчасовий файл SQLite.",
+    )
+    parser.add_argument("--players", type=int, default=1000, help="Кількість покупців, що натискають «купити» одночасно")
+    parser.add_argument("--stock", type=int, default=100, help="Запас пропозиції")
+    parser.add_argument("--concurrency", type=int, default=200, help="Скільки запитів одночасно в дорозі")
+    parser.add_argument("--gate-concurrency", type=int, default=4, help="Пропускна здатність черги однієї пропозиції")
+    args = parser.parse_args(argv)
+
+    temp_dir = None
+    database_url = args.database_url
+    if database_url is None:
+        temp_dir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{os.path.join(temp_dir.name, 'flash_sale.db')}"
+
+    try:
+        report = asyncio.run(
+            run_flash_sale(
+                database_url,
+                players=args.players,
+                stock=args.stock,
+                concurrency=args.concurrency,
+                gate_concurrency=args.gate_concurrency,
+            )
+        )
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    print(report.render())
+    return 0 if report.oversell == 0 and report.stock_left >= 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,382 @@
+"""Deterministic synthetic players for scale testing.
+
+Creates N players with everything a real account accumulates: wallet, farm stats, plots and
+crops, inventory, quest progress, activity log, a login and session tokens. Each player is drawn
+from its own ``Random(seed, index)``, so the same ``--seed`` and ``--now`` always produce the same
+rows, whatever the batch size.
+
+Rows skip the ORM: every batch goes out as one ``COPY ... FROM STDIN`` per table on Postgres
+(psycopg) and as one DBAPI ``executemany`` per table elsewhere, which keeps 1M players in the
+range of minutes. Static content (plants, quests, item catalog) is seeded through the services
+first, exactly as the app would.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from random import Random
+from typing import Any, Dict, List, Sequence, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.constants.onboarding import ONBOARDING_QUEST_ID
+from app.db import models  # noqa: F401  # ensure metadata is registered
+from app.db.base import Base, _normalize_database_url
+from app.db.models.activity import PlayerActivityLog
+from app.db.models.farm import FarmPlot, PlantedCrop, PlantType, PlayerFarmingStats
+from app.db.models.inventory import InventoryItem, InventoryItemCatalog
+from app.db.models.player import Player
+from app.db.models.quest import QuestNode, QuestProgress
+from app.db.models.user import SessionToken, UserAccount
+from app.db.models.wallet import Wallet
+from app.services import farm_rules
+from app.services.farm_service import FarmService
+from app.services.inventory_service import is_stackable
+from app.services.onboarding_service import OnboardingService
+from app.services.progression_service import ProgressionService
+from app.services.quest_content_service import QuestContentService
+from app.utils.security import hash_password
+
+SYNTHETIC_PASSWORD = "synthetic-password"
+SYNTHETIC_SALT = b"synthetic-salt-0"
+SYNTHETIC_CATALOG_SIZE = 60
+_SLOTS = ("head", "chest", "legs", "feet", "hands", "cloak", "weapon", "accessory")
+_RARITIES = (("common", 0.6), ("rare", 0.28), ("epic", 0.1), ("seasonal", 0.02))
+
+# insertion order respects the foreign keys
+_TABLES = (
+    Player.__table__,
+    Wallet.__table__,
+    PlayerFarmingStats.__table__,
+    FarmPlot.__table__,
+    PlantedCrop.__table__,
+    InventoryItem.__table__,
+    QuestProgress.__table__,
+    PlayerActivityLog.__table__,
+    UserAccount.__table__,
+    SessionToken.__table__,
+)
+# tables whose ids are assigned here because other rows point at them
+_EXPLICIT_ID_TABLES = (Player.__table__, FarmPlot.__table__, UserAccount.__table__)
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    players: int
+    seed: int = 0
+    now: datetime = field(default_factory=lambda: datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0))
+    batch_size: int = 5_000
+    max_inventory: int = 400
+    activity_per_player: int = 12
+    tokens_per_player: int = 2
+    account_share: float = 0.9
+
+
+@dataclass
+class Content:
+    """Ids of the static content the synthetic rows point into."""
+
+    plants: List[Tuple[int, int]]  # (id, growth_seconds)
+    catalog: List[Tuple[int, str, bool]]  # (id, slot, stackable)
+    onboarding_nodes: List[str]
+    saga_nodes: List[Tuple[int, str]]  # (quest_id, node_id)
+
+
+@dataclass
+class Batch:
+    rows: Dict[str, List[Tuple[Any, ...]]] = field(default_factory=lambda: {table.name: [] for table in _TABLES})
+
+    def add(self, table, *values: Any) -> None:
+        self.rows[table.name].append(values)
+
+
+# column order of every tuple ``Batch.add`` receives for that table
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "players": (
+        "id", "username", "level", "xp", "energy", "max_energy", "gold",
+        "strength", "agility", "intelligence", "vitality",
+        "onboarding_completed", "last_daily_claim_at", "created_at",
+    ),
+    "wallets": ("player_id", "gold"),
+    "farm_player_stats": (
+        "player_id", "level", "xp", "energy", "max_energy", "tool_level", "tool_name",
+        "tool_bonus_percent", "last_energy_refill_at", "starter_seed_charges",
+    ),
+    "farm_plots": (
+        "id", "player_id", "slot_index", "unlocked", "unlock_cost",
+        "unlock_level_requirement", "unlock_farming_level_requirement", "created_at",
+    ),
+    "farm_planted_crops": ("plot_id", "plant_type_id", "planted_at", "ready_at", "harvested_at", "state"),
+    "inventory_items": ("owner_id", "catalog_item_id", "slot", "is_equipped", "quantity", "stackable"),
+    "quest_progress": ("player_id", "quest_id", "current_node_id"),
+    "player_activity_log": ("player_id", "activity_type", "created_at"),
+    "user_accounts": ("id", "login", "password_hash", "password_salt", "is_admin", "player_id", "created_at"),
+    "session_tokens": ("token", "user_id", "expires_at", "created_at"),
+}
+
+
+class RowWriter:
+    """Bulk-inserts prepared tuples: ``COPY`` on psycopg, DBAPI ``executemany`` otherwise."""
+
+    def __init__(self, connection: Connection) -> None:
+        self._connection = connection
+        dialect = connection.dialect
+        self._copy = dialect.name == "postgresql" and dialect.driver == "psycopg"
+        self._sqlite = dialect.name == "sqlite"
+        self._placeholder = "?" if dialect.paramstyle == "qmark" else "%s"
+
+    def write(self, table: str, rows: Sequence[Tuple[Any, ...]]) -> None:
+        if not rows:
+            return
+        columns = COLUMNS[table]
+        if self._copy:
+            cursor = self._connection.connection.driver_connection.cursor()
+            with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+            return
+        if self._sqlite:
+            # the format SQLAlchemy's sqlite DateTime reads back
+            rows = [
+                tuple(value.strftime("%Y-%m-%d %H:%M:%S.%f") if isinstance(value, datetime) else value for value in row)
+                for row in rows
+            ]
+        statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join([self._placeholder] * len(columns))})"
+        self._connection.exec_driver_sql(statement, rows)
+
+
+def _ensure_content(engine: Engine, seed: int) -> Content:
+    with Session(engine) as session:
+        OnboardingService(session).ensure_onboarding_content()
+        QuestContentService(session).ensure_fallen_crown_saga()
+        FarmService(session).list_plant_catalog()
+        if session.scalar(select(func.count()).select_from(InventoryItemCatalog)) == 0:
+            rng = Random(seed)
+            session.add_all(
+                InventoryItemCatalog(
+                    name=f"Синтетичний предмет {index}",
+                    slot=rng.choice(_SLOTS),
+                    rarity=rng.choices([name for name, _ in _RARITIES], [weight for _, weight in _RARITIES])[0],
+                    cosmetic=rng.random() < 0.4,
+                )
+                for index in range(SYNTHETIC_CATALOG_SIZE)
+            )
+        session.commit()
+
+        nodes = session.execute(
+            select(QuestNode.quest_id, QuestNode.id).where(QuestNode.is_final.is_(False)).order_by(QuestNode.id)
+        ).all()
+        return Content(
+            plants=[tuple(row) for row in session.execute(select(PlantType.id, PlantType.growth_seconds).order_by(PlantType.id))],
+            catalog=[
+                (item.id, item.slot, is_stackable(item))
+                for item in session.scalars(select(InventoryItemCatalog).order_by(InventoryItemCatalog.id))
+            ],
+            onboarding_nodes=[node_id for quest_id, node_id in nodes if quest_id == ONBOARDING_QUEST_ID],
+            saga_nodes=[(quest_id, node_id) for quest_id, node_id in nodes if quest_id != ONBOARDING_QUEST_ID],
+        )
+
+
+def _next_ids(connection: Connection) -> Dict[str, int]:
+    return {
+        table.name: (connection.scalar(select(func.max(table.c.id))) or 0) + 1
+        for table in _EXPLICIT_ID_TABLES
+    }
+
+
+def _generate_player(
+    batch: Batch,
+    rng: Random,
+    player_id: int,
+    ids: Dict[str, int],
+    content: Content,
+    config: GeneratorConfig,
+    password_hash: bytes,
+) -> None:
+    now = config.now
+    created_at = now - timedelta(seconds=int(rng.expovariate(1 / (60 * 86_400))) + 60)
+    age = now - created_at
+    # most players churn after a few levels; a long tail plays for months
+    level = min(60, 1 + int(rng.expovariate(1 / 5)))
+    xp = rng.randrange(ProgressionService.xp_required_for_next_level(level))
+    gold = int(rng.lognormvariate(5, 1.3))
+    onboarded = level >= 3 or rng.random() < 0.5
+    last_daily = now - timedelta(seconds=rng.randrange(3 * 86_400)) if rng.random() < 0.7 else None
+    if last_daily is not None and last_daily < created_at:
+        last_daily = None
+    batch.add(
+        Player.__table__,
+        player_id, f"Гравець {player_id}", level, xp, rng.randint(0, 20), 20, gold,
+        *(5 + rng.randint(0, level // 4) for _ in range(4)),
+        onboarded, last_daily, created_at,
+    )
+    batch.add(Wallet.__table__, player_id, gold)
+
+    farming_level = max(1, min(level, 1 + int(rng.expovariate(1 / 3))))
+    tool = farm_rules.TOOL_UPGRADES[0]
+    for upgrade in farm_rules.TOOL_UPGRADES[1:]:
+        if upgrade["required_farming_level"] > farming_level or rng.random() < 0.4:
+            break
+        tool = upgrade
+    batch.add(
+        PlayerFarmingStats.__table__,
+        player_id, farming_level, rng.randrange(farm_rules.xp_required_for_next_level(farming_level)),
+        rng.randint(0, 30), 30, tool["level"], tool["name"], tool["bonus_percent"],
+        now - timedelta(seconds=rng.randrange(86_400)), 0 if rng.random() < 0.8 else 1,
+    )
+
+    unlocked_slots = farm_rules.BASE_PLOTS + sum(
+        1 for slot in range(farm_rules.BASE_PLOTS + 1, farm_rules.TOTAL_PLOTS + 1)
+        if farm_rules.PLOT_SLOT_RULES[slot - 1].unlock_level_requirement <= level and rng.random() < 0.5
+    )
+    for slot in range(1, unlocked_slots + 1):
+        terms = farm_rules.PLOT_SLOT_RULES[slot - 1]
+        plot_id = ids["farm_plots"]
+        ids["farm_plots"] += 1
+        batch.add(
+            FarmPlot.__table__,
+            plot_id, player_id, slot, True, terms.unlock_cost,
+            terms.unlock_level_requirement, terms.unlock_farming_level_requirement, created_at,
+        )
+        if rng.random() < 0.6:
+            plant_id, growth_seconds = rng.choice(content.plants)
+            planted_at = now - timedelta(seconds=rng.randrange(2 * growth_seconds))
+            ready_at = planted_at + timedelta(seconds=growth_seconds)
+            state = "growing" if ready_at > now or rng.random() < 0.5 else "ready"
+            batch.add(PlantedCrop.__table__, plot_id, plant_id, planted_at, ready_at, None, state)
+
+    if content.catalog:
+        items = min(config.max_inventory, int(rng.lognormvariate(1.8, 1.0)))
+        equipped_slots = set()
+        # stackable items are one row per catalog item, as the grant upsert keeps them
+        stacks: Dict[int, List[Any]] = {}
+        for _ in range(items):
+            catalog_item_id, slot, stackable = rng.choice(content.catalog)
+            equipped = slot not in equipped_slots and rng.random() < 0.5
+            if equipped:
+                equipped_slots.add(slot)
+            quantity = 1 if rng.random() < 0.8 else rng.randint(2, 20)
+            if not stackable:
+                batch.add(InventoryItem.__table__, player_id, catalog_item_id, slot, equipped, quantity, False)
+            elif catalog_item_id in stacks:
+                stacks[catalog_item_id][4] += quantity
+            else:
+                stacks[catalog_item_id] = [player_id, catalog_item_id, slot, equipped, quantity, True]
+        for row in stacks.values():
+            batch.add(InventoryItem.__table__, *row)
+
+    if onboarded and content.saga_nodes:
+        batch.add(QuestProgress.__table__, player_id, *rng.choice(content.saga_nodes))
+    elif content.onboarding_nodes:
+        batch.add(QuestProgress.__table__, player_id, ONBOARDING_QUEST_ID, rng.choice(content.onboarding_nodes))
+
+    for _ in range(rng.randint(0, 2 * config.activity_per_player)):
+        batch.add(PlayerActivityLog.__table__, player_id, "dashboard_view", created_at + rng.random() * age)
+
+    if rng.random() < config.account_share:
+        account_id = ids["user_accounts"]
+        ids["user_accounts"] += 1
+        batch.add(UserAccount.__table__, account_id, f"synthetic-{player_id}", password_hash, SYNTHETIC_SALT, False, player_id, created_at)
+        for _ in range(rng.randint(0, 2 * config.tokens_per_player)):
+            issued_at = created_at + rng.random() * age
+            batch.add(SessionToken.__table__, f"{rng.getrandbits(256):064x}", account_id, issued_at + SessionToken.lifetime(), issued_at)
+
+
+def _sync_sequences(connection: Connection) -> None:
+    """Explicit ids leave Postgres sequences behind; move them past the generated rows."""
+    if connection.dialect.name != "postgresql":
+        return
+    for table in _EXPLICIT_ID_TABLES:
+        connection.execute(
+            text(f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), (SELECT max(id) FROM {table.name}))")
+        )
+
+
+def generate(engine: Engine, config: GeneratorConfig, *, progress: bool = False) -> Dict[str, int]:
+    """Append ``config.players`` synthetic players and return the number of rows per table."""
+    content = _ensure_content(engine, config.seed)
+    # one shared hash: PBKDF2 per account would dominate the run
+    password_hash = hash_password(SYNTHETIC_PASSWORD, SYNTHETIC_SALT)
+    totals = {table.name: 0 for table in _TABLES}
+    started = time.perf_counter()
+
+    with engine.connect() as connection:
+        if connection.dialect.name == "sqlite":
+            # a lost scratch database is fine; this roughly halves the load time
+            connection.exec_driver_sql("PRAGMA synchronous = OFF")
+        ids = _next_ids(connection)
+        connection.commit()
+        first_player_id = ids["players"]
+        writer = RowWriter(connection)
+
+        for batch_start in range(0, config.players, config.batch_size):
+            batch = Batch()
+            for index in range(batch_start, min(config.players, batch_start + config.batch_size)):
+                _generate_player(batch, Random(config.seed * 1_000_003 + index), first_player_id + index, ids, content, config, password_hash)
+            with connection.begin():
+                for table in _TABLES:
+                    writer.write(table.name, batch.rows[table.name])
+                    totals[table.name] += len(batch.rows[table.name])
+            if progress:
+                done = min(config.players, batch_start + config.batch_size)
+                elapsed = time.perf_counter() - started
+                print(f"{done}/{config.players} players, {sum(totals.values())} rows, {done / elapsed:.0f} players/s", flush=True)
+
+        with connection.begin():
+            _sync_sequences(connection)
+    return totals
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Генерує синтетичних гравців для тестів масштабування (детерміновано за зерном)")
+    parser.add_argument("--database-url", help="Цільова база (за замовчуванням — DATABASE_URL)")
+    parser.add_argument("--players", type=int, default=10_000, help="Скільки гравців додати")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора")
+    parser.add_argument("--now", type=datetime.fromisoformat, help="Момент, від якого відлічуються дати (за замовчуванням — початок поточної доби UTC)")
+    parser.add_argument("--batch-size", type=int, default=5_000, help="Гравців в одній транзакції")
+    parser.add_argument("--max-inventory", type=int, default=400, help="Найбільший інвентар одного гравця")
+    parser.add_argument("--activity", type=int, default=12, help="Середня кількість записів активності на гравця")
+    parser.add_argument("--tokens", type=int, default=2, help="Середня кількість сесійних токенів на акаунт")
+    parser.add_argument("--create-schema", action="store_true", help="Створити таблиці (для порожньої бази без міграцій)")
+    args = parser.parse_args(argv)
+
+    url = _normalize_database_url(args.database_url or os.getenv("DATABASE_URL", "sqlite:///./ultimate_app.db"))
+    engine = create_engine(url)
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+
+    config = GeneratorConfig(
+        players=args.players,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        max_inventory=args.max_inventory,
+        activity_per_player=args.activity,
+        tokens_per_player=args.tokens,
+    )
+    if args.now is not None:
+        config = replace(config, now=args.now if args.now.tzinfo else args.now.replace(tzinfo=timezone.utc))
+
+    started = time.perf_counter()
+    totals = generate(engine, config, progress=True)
+    elapsed = time.perf_counter() - started
+    for table, rows in totals.items():
+        print(f"{table:<22} {rows}")
+    print(f"{sum(totals.values())} rows in {elapsed:.1f}s")
+    engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+PASSWORD = "load-test-password"
+# p95 may grow by this share before a comparison fails, and never by less than the noise floor
+DEFAULT_TOLERANCE = 0.2
+NOISE_FLOOR_MS = 2.0
+# status of the stand-in response for calls that never got one (timeouts, refused connections)
+TRANSPORT_ERROR_STATUS = 599
+# crops on the seeded throwaway database ripen this fast, so harvest-all runs within a short test
+LOAD_GROWTH_SECONDS = 3
+# cheap equippable items for the seeded shop: (name, slot, price); a player buys each one once
+LOAD_SHOP_ITEMS = (
+    ("Навантажувальний шолом", "head", 0),
+    ("Навантажувальний плащ", "cloak", 20),
+    ("Навантажувальний меч", "weapon", 40),
+    ("Навантажувальні чоботи", "feet", 80),
+)
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    statements: List[int] = field(default_factory=list)
+    errors: int = 0
+
+    def percentile(self, share: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": len(self.latencies_ms),
+            "errors": self.errors,
+            "p50_ms": round(self.percentile(0.50), 2),
+            "p95_ms": round(self.percentile(0.95), 2),
+            "p99_ms": round(self.percentile(0.99), 2),
+            "avg_statements": round(sum(self.statements) / len(self.statements), 2) if self.statements else 0.0,
+        }
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, EndpointStats] = {}
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        stats = self.endpoints.setdefault(label, EndpointStats())
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            # a timeout or dropped connection fails this call, not the whole player session
+            stats.errors += 1
+            return httpx.Response(TRANSPORT_ERROR_STATUS, request=client.build_request(method, url))
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+        if "x-db-statements" in response.headers:
+            stats.statements.append(int(response.headers["x-db-statements"]))
+        if response.status_code >= 500:
+            stats.errors += 1
+        return response
+
+
+async def _think(rng: random.Random, scale: float) -> None:
+    if scale > 0:
+        await asyncio.sleep(rng.uniform(0.5, 3.0) * scale)
+
+
+async def player_session(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    run_id: str,
+    index: int,
+    deadline: float,
+    think_scale: float,
+    seed: int,
+) -> None:
+    """One player: register, then cycle through the screens a real session visits."""
+    rng = random.Random(f"{seed}-{index}")
+    registered = await recorder.call(
+        client,
+        "POST /auth/register",
+        "POST",
+        "/auth/register",
+        json={"login": f"load-{run_id}-{index}", "password": PASSWORD, "hero_name": f"Load {index}"},
+    )
+    if registered.status_code != 201:
+        return
+    body = registered.json()
+    player_id = body["user"]["player_id"]
+    headers = {"Authorization": f"Bearer {body['access_token']}"}
+    base = f"/player/{player_id}"
+
+    async def call(label: str, method: str, url: str, **kwargs) -> httpx.Response:
+        return await recorder.call(client, label, method, url, headers=headers, **kwargs)
+
+    while time.monotonic() < deadline:
+        await call("GET /player/{id}/dashboard", "GET", f"{base}/dashboard")
+        await _think(rng, think_scale)
+
+        farm = await call("GET /farm/{id}", "GET", f"/farm/{player_id}")
+        if farm.status_code == 200:
+            state = farm.json()
+            if any(plot["crop"] and plot["crop"]["state"] == "ready" for plot in state["plots"]):
+                await call("POST /farm/{id}/harvest-all", "POST", f"/farm/{player_id}/harvest-all")
+            empty = [plot["id"] for plot in state["plots"] if plot["unlocked"] and plot["crop"] is None]
+            plants = [
+                plant
+                for plant in state["available_plants"]
+                if plant["is_unlocked"] and plant["energy_cost"] <= state["stats"]["energy"]
+            ]
+            if empty and plants:
+                plant = rng.choice(plants)
+                await call(
+                    "POST /farm/{id}/plant",
+                    "POST",
+                    f"/farm/{player_id}/plant",
+                    json={"plot_id": rng.choice(empty), "plant_type_id": plant["id"]},
+                )
+        await _think(rng, think_scale)
+
+        quest = await call("GET /player/{id}/quest/current", "GET", f"{base}/quest/current")
+        if quest.status_code == 200:
+            choices = quest.json()["node"]["choices"]
+            if choices:
+                await call(
+                    "POST /player/{id}/quest/choose",
+                    "POST",
+                    f"{base}/quest/choose",
+                    json={"choice_id": rng.choice(choices)["choice_id"]},
+                )
+        await _think(rng, think_scale)
+
+        shop = await call("GET /player/{id}/shop", "GET", f"{base}/shop")
+        if shop.status_code == 200:
+            payload = shop.json()
+            affordable = [
+                offer
+                for offer in payload["offers"]
+                if not offer["owned"] and offer["price_gold"] <= payload["wallet"]["gold"]
+            ]
+            if affordable:
+                await call("POST /player/{id}/shop/buy", "POST", f"{base}/shop/buy", json={"offer_id": rng.choice(affordable)["offer_id"]})
+        await _think(rng, think_scale)
+
+        inventory = await call("GET /player/{id}/inventory", "GET", f"{base}/inventory")
+        if inventory.status_code == 200:
+            unequipped = [item["id"] for item in inventory.json()["items"] if not item["is_equipped"]]
+            if unequipped:
+                await call("POST /player/{id}/inventory/equip", "POST", f"{base}/inventory/equip", json={"item_id": rng.choice(unequipped)})
+        await _think(rng, think_scale)
+
+
+async def run_workload(
+    base_url: str,
+    players: int,
+    duration: float,
+    think_scale: float,
+    ramp_up: float,
+    seed: int = 0,
+) -> dict:
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=players, max_keepalive_connections=players)
+    started = time.perf_counter()
+    deadline = time.monotonic() + duration
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+
+        async def delayed(index: int) -> None:
+            await asyncio.sleep(ramp_up * index / max(1, players))
+            await player_session(client, recorder, run_id, index, deadline, think_scale, seed)
+
+        await asyncio.gather(*(delayed(index) for index in range(players)))
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(stats.latencies_ms) for stats in recorder.endpoints.values())
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "config": {
+            "players": players,
+            "duration": duration,
+            "think_scale": think_scale,
+            "ramp_up": ramp_up,
+            "seed": seed,
+            "base_url": base_url,
+        },
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 2),
+        "endpoints": {label: stats.summary() for label, stats in sorted(recorder.endpoints.items())},
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed_load_fixtures(database_url: str) -> None:
+    """Content a fresh database lacks for the load profile: fast-growing plants and a cheap shop.
+
+    New players start with no gold and no items, so without it harvest-all, shop buy and
+    inventory equip would never run. The plants are the default catalog with growth cut to
+    ``LOAD_GROWTH_SECONDS``; harvests pay for the offers, and bought items are then equipped.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.db import models  # noqa: F401  # ensure models are registered
+    from app.db.base import Base, _normalize_database_url
+    from app.db.models.farm import PlantType
+    from app.db.models.inventory import InventoryItemCatalog
+    from app.db.models.shop import ShopOffer
+    from app.services.farm_rules import DEFAULT_PLANTS
+
+    engine = create_engine(_normalize_database_url(database_url))
+    try:
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add_all(
+                PlantType(**{**plant, "growth_seconds": min(int(plant["growth_seconds"]), LOAD_GROWTH_SECONDS)})
+                for plant in DEFAULT_PLANTS
+            )
+            for name, slot, price in LOAD_SHOP_ITEMS:
+                item = InventoryItemCatalog(name=name, slot=slot, rarity="common", cosmetic=False)
+                session.add(ShopOffer(catalog_item=item, price_gold=price))
+            session.commit()
+    finally:
+        engine.dispose()
+
+
+def start_server(database_url: str) -> tuple[subprocess.Popen, str]:
+    """Local uvicorn with X-DB-* headers on."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "APP_DEBUG": "1",
+        "DB_SCHEMA_MODE": os.getenv("DB_SCHEMA_MODE", "create"),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise TimeoutError("server did not become healthy within 60s")
+
+
+def render(report: dict) -> str:
+    lines = [
+        f"{report['requests']} requests, {report['throughput_rps']} req/s (commit {report['commit']})",
+        f"{'endpoint':<36}{'count':>7}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'stmts':>7}",
+    ]
+    for label, row in report["endpoints"].items():
+        lines.append(
+            f"{label:<36}{row['count']:>7}{row['errors']:>5}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+            f"{row['p99_ms']:>9.1f}{row['avg_statements']:>7.1f}"
+        )
+    return "\n".join(lines)
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Endpoints whose p95 or statement count regressed against the baseline."""
+    regressions = []
+    for label, row in report["endpoints"].items():
+        base = baseline["endpoints"].get(label)
+        if base is None or not row["count"]:
+            continue
+        allowed = max(base["p95_ms"] * (1 + tolerance), base["p95_ms"] + NOISE_FLOOR_MS)
+        if row["p95_ms"] > allowed:
+            regressions.append(f"{label}: p95 {base['p95_ms']:.1f} -> {row['p95_ms']:.1f} ms")
+        # statement counts depend a little on the action mix, so allow the same relative slack
+        if row["avg_statements"] > base["avg_statements"] * (1 + tolerance / 2) + 0.5:
+            regressions.append(f"{label}: statements {base['avg_statements']:.1f} -> {row['avg_statements']:.1f}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Навантажувальний тест: гравці реєструються й грають як справжні сесії")
+    parser.add_argument("--base-url", help="Вже запущений сервер; без нього стартує локальний uvicorn")
+    parser.add_argument("--database-url", help="База для локального сервера (за замовчуванням — новий SQLite-файл із насінням для навантаження)")
+    parser.add_argument("--players", type=int, default=20, help="Одночасних гравців")
+    parser.add_argument("--duration", type=float, default=30.0, help="Секунд навантаження")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="За скільки секунд підключаються всі гравці")
+    parser.add_argument("--think-scale", type=float, default=1.0, help="Множник пауз між діями (0 — без пауз)")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно для вибору дій гравців")
+    parser.add_argument("--save-baseline", type=Path, help="Зберегти звіт як базову лінію (JSON)")
+    parser.add_argument("--compare", type=Path, help="Порівняти з базовою лінією; код виходу 1 при регресії")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Допустиме зростання p95 (частка)")
+    args = parser.parse_args(argv)
+
+    process = None
+    base_url = args.base_url
+    if base_url is None:
+        database_url = args.database_url
+        if database_url is None:
+            # a throwaway SQLite file, seeded before the server warms its caches
+            database_url = f"sqlite:///{tempfile.mkdtemp(prefix='load-test-')}/load.db"
+            seed_load_fixtures(database_url)
+        process, base_url = start_server(database_url)
+    try:
+        report = asyncio.run(
+            run_workload(base_url, args.players, args.duration, args.think_scale, args.ramp_up, args.seed)
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print(render(report))
+    if not any(row["avg_statements"] for row in report["endpoints"].values()):
+        print("(no X-DB-Statements headers: start the server with APP_DEBUG=1 to record statement counts)")
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"baseline saved to {args.save_baseline}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        print(f"compared with {args.compare} (commit {baseline.get('commit')}):")
+        changed = {
+            key: (value, report["config"].get(key))
+            for key, value in baseline.get("config", {}).items()
+            if key != "base_url" and report["config"].get(key) != value
+        }
+        if changed:
+            print(f"  warning: workload differs from the baseline {changed}; the numbers are not comparable")
+        print("\n".join(f"  REGRESSION {line}" for line in regressions) or "  no regressions")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
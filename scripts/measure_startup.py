@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(url: str, token: str | None) -> tuple[int, float]:
+    request = urllib.request.Request(url)
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    return status, time.perf_counter() - started
+
+
+def measure(warmup: bool, path: str, token: str | None, timeout: float) -> dict:
+    port = _free_port()
+    env = {**os.environ, "APP_WARMUP": "1" if warmup else "0"}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=PROJECT_ROOT,
+        env=env,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"/health did not answer within {timeout:.0f}s")
+            try:
+                if _request(f"{base}/health", None)[0] == 200:
+                    break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.05)
+        healthy = time.perf_counter() - started
+        first_status, first = _request(f"{base}{path}", token)
+        second_status, second = _request(f"{base}{path}", token)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {
+        "healthy": healthy,
+        "first": first,
+        "second": second,
+        "statuses": (first_status, second_status),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Час старту воркера та латентність перших запитів з прогрівом і без нього")
+    parser.add_argument("--path", default="/health", help="Ендпоінт для першого та другого запиту, напр. /shop/offers")
+    parser.add_argument("--token", help="JWT для ендпоінтів, що потребують авторизації")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    print(f"{'warm-up':<9}{'run':>4}{'healthy ms':>12}{'1st ms':>10}{'2nd ms':>10}  status")
+    for warmup in (False, True):
+        for run in range(1, args.runs + 1):
+            result = measure(warmup, args.path, args.token, args.timeout)
+            print(
+                f"{'on' if warmup else 'off':<9}{run:>4}{result['healthy'] * 1000:>12.0f}"
+                f"{result['first'] * 1000:>10.1f}{result['second'] * 1000:>10.1f}  {result['statuses']}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
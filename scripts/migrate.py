@@ -1,12 +1,33 @@
 from __future__ import annotations
 
+from sqlalchemy import Engine, inspect
+
 from app.db import models  # noqa: F401  # ensure models are registered
 from app.db.base import Base, engine
+from app.startup import alembic_config, alembic_script
+
+
+def migrate(bind: Engine = engine) -> None:
+    """Bring the database to the Alembic head.
+
+    The Alembic chain cannot run on SQLite, so SQLite dev databases (and empty databases
+    elsewhere) are built from the models and stamped as head, which lets ``DB_SCHEMA_MODE=check``
+    accept them. Any other existing database is upgraded through the migrations: ``create_all``
+    would skip its tables and the stamp would hide the missing revisions.
+    """
+    from alembic import command
+    from alembic.runtime.migration import MigrationContext
 
+    if bind.dialect.name == "sqlite" or not inspect(bind).get_table_names():
+        Base.metadata.create_all(bind=bind)
+        with bind.begin() as connection:
+            MigrationContext.configure(connection).stamp(alembic_script(), "head")
+        return
 
-def migrate() -> None:
-    """Create database tables based on SQLAlchemy metadata."""
-    Base.metadata.create_all(bind=engine)
+    config = alembic_config()
+    with bind.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
 
 
 if __name__ == "__main__":
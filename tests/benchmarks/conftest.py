@@ -0,0 +1,184 @@
+"""Seeded in-memory databases for the hot-path benchmarks.
+
+The suite only runs with ``RUN_BENCHMARKS=1`` (``make bench``), so a plain ``pytest`` stays fast.
+``BENCH_SCALE`` multiplies every dataset size and ``BENCH_SEED`` fixes the generated rows, so two
+commits are always measured against identical databases.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.constants.onboarding import ONBOARDING_NODE_INTRO, ONBOARDING_QUEST_ID
+from app.db import models  # noqa: F401
+from app.db.base import Base
+from app.db.models.inventory import InventoryItem, InventoryItemCatalog
+from app.db.models.player import Player
+from app.db.models.quest import QuestProgress
+from app.db.models.shop import ShopOffer
+from app.services.farm_service import FarmService
+from app.services.onboarding_service import OnboardingService
+from app.services.quest_content_service import QuestContentService
+from app.utils.exceptions import GameLogicError
+
+BENCH_SCALE = float(os.getenv("BENCH_SCALE", "1"))
+BENCH_SEED = int(os.getenv("BENCH_SEED", "20240601"))
+INVENTORY_SIZES = (1_000, 10_000)
+
+_SLOTS = ("head", "chest", "cloak", "weapon", "ring", "misc")
+_RARITIES = ("common", "rare", "epic", "seasonal")
+
+
+def scaled(size: int) -> int:
+    return max(1, int(size * BENCH_SCALE))
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    if os.getenv("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmarks run with RUN_BENCHMARKS=1 (make bench)")
+    for item in items:
+        if "benchmarks" in item.path.parts:
+            item.add_marker(skip)
+
+
+@dataclass
+class BenchDatabase:
+    factory: sessionmaker[Session]
+    player_ids: List[int]
+    # inventory size -> id of the player holding that many items
+    inventory_owners: Dict[int, int]
+
+
+@dataclass
+class AsyncBenchDatabase:
+    factory: async_sessionmaker[AsyncSession]
+    loop: asyncio.AbstractEventLoop
+
+    def run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+
+def _seed_catalog(session: Session, rng: random.Random, now: datetime) -> List[int]:
+    catalog = [
+        InventoryItemCatalog(
+            name=f"Предмет {index}",
+            slot=rng.choice(_SLOTS),
+            rarity=rng.choice(_RARITIES),
+            cosmetic=rng.random() < 0.3,
+        )
+        for index in range(scaled(200))
+    ]
+    session.add_all(catalog)
+    session.flush()
+    session.add_all(
+        ShopOffer(
+            catalog_item_id=rng.choice(catalog).id,
+            price_gold=rng.randint(10, 500),
+            expires_at=now + timedelta(hours=rng.randint(1, 48)) if rng.random() < 0.5 else None,
+            is_limited=rng.random() < 0.2,
+            stock_remaining=rng.randint(1, 20),
+        )
+        for _ in range(scaled(40))
+    )
+    return [item.id for item in catalog]
+
+
+def _seed_players(session: Session, rng: random.Random, now: datetime) -> List[int]:
+    player_ids = [10_000 + index for index in range(scaled(50))]
+    session.add_all(
+        Player(id=player_id, username=f"Bench {player_id}", level=rng.randint(1, 30), gold=rng.randint(0, 5000))
+        for player_id in player_ids
+    )
+    session.add_all(
+        QuestProgress(player_id=player_id, quest_id=ONBOARDING_QUEST_ID, current_node_id=ONBOARDING_NODE_INTRO)
+        for player_id in player_ids
+    )
+    session.flush()
+
+    farm = FarmService(session)
+    for player_id in player_ids:
+        state = farm.get_farm_state(player_id, now)
+        for plot in state.plots:
+            if not plot.unlocked or rng.random() < 0.3:
+                continue
+            try:
+                farm.plant_crop(player_id, plot.id, state.plants[0].id, now - timedelta(seconds=rng.randint(0, 3600)))
+            except GameLogicError:
+                break  # out of energy or gold: the rest of the farm stays empty
+    return player_ids
+
+
+def _seed_inventory(session: Session, rng: random.Random, owner_id: int, catalog_ids: List[int], size: int) -> None:
+    session.execute(
+        InventoryItem.__table__.insert(),
+        [
+            {
+                "owner_id": owner_id,
+                "catalog_item_id": rng.choice(catalog_ids),
+                "slot": rng.choice(_SLOTS),
+                "is_equipped": index < len(_SLOTS),
+                "quantity": rng.randint(1, 5),
+            }
+            for index in range(size)
+        ],
+    )
+
+
+@pytest.fixture(scope="module")
+def bench_db() -> Iterator[BenchDatabase]:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    rng = random.Random(BENCH_SEED)
+    now = datetime.now(timezone.utc)
+    with factory() as session:
+        OnboardingService(session).ensure_onboarding_content()
+        QuestContentService(session).ensure_fallen_crown_saga()
+        catalog_ids = _seed_catalog(session, rng, now)
+        player_ids = _seed_players(session, rng, now)
+        inventory_owners = {}
+        for owner_id, size in zip(player_ids, INVENTORY_SIZES):
+            _seed_inventory(session, rng, owner_id, catalog_ids, scaled(size))
+            inventory_owners[size] = owner_id
+        session.commit()
+
+    try:
+        yield BenchDatabase(factory=factory, player_ids=player_ids, inventory_owners=inventory_owners)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def async_bench_db(bench_db: BenchDatabase) -> Iterator[AsyncBenchDatabase]:
+    """The same rows behind an aiosqlite engine, for the async services."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def copy_rows() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            with bench_db.factory() as source:
+                for table in Base.metadata.sorted_tables:
+                    rows = [dict(row._mapping) for row in source.execute(select(table))]
+                    if rows:
+                        await connection.execute(table.insert(), rows)
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(copy_rows())
+    try:
+        yield AsyncBenchDatabase(factory=async_sessionmaker(bind=engine, expire_on_commit=False), loop=loop)
+    finally:
+        loop.run_until_complete(engine.dispose())
+        loop.close()
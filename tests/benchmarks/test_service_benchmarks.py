@@ -0,0 +1,148 @@
+"""Microbenchmarks for the service calls behind the hottest endpoints.
+
+Every round runs in a fresh session that is rolled back afterwards, so rounds never see each
+other's writes and the seeded database stays identical for the whole module.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.constants.onboarding import ONBOARDING_CHOICE_INTRO_NEXT, ONBOARDING_NODE_INTRO
+from app.db.models.player import Player
+from app.services.farm_service import FarmService
+from app.services.inventory_service import build_inventory_public
+from app.services.progression_service import ProgressionService
+from app.services.quest_engine import QuestEngine
+from app.services.shop_service import list_shop_offers
+from app.utils.security import hash_password
+
+from .conftest import INVENTORY_SIZES, BenchDatabase, scaled
+
+pytest.importorskip("pytest_benchmark")
+
+ROUNDS = 50
+
+
+@contextmanager
+def _rolled_back(bench_db: BenchDatabase) -> Iterator[Session]:
+    session = bench_db.factory()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture()
+def run_in_session(bench_db: BenchDatabase) -> Iterator:
+    """Benchmark ``call(session)`` in a fresh session per round.
+
+    The previous round's session is rolled back in the (untimed) setup; the last one stays open
+    until teardown so the test can still inspect the returned objects.
+    """
+    sessions: List[Session] = []
+
+    def setup():
+        if sessions:
+            sessions[-1].rollback()
+            sessions[-1].close()
+        sessions.append(bench_db.factory())
+        return (sessions[-1],), {}
+
+    def run(benchmark, call, rounds: int = ROUNDS):
+        return benchmark.pedantic(call, setup=setup, rounds=rounds, iterations=1)
+
+    yield run
+    if sessions:
+        sessions[-1].rollback()
+        sessions[-1].close()
+
+
+def test_get_farm_state(benchmark, bench_db: BenchDatabase, run_in_session) -> None:
+    player_id = bench_db.player_ids[-1]
+    now = datetime.now(timezone.utc)
+
+    state = run_in_session(benchmark, lambda session: FarmService(session).get_farm_state(player_id, now))
+    assert state.player.id == player_id
+
+
+def test_build_public_state(benchmark, bench_db: BenchDatabase) -> None:
+    with _rolled_back(bench_db) as session:
+        service = FarmService(session)
+        state = service.get_farm_state(bench_db.player_ids[-1])
+        public = benchmark(service.build_public_state, state)
+    assert public["plots"]
+
+
+def test_quest_apply_choice(benchmark, bench_db: BenchDatabase, run_in_session) -> None:
+    player_id = bench_db.player_ids[-1]
+
+    # every player starts on the onboarding intro and each round is rolled back, so the choice stays valid
+    node, rewards = run_in_session(
+        benchmark, lambda session: QuestEngine(session).apply_choice(player_id, ONBOARDING_CHOICE_INTRO_NEXT)
+    )
+    assert node.node_id != ONBOARDING_NODE_INTRO and rewards.xp_gained >= 0
+
+
+def test_quest_content_sync_full_saga(benchmark, run_in_session) -> None:
+    from app.content.fallen_crown import fallen_crown_blueprint
+    from app.services.quest_content_builder import QuestContentBuilder
+
+    specs = fallen_crown_blueprint()
+
+    def sync(session: Session) -> int:
+        builder = QuestContentBuilder(session)
+        for spec in specs:
+            builder.sync_quest(spec)
+        session.flush()
+        return len(specs)
+
+    assert run_in_session(benchmark, sync, rounds=10) == len(specs)
+
+
+def test_give_xp_large_grant(benchmark, bench_db: BenchDatabase, run_in_session) -> None:
+    player_id = bench_db.player_ids[-1]
+
+    def give_xp(session: Session):
+        player = session.get(Player, player_id)
+        player.level, player.xp = 1, 0
+        return ProgressionService(session).give_xp(player, 5_000_000)
+
+    result = run_in_session(benchmark, give_xp)
+    assert result.levels_gained > 10
+
+
+@pytest.mark.parametrize("size", INVENTORY_SIZES)
+def test_build_inventory_public(benchmark, async_bench_db, bench_db: BenchDatabase, size: int) -> None:
+    owner_id = bench_db.inventory_owners[size]
+
+    async def build():
+        async with async_bench_db.factory() as session:
+            return await build_inventory_public(session, owner_id)
+
+    inventory = benchmark.pedantic(async_bench_db.run, setup=lambda: ((build(),), {}), rounds=20, iterations=1)
+    assert len(inventory["items"]) == scaled(size)
+
+
+def test_list_shop_offers(benchmark, async_bench_db, bench_db: BenchDatabase) -> None:
+    player_id = bench_db.player_ids[-1]
+
+    async def list_offers():
+        async with async_bench_db.factory() as session:
+            return await list_shop_offers(session, player_id)
+
+    # steady state: the offer window is cached, the per-player ownership query is not
+    async_bench_db.run(list_offers())
+    _, offers = benchmark.pedantic(async_bench_db.run, setup=lambda: ((list_offers(),), {}), rounds=ROUNDS, iterations=1)
+    assert offers
+
+
+def test_hash_password(benchmark) -> None:
+    digest = benchmark.pedantic(hash_password, args=("correct horse battery staple", b"0123456789abcdef"), rounds=10)
+    assert len(digest) == 32
@@ -19,6 +19,8 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
 os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+# fixtures create and drop the tables themselves
+os.environ.setdefault("DB_SCHEMA_MODE", "off")
 
 from types import SimpleNamespace
 
@@ -30,6 +32,67 @@ from app.auth.dependencies import (
     require_admin,
     require_player_access,
 )
+from app.db.query_stats import route_query_stats
+from app.services.leaderboard_service import leaderboards
+from app.services.plant_catalog_cache import plant_catalog_cache
+from app.services.quest_content_service import quest_content_cache
+from app.services.shop_offer_cache import shop_offer_cache
+from app.services.shop_service import offer_purchase_queue
+from app.utils.metrics import REGISTRY
+from app.utils.profiler import sampling_profiler
+
+
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    # every test gets a fresh database, so nothing cached in-process may leak between them
+    shop_offer_cache.invalidate()
+    plant_catalog_cache.invalidate()
+    quest_content_cache.reset()
+    offer_purchase_queue.reset()
+    route_query_stats.reset()
+    REGISTRY.reset()
+    sampling_profiler.reset()
+    leaderboards.reset()
+    yield
+    shop_offer_cache.invalidate()
+    plant_catalog_cache.invalidate()
+    quest_content_cache.reset()
+    offer_purchase_queue.reset()
+    route_query_stats.reset()
+    REGISTRY.reset()
+    sampling_profiler.reset()
+    leaderboards.reset()
+
+
+def pytest_configure(config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "query_budget(statements, route=None): fail when a request to `route` (\"GET /farm/{player_id}\", "
+        "every route by default) issues more SQL statements",
+    )
+
+
+def query_budget_violations(statements: int, route: str | None = None) -> list[str]:
+    violations = []
+    for (method, template), totals in route_query_stats.snapshot().items():
+        if route is not None and f"{method} {template}" != route:
+            continue
+        if totals.max_statements > statements:
+            violations.append(
+                f"{method} {template}: {totals.max_statements} statements (budget {statements}); "
+                f"slowest: {totals.slowest_statement}"
+            )
+    return violations
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    result = yield
+    for marker in item.iter_markers("query_budget"):
+        violations = query_budget_violations(*marker.args, **marker.kwargs)
+        if violations:
+            pytest.fail("Query budget exceeded:\n" + "\n".join(violations), pytrace=False)
+    return result
 
 
 @pytest.fixture()
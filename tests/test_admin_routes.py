@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.db.models.farm import PlantType
+from app.db.models.inventory import InventoryItemCatalog
+
+
+def _walk_pages(client: TestClient, path: str, **params) -> list[list[dict]]:
+    pages, after = [], None
+    while True:
+        query = dict(params, **({"after": after} if after is not None else {}))
+        page = client.get(path, params=query).json()
+        pages.append(page["items"])
+        after = page["next_after"]
+        if after is None:
+            return pages
+
+
+def test_catalog_pages_walk_every_row_once(client: TestClient, session_factory) -> None:
+    with session_factory() as session:
+        session.add_all(InventoryItemCatalog(name=f"Item {index}", slot="head", description="довгий опис") for index in range(5))
+        session.add_all(PlantType(name=f"Plant {index}", description="довгий опис") for index in range(3))
+        session.commit()
+
+    pages = _walk_pages(client, "/admin/equipment/page", limit=2)
+    assert [len(page) for page in pages] == [2, 2, 1]
+    items = [item for page in pages for item in page]
+    assert [item["name"] for item in items] == [f"Item {index}" for index in range(5)]
+    assert "description" not in items[0]
+
+    pages = _walk_pages(client, "/admin/plants/page", limit=3)
+    assert [len(page) for page in pages] == [3]
+    assert client.get("/admin/plants/page", params={"limit": 500}).status_code == 422
+
+
+def test_quest_summaries_with_nodes_on_demand(client: TestClient) -> None:
+    summaries = client.get("/admin/quests/page").json()["items"]
+    assert summaries, "the Fallen Crown saga is seeded on first admin access"
+    saga = summaries[0]
+    assert saga["node_count"] > 1 and saga["choice_count"] >= saga["node_count"] - 1
+    assert "nodes" not in saga and "description" not in saga
+
+    full = client.get(f"/admin/quests/{saga['id']}").json()
+    assert len(full["nodes"]) == saga["node_count"]
+    assert sum(len(node["choices"]) for node in full["nodes"]) == saga["choice_count"]
+    assert any(node["id"] == saga["start_node_id"] and node["is_start"] for node in full["nodes"])
+
+    node_pages = _walk_pages(client, f"/admin/quests/{saga['id']}/nodes", limit=3)
+    nodes = [node for page in node_pages for node in page]
+    assert len(nodes) == saga["node_count"] and len({node["id"] for node in nodes}) == len(nodes)
+    assert "body" not in nodes[0]
+
+    node = client.get(f"/admin/quests/{saga['id']}/nodes/{nodes[0]['id']}").json()
+    assert node["body"] and len(node["choices"]) == nodes[0]["choice_count"]
+
+    assert client.get("/admin/quests/999999").status_code == 404
+    assert client.get(f"/admin/quests/{saga['id']}/nodes/missing").status_code == 404
+
+
+def test_node_pages_use_the_quest_index(sync_engine) -> None:
+    with sync_engine.connect() as connection:
+        plan = connection.execute(
+            text("EXPLAIN QUERY PLAN SELECT id FROM quest_nodes WHERE quest_id = 1 AND id > 'a' ORDER BY id LIMIT 10")
+        ).all()
+    assert any("ix_quest_nodes_quest_id_id" in row[-1] for row in plan)
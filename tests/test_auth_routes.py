@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from app.auth.dependencies import get_current_user
+
+
+def test_register_creates_player_and_token_that_authenticates(client: TestClient, session_factory) -> None:
+    response = client.post(
+        "/auth/register",
+        json={"login": "NewHero", "password": "secret123", "hero_name": "Новий герой"},
+    )
+    assert response.status_code == 201
+    body = response.json()
+    assert body["user"]["login"] == "newhero"
+    assert body["player"]["player_id"] == body["user"]["player_id"]
+
+    # SQLite returns the stored expiry as a naive datetime
+    with session_factory() as session:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=body["access_token"])
+        user = get_current_user(credentials, session)
+    assert user.player_id == body["user"]["player_id"]
+
+    duplicate = client.post("/auth/register", json={"login": "newhero", "password": "secret123", "hero_name": "X"})
+    assert duplicate.status_code == 400
@@ -2,10 +2,18 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select, text
+from sqlalchemy.orm import joinedload
 
-from app.db.models.farm import FarmPlot, PlayerFarmingStats
+from app.db.models.farm import FarmPlot, PlantType, PlantedCrop, PlayerFarmingStats
 from app.db.models.player import Player
+from app.services.crop_scheduler import CropReadyEvent, CropReadyScheduler
+from app.services.farm_rules import DEFAULT_PLANTS
+from app.services.farm_service import FarmService
+from app.services.plant_catalog_cache import plant_catalog_cache
+from app.utils.exceptions import InsufficientFunds
 
 
 def _create_player(session_factory, player_id: int = 707) -> int:
@@ -105,3 +113,334 @@ def test_energy_passive_regeneration(client: TestClient, session_factory) -> Non
     assert payload["stats"]["energy"] == expected_regen
     assert payload["wallet_gold"] == 2000
     assert payload["stats"]["starter_seed_charges"] == 1
+
+
+def test_plant_retry_with_idempotency_key_is_not_reexecuted(client: TestClient, session_factory) -> None:
+    player_id = _create_player(session_factory, player_id=903)
+
+    state = client.get(f"/farm/{player_id}").json()
+    plot_id = next(plot["id"] for plot in state["plots"] if plot["unlocked"])
+    plant_id = state["available_plants"][0]["id"]
+
+    body = {"plot_id": plot_id, "plant_type_id": plant_id}
+    headers = {"Idempotency-Key": "plant-903-1"}
+    first = client.post(f"/farm/{player_id}/plant", json=body, headers=headers)
+    retry = client.post(f"/farm/{player_id}/plant", json=body, headers=headers)
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert retry.json() == first.json()
+
+    # without the key the same request hits the occupied plot
+    duplicate = client.post(f"/farm/{player_id}/plant", json=body)
+    assert duplicate.status_code == 400
+
+
+def test_crop_ready_scheduler_flips_due_crops_and_notifies(client: TestClient, session_factory) -> None:
+    player_id = _create_player(session_factory, player_id=904)
+    state = client.get(f"/farm/{player_id}").json()
+    plot_ids = [plot["id"] for plot in state["plots"] if plot["unlocked"]][:2]
+    plant_id = state["available_plants"][0]["id"]
+    for plot_id in plot_ids:
+        assert client.post(f"/farm/{player_id}/plant", json={"plot_id": plot_id, "plant_type_id": plant_id}).status_code == 200
+
+    session = session_factory()
+    due_crop = session.get(FarmPlot, plot_ids[0]).crop
+    due_crop.ready_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    due_crop_id = due_crop.id
+    session.commit()
+    session.close()
+
+    # reads already report the crop as ready before the scheduler stores it
+    listed = client.get(f"/farm/{player_id}").json()
+    assert next(plot for plot in listed["plots"] if plot["id"] == plot_ids[0])["crop"]["state"] == "ready"
+
+    received: list[CropReadyEvent] = []
+    scheduler = CropReadyScheduler(session_factory, batch_size=1)
+    scheduler.subscribe(received.extend)
+    events = scheduler.run_once()
+
+    assert [event.crop_id for event in events] == [due_crop_id]
+    assert received == events
+    assert events[0].player_id == player_id
+    assert scheduler.run_once() == []
+
+    session = session_factory()
+    states = {plot_id: session.get(FarmPlot, plot_id).crop.state for plot_id in plot_ids}
+    session.close()
+    assert states == {plot_ids[0]: "ready", plot_ids[1]: "growing"}
+
+
+def test_due_crop_lookup_uses_state_ready_at_index(sync_engine) -> None:
+    due_ids = select(PlantedCrop.id).where(
+        PlantedCrop.state == "growing",
+        PlantedCrop.ready_at <= datetime(2030, 1, 1, tzinfo=timezone.utc),
+    )
+    compiled = due_ids.compile(sync_engine, compile_kwargs={"literal_binds": True})
+    with sync_engine.connect() as connection:
+        plan = "\n".join(str(row[-1]) for row in connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+
+    assert "ix_farm_planted_crops_state_ready_at" in plan
+
+
+def test_plant_batch_and_harvest_all(client: TestClient, session_factory, sync_engine) -> None:
+    player_id = _create_player(session_factory, player_id=905)
+    state = client.get(f"/farm/{player_id}").json()
+    unlocked_ids = [plot["id"] for plot in state["plots"] if plot["unlocked"]]
+    locked_id = next(plot["id"] for plot in state["plots"] if not plot["unlocked"])
+    plant = state["available_plants"][0]
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    plantings = [{"plot_id": plot_id, "plant_type_id": plant["id"]} for plot_id in [*unlocked_ids, locked_id]]
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        response = client.post(f"/farm/{player_id}/plant-batch", json={"plantings": plantings})
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 200
+    payload = response.json()
+    statuses = {result["plot_id"]: result["status"] for result in payload["results"]}
+    assert statuses == {**{plot_id: "planted" for plot_id in unlocked_ids}, locked_id: "skipped"}
+    assert payload["state"]["stats"]["energy"] == state["stats"]["energy"] - plant["energy_cost"] * len(unlocked_ids)
+    planted_plots = [plot for plot in payload["state"]["plots"] if plot["crop"] is not None]
+    assert sorted(plot["id"] for plot in planted_plots) == sorted(unlocked_ids)
+    assert sum(statement.startswith("INSERT INTO farm_planted_crops") for statement in statements) == 1
+
+    session = session_factory()
+    for plot_id in unlocked_ids[:2]:
+        session.get(FarmPlot, plot_id).crop.ready_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    session.commit()
+    session.close()
+
+    harvest = client.post(f"/farm/{player_id}/harvest-all")
+    assert harvest.status_code == 200
+    harvest_payload = harvest.json()
+    harvested = [result["plot_id"] for result in harvest_payload["results"] if result["status"] == "harvested"]
+    assert sorted(harvested) == sorted(unlocked_ids[:2])
+    assert harvest_payload["state"]["wallet_gold"] == 2000 + 2 * plant["sell_price"]
+    remaining = [plot["id"] for plot in harvest_payload["state"]["plots"] if plot["crop"] is not None]
+    assert remaining == [unlocked_ids[2]]
+
+    session = session_factory()
+    assert session.query(PlantedCrop).count() == 1
+    session.close()
+
+
+def test_plant_batch_asks_only_for_gold_the_starter_charges_do_not_cover(session_factory) -> None:
+    player_id = _create_player(session_factory, player_id=909)
+    with session_factory() as session:
+        service = FarmService(session)
+        state = service.get_farm_state(player_id)
+        pricey = PlantType(name="Дорогий шафран", growth_seconds=60, energy_cost=1, seed_cost=40, sell_price=90)
+        session.add(pricey)
+        state.wallet.gold = 30
+        state.stats.starter_seed_charges = 1
+        session.commit()
+        plot_ids = [plot.id for plot in state.plots if plot.unlocked]
+        pricey_id = pricey.id
+
+    with session_factory() as session:
+        # one of the three seeds rides on the starter charge; the other two need 80 gold
+        with pytest.raises(InsufficientFunds) as excinfo:
+            FarmService(session).plant_batch(player_id, [(plot_id, pricey_id) for plot_id in plot_ids])
+    assert (excinfo.value.available, excinfo.value.required) == (30, 80)
+
+
+def test_compact_view_returns_only_changed_plots(client: TestClient, session_factory) -> None:
+    player_id = _create_player(session_factory, player_id=906)
+    state = client.get(f"/farm/{player_id}").json()
+    plot_id = next(plot["id"] for plot in state["plots"] if plot["unlocked"])
+    plant_id = state["available_plants"][0]["id"]
+
+    response = client.post(
+        f"/farm/{player_id}/plant",
+        params={"view": "compact"},
+        json={"plot_id": plot_id, "plant_type_id": plant_id},
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert "state" not in payload
+    changes = payload["changes"]
+    assert [plot["id"] for plot in changes["plots"]] == [plot_id]
+    assert changes["plots"][0]["crop"]["plant_type_id"] == plant_id
+    assert changes["wallet_gold"] == state["wallet_gold"]
+    assert len(response.content) < len(client.get(f"/farm/{player_id}").content) / 3
+
+    refill = client.post(f"/farm/{player_id}/energy/refill", params={"view": "compact"}, json={"amount": 0})
+    assert refill.json()["changes"]["plots"] == []
+
+
+def test_idempotency_key_is_bound_to_the_response_view(client: TestClient, session_factory) -> None:
+    player_id = _create_player(session_factory, player_id=907)
+    headers = {"Idempotency-Key": "refill-compact-1"}
+
+    first = client.post(f"/farm/{player_id}/energy/refill", params={"view": "compact"}, json={"amount": 0}, headers=headers)
+    retry = client.post(f"/farm/{player_id}/energy/refill", params={"view": "compact"}, json={"amount": 0}, headers=headers)
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+    assert first.json()["changes"]["stats"] == client.get(f"/farm/{player_id}").json()["stats"]
+
+    # a stored compact body must never be replayed as the full state
+    full = client.post(f"/farm/{player_id}/energy/refill", json={"amount": 0}, headers=headers)
+    assert full.status_code == 422
+
+
+def test_plant_catalog_is_cacheable(client: TestClient, session_factory) -> None:
+    response = client.get("/farm/catalog")
+    assert response.status_code == 200
+    assert response.json()["plants"]
+    assert "max-age" in response.headers["Cache-Control"]
+
+    cached = client.get("/farm/catalog", headers={"If-None-Match": response.headers["ETag"]})
+    assert cached.status_code == 304
+
+
+def test_locked_plots_are_virtual_until_unlocked(client: TestClient, session_factory) -> None:
+    player_id = _create_player(session_factory, player_id=908)
+    state = client.get(f"/farm/{player_id}").json()
+    locked = [plot for plot in state["plots"] if not plot["unlocked"]]
+    assert [plot["id"] for plot in locked] == [-4, -5, -6, -7, -8]
+    assert locked[0]["unlock_cost"] == 650
+    assert locked[0]["unlock_farming_level_requirement"] == 3
+
+    session = session_factory()
+    assert session.query(FarmPlot).filter(FarmPlot.player_id == player_id).count() == 3
+    session.get(PlayerFarmingStats, player_id).level = 3
+    session.commit()
+    session.close()
+
+    unlocked = client.post(f"/farm/{player_id}/plots/-4/unlock")
+    assert unlocked.status_code == 200
+    slot_four = next(plot for plot in unlocked.json()["state"]["plots"] if plot["slot_index"] == 4)
+    assert slot_four["unlocked"] is True and slot_four["id"] > 0
+    assert unlocked.json()["state"]["wallet_gold"] == 2000 - 650
+
+    planted = client.post(
+        f"/farm/{player_id}/plant",
+        json={"plot_id": slot_four["id"], "plant_type_id": state["available_plants"][0]["id"]},
+    )
+    assert planted.status_code == 200
+
+    session = session_factory()
+    assert session.query(FarmPlot).filter(FarmPlot.player_id == player_id).count() == 4
+    session.close()
+
+
+def test_concurrent_unlock_reuses_the_winners_plot_row(client: TestClient, session_factory, monkeypatch) -> None:
+    player_id = _create_player(session_factory, player_id=909)
+    client.get(f"/farm/{player_id}")
+    with session_factory() as session:
+        session.get(PlayerFarmingStats, player_id).level = 3
+        session.commit()
+
+    session = session_factory()
+    try:
+        service = FarmService(session)
+        real_insert = service._insert_plot
+
+        def insert_after_the_other_request(player, slot_index):
+            # the other request unlocks the slot after this one saw it locked
+            with session_factory() as other:
+                FarmService(other).unlock_plot(player_id, -4)
+                other.commit()
+            return real_insert(player, slot_index)
+
+        monkeypatch.setattr(service, "_insert_plot", insert_after_the_other_request)
+        state, message = service.unlock_plot(player_id, -4)
+        session.commit()
+        assert message == "Ділянка вже відкрита."
+        # charged once, by the request that created the row
+        assert state.wallet.gold == 2000 - 650
+    finally:
+        session.close()
+
+    with session_factory() as session:
+        rows = session.query(FarmPlot).filter(FarmPlot.player_id == player_id, FarmPlot.slot_index == 4).all()
+    assert len(rows) == 1
+
+
+def _selects_and_bytes(sync_engine, load) -> tuple[list[str], int]:
+    """Run ``load`` and replay its SELECTs to measure how much data they return."""
+    captured: list[tuple[str, object]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        load()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+    selects = [(statement, parameters) for statement, parameters in captured if statement.lstrip().startswith("SELECT")]
+    with sync_engine.connect() as connection:
+        transferred = sum(
+            len(str(value).encode())
+            for statement, parameters in selects
+            for row in connection.exec_driver_sql(statement, parameters).fetchall()
+            for value in row
+        )
+    return [statement for statement, _ in selects], transferred
+
+
+def test_farm_loader_selects_narrow_rows(session_factory, sync_engine) -> None:
+    player_id = _create_player(session_factory, player_id=909)
+    session = session_factory()
+    service = FarmService(session)
+    state = service.get_farm_state(player_id)
+    service.plant_batch(player_id, [(plot.id, state.plants[0].id) for plot in state.plots if plot.unlocked])
+    session.commit()
+    session.close()
+
+    def legacy_load() -> None:
+        with session_factory() as legacy_session:
+            legacy_session.execute(
+                select(Player)
+                .where(Player.id == player_id)
+                .options(
+                    joinedload(Player.farming_stats),
+                    joinedload(Player.wallet),
+                    joinedload(Player.farm_plots).joinedload(FarmPlot.crop).joinedload(PlantedCrop.plant_type),
+                )
+            ).unique().scalars().first()
+            legacy_session.execute(select(PlantType).order_by(PlantType.id)).scalars().all()
+
+    def farm_state() -> None:
+        with session_factory() as state_session:
+            farm = FarmService(state_session)
+            farm.build_public_state(farm.get_farm_state(player_id))
+
+    _, legacy_bytes = _selects_and_bytes(sync_engine, legacy_load)
+    farm_state()  # the seeding commit above invalidated the catalog cache; warm it again
+    statements, loaded_bytes = _selects_and_bytes(sync_engine, farm_state)
+
+    # player with stats and wallet, then plots, then crops; plants come from the catalog cache
+    assert len(statements) == 3
+    assert not any("FROM farm_plant_catalog" in statement for statement in statements)
+    assert loaded_bytes * 2 < legacy_bytes
+
+
+def test_concurrent_catalog_seeding_reuses_the_winners_rows(session_factory, monkeypatch) -> None:
+    with session_factory() as other:
+        FarmService(other)._ensure_default_plants()
+        other.commit()
+
+    session = session_factory()
+    try:
+        # this request saw an empty catalog just before the other one committed its seed
+        real_attach = plant_catalog_cache.attach
+        calls = []
+        monkeypatch.setattr(
+            plant_catalog_cache,
+            "attach",
+            lambda s: calls.append(s) or ([] if len(calls) == 1 else real_attach(s)),
+        )
+        plants = FarmService(session)._ensure_default_plants()
+        assert len(plants) == len(DEFAULT_PLANTS)
+        assert session.scalar(select(func.count()).select_from(PlantType)) == len(DEFAULT_PLANTS)
+    finally:
+        session.close()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.models.player import Player
+from app.services import farm_rules
+from app.services.farm_service import FarmService
+from app.services.farm_simulation import (
+    STRATEGIES,
+    FarmSimState,
+    checkin,
+    default_plants,
+    simulate_population,
+)
+
+
+def _service_snapshot(state):
+    stats = state.stats
+    crops = []
+    for plot in state.plots:
+        if plot.crop is None:
+            crops.append(None)
+            continue
+        ready_at = plot.crop.ready_at
+        if ready_at.tzinfo is None:
+            ready_at = ready_at.replace(tzinfo=timezone.utc)
+        crops.append((plot.crop.plant_type_id, ready_at))
+    return {
+        "gold": state.wallet.gold,
+        "level": stats.level,
+        "xp": stats.xp,
+        "energy": stats.energy,
+        "max_energy": stats.max_energy,
+        "tool_level": stats.tool_level,
+        "starter_seed_charges": stats.starter_seed_charges,
+        "unlocked_plots": sum(1 for plot in state.plots if plot.unlocked),
+        "crops": crops,
+    }
+
+
+def _sim_snapshot(sim: FarmSimState, started: datetime, plant_ids):
+    return {
+        "gold": sim.gold,
+        "level": sim.level,
+        "xp": sim.xp,
+        "energy": sim.energy,
+        "max_energy": sim.max_energy,
+        "tool_level": sim.tool_level,
+        "starter_seed_charges": sim.starter_seed_charges,
+        "unlocked_plots": sim.unlocked_plots,
+        "crops": [
+            None if index is None else (plant_ids[index], started + timedelta(seconds=sim.plot_ready_at[slot]))
+            for slot, index in enumerate(sim.plot_plants)
+        ],
+    }
+
+
+def test_simulation_matches_farm_service_day(session_factory) -> None:
+    strategy = STRATEGIES["trader"]
+    player_level = 10
+    started = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+    plants = default_plants()
+
+    session = session_factory()
+    session.add(Player(id=3601, username="Simulated", level=player_level, gold=0))
+    session.flush()
+    service = FarmService(session)
+    plant_ids = [plant.id for plant in service.get_farm_state(3601, started).plants]
+    # like the first GET of a real client: later loads see the plots the service just created
+    session.commit()
+    sim = FarmSimState()
+
+    try:
+        for visit in range(48):
+            offset = visit * strategy.checkin_seconds
+            now = started + timedelta(seconds=offset)
+            previous_tool, previous_plots = sim.tool_level, sim.unlocked_plots
+            previous_crops = list(zip(sim.plot_plants, sim.plot_ready_at))
+            checkin(sim, float(offset), strategy, plants, player_level)
+
+            # replay the simulator's decisions through the service in the same order
+            state, _, _ = service.harvest_all(3601, now)
+            for _ in range(sim.tool_level - previous_tool):
+                state, _ = service.upgrade_tool(3601, now)
+            for slot in range(previous_plots, sim.unlocked_plots):
+                state, _ = service.unlock_plot(3601, state.plots[slot].id, now)
+            for slot, crop in enumerate(zip(sim.plot_plants, sim.plot_ready_at)):
+                if crop[0] is not None and crop != previous_crops[slot]:
+                    state, _ = service.plant_crop(3601, state.plots[slot].id, plant_ids[crop[0]], now)
+
+            state = service.get_farm_state(3601, now)
+            assert _service_snapshot(state) == _sim_snapshot(sim, started, plant_ids), f"visit {visit}"
+
+        # the day exercised every rule the simulator models
+        assert sim.level > 1 and sim.tool_level > 1 and sim.unlocked_plots > farm_rules.BASE_PLOTS
+    finally:
+        session.close()
+
+
+def test_regen_catch_up_matches_stepwise_regeneration() -> None:
+    offline_seconds = 3 * 86_400 + 1234
+    energy, refill_at = farm_rules.regen_energy(5, 1000, 0.0, float(offline_seconds))
+
+    stepped_energy, stepped_refill_at = 5, 0.0
+    for moment in range(0, offline_seconds + 1, 60):
+        stepped_energy, stepped_refill_at = farm_rules.regen_energy(
+            stepped_energy, 1000, stepped_refill_at, float(moment)
+        )
+
+    assert energy == stepped_energy == 5 + offline_seconds // farm_rules.FARM_ENERGY_REGEN_SECONDS
+    assert refill_at == stepped_refill_at
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_vectorized_population_matches_scalar(strategy: str) -> None:
+    pytest.importorskip("numpy")
+    scalar = simulate_population(STRATEGIES[strategy], 4, 6, vectorized=False)
+    vectorized = simulate_population(STRATEGIES[strategy], 4, 6, vectorized=True)
+
+    assert vectorized.vectorized and not scalar.vectorized
+    assert vectorized.mean_gold == scalar.mean_gold
+    assert vectorized.mean_xp_earned == scalar.mean_xp_earned
+    assert vectorized.mean_level == scalar.mean_level
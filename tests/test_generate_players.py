@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models.player import Player
+from app.services.farm_service import FarmService
+from app.services.plant_catalog_cache import plant_catalog_cache
+from app.services.quest_content_service import quest_content_cache
+from app.services.quest_engine import QuestEngine
+from scripts.generate_players import GeneratorConfig, generate
+
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _generate(path, batch_size: int):
+    # a fresh database per run: the process-wide content caches must not carry over
+    plant_catalog_cache.invalidate()
+    quest_content_cache.reset()
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    totals = generate(engine, GeneratorConfig(players=120, seed=11, now=NOW, batch_size=batch_size))
+    return engine, totals
+
+
+def _dump(engine) -> dict[str, list[tuple]]:
+    with engine.connect() as connection:
+        return {
+            table.name: sorted(tuple(row) for row in connection.execute(select(table)))
+            for table in Base.metadata.sorted_tables
+        }
+
+
+def test_generator_is_deterministic_and_readable_by_services(tmp_path) -> None:
+    first, totals = _generate(tmp_path / "first.db", batch_size=50)
+    second, _ = _generate(tmp_path / "second.db", batch_size=120)
+
+    assert totals["players"] == 120 and totals["inventory_items"] > 0 and totals["session_tokens"] > 0
+    assert _dump(first) == _dump(second)
+
+    with Session(first) as session:
+        levels = session.scalars(select(Player.level)).all()
+        assert len(set(levels)) > 3
+        player_id = session.scalar(select(Player.id).order_by(Player.id.desc()))
+        state = FarmService(session).get_farm_state(player_id, NOW)
+        assert any(plot.unlocked for plot in state.plots)
+        assert QuestEngine(session).get_current_node(player_id).choices
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.db.models.idempotency import IdempotencyKey
+from app.services.idempotency_service import IDEMPOTENCY_KEY_TTL, IdempotencyService
+
+
+def test_reserving_a_key_sweeps_expired_rows(db_session) -> None:
+    service = IdempotencyService(db_session)
+    start = datetime.now(timezone.utc)
+    assert service.begin("farm.plant:1", "old", "hash", now=start) is None
+    service.complete("farm.plant:1", "old", 200, {"ok": True})
+    db_session.commit()
+
+    later = start + IDEMPOTENCY_KEY_TTL + timedelta(hours=1)
+    assert service.begin("farm.plant:1", "new", "hash", now=later) is None
+    db_session.commit()
+
+    keys = db_session.execute(select(IdempotencyKey.key)).scalars().all()
+    assert keys == ["new"]
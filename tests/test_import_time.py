@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# `import app.main` takes ~0.7 s on a dev laptop; the budget leaves room for slow CI runners but
+# catches a heavy module (alembic alone is ~0.2 s) sliding back onto the boot path
+IMPORT_BUDGET_SECONDS = float(os.getenv("APP_IMPORT_BUDGET_SECONDS", "1.5"))
+# loaded on first use, never at worker boot
+LAZY_MODULES = {
+    "alembic",
+    "app.content.fallen_crown",
+    "app.services.quest_content_builder",
+    "app.services.admin_service",
+}
+
+
+def _import_times() -> dict[str, int]:
+    """Cumulative microseconds per module from `python -X importtime -c "import app.main"`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT_DIR,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": ""},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_app_main_stays_within_budget() -> None:
+    # best of three: the first run may still be compiling bytecode
+    runs = [_import_times() for _ in range(3)]
+
+    assert LAZY_MODULES.isdisjoint(runs[-1])
+    best = min(run["app.main"] for run in runs) / 1_000_000
+    assert best < IMPORT_BUDGET_SECONDS, f"import app.main took {best:.2f}s (budget {IMPORT_BUDGET_SECONDS}s)"
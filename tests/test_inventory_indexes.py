@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+from app.db.base import Base
+from app.db.models.inventory import InventoryItem
+from app.services.inventory_service import INVENTORY_FIELDS, _inventory_statement, build_equip_statement
+
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+def _owned_ids_stmt():
+    return select(InventoryItem.catalog_item_id).where(InventoryItem.owner_id == 1)
+
+
+def _owned_offer_item_stmt():
+    return select(InventoryItem).where(InventoryItem.owner_id == 1, InventoryItem.catalog_item_id == 5)
+
+
+def _equip_stmt():
+    return build_equip_statement(player_id=1, item_id=3)
+
+
+def _equipped_stmt():
+    return select(InventoryItem.id).where(InventoryItem.owner_id == 1, InventoryItem.is_equipped.is_(True))
+
+
+def _page_stmt():
+    return _inventory_statement(1, INVENTORY_FIELDS).where(InventoryItem.id > 10).order_by(InventoryItem.id).limit(51)
+
+
+def _explain(connection, stmt, prefix: str) -> str:
+    compiled = stmt.compile(connection, compile_kwargs={"literal_binds": True})
+    rows = connection.execute(text(f"{prefix} {compiled}")).all()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+@pytest.mark.parametrize(
+    ("stmt_factory", "index_name"),
+    [
+        (_owned_ids_stmt, "ix_inventory_items_owner_id_catalog_item_id"),
+        (_owned_offer_item_stmt, "ix_inventory_items_owner_id_catalog_item_id"),
+        (_equip_stmt, "ix_inventory_items_owner_id_slot"),
+        (_equipped_stmt, "ix_inventory_items_owner_id_is_equipped"),
+        (_page_stmt, "ix_inventory_items_owner_id_id"),
+    ],
+)
+def test_sqlite_inventory_queries_use_owner_indexes(sync_engine, stmt_factory, index_name):
+    with sync_engine.connect() as connection:
+        plan = _explain(connection, stmt_factory(), "EXPLAIN QUERY PLAN")
+
+    assert "SCAN inventory_items" not in plan
+    assert index_name in plan
+
+
+@pytest.mark.skipif(POSTGRES_URL is None, reason="TEST_POSTGRES_URL is not configured")
+@pytest.mark.parametrize(
+    ("stmt_factory", "index_name"),
+    [
+        (_owned_ids_stmt, "ix_inventory_items_owner_id_catalog_item_id"),
+        (_equip_stmt, "ix_inventory_items_owner_id_slot"),
+        (_equipped_stmt, "ix_inventory_items_owner_id_is_equipped"),
+        (_page_stmt, "ix_inventory_items_owner_id_id"),
+    ],
+)
+def test_postgres_inventory_queries_use_owner_indexes(stmt_factory, index_name):
+    engine = create_engine(POSTGRES_URL, future=True)
+    try:
+        with engine.connect() as connection, connection.begin() as transaction:
+            # throwaway schema inside a rolled-back transaction: the target database is never touched
+            schema = f"explain_{uuid.uuid4().hex}"
+            connection.execute(text(f'CREATE SCHEMA "{schema}"'))
+            connection.execute(text(f'SET LOCAL search_path TO "{schema}"'))
+            Base.metadata.create_all(connection)
+            # tiny tables always favour a seq scan, so force the planner to consider the indexes
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+            plan = _explain(connection, stmt_factory(), "EXPLAIN")
+            transaction.rollback()
+    finally:
+        engine.dispose()
+
+    assert "Seq Scan on inventory_items" not in plan
+    assert index_name in plan
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
 
 from app.db.models.inventory import InventoryItem, InventoryItemCatalog
 from app.db.models.player import Player
+from app.db.session import ASYNC_ENGINE
+from app.services.inventory_service import InventoryService
 
 
 def _seed_player_with_inventory(session) -> tuple[Player, list[InventoryItem]]:
@@ -38,9 +43,9 @@ def _seed_player_with_inventory(session) -> tuple[Player, list[InventoryItem]]:
     session.flush()
 
     items = [
-        InventoryItem(owner_id=player.id, catalog_item_id=cloak.id, is_equipped=True),
-        InventoryItem(owner_id=player.id, catalog_item_id=headpiece.id, is_equipped=False),
-        InventoryItem(owner_id=player.id, catalog_item_id=other_cloak.id, is_equipped=False),
+        InventoryItem(owner_id=player.id, catalog_item_id=cloak.id, slot=cloak.slot, is_equipped=True),
+        InventoryItem(owner_id=player.id, catalog_item_id=headpiece.id, slot=headpiece.slot, is_equipped=False),
+        InventoryItem(owner_id=player.id, catalog_item_id=other_cloak.id, slot=other_cloak.slot, is_equipped=False),
     ]
     session.add_all(items)
     session.commit()
@@ -107,3 +112,164 @@ def test_unequip_inventory_item_moves_to_bag(client: TestClient, session_factory
 
     equipped_items = [item for item in payload["inventory"] if item["slot"] == "cloak" and item["is_equipped"]]
     assert len(equipped_items) == 0
+
+
+def test_equip_inventory_item_issues_single_update(client: TestClient, session_factory):
+    session = session_factory()
+    player, items = _seed_player_with_inventory(session)
+    item_ids = [item.id for item in items]
+    target_item_id = item_ids[2]
+    player_id = player.id
+    session.close()
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().split(None, 1)[0].upper())
+
+    event.listen(ASYNC_ENGINE.sync_engine, "before_cursor_execute", _record)
+    try:
+        response = client.post(
+            f"/player/{player_id}/inventory/equip",
+            json={"item_id": target_item_id},
+        )
+    finally:
+        event.remove(ASYNC_ENGINE.sync_engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 200
+    assert statements.count("UPDATE") == 1
+    assert statements == ["UPDATE", "SELECT"]
+
+    flags = {item["id"]: item["is_equipped"] for item in response.json()["inventory"]}
+    assert flags == {item_ids[0]: False, item_ids[1]: False, target_item_id: True}
+
+
+def test_equip_unknown_item_returns_404(client: TestClient, session_factory):
+    session = session_factory()
+    player, _items = _seed_player_with_inventory(session)
+    player_id = player.id
+    session.close()
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().split(None, 1)[0].upper())
+
+    event.listen(ASYNC_ENGINE.sync_engine, "before_cursor_execute", _record)
+    try:
+        response = client.post(f"/player/{player_id}/inventory/equip", json={"item_id": 99999})
+    finally:
+        event.remove(ASYNC_ENGINE.sync_engine, "before_cursor_execute", _record)
+    assert response.status_code == 404
+    assert statements == ["UPDATE"]
+
+
+def test_granting_duplicates_stacks_cosmetics_only(client: TestClient, session_factory):
+    session = session_factory()
+    player = Player(id=78, username="Collector", level=3, xp=0, energy=10, max_energy=20, gold=0)
+    mask = InventoryItemCatalog(name="Маска Сутінків", slot="head", rarity="epic", cosmetic=True)
+    dagger = InventoryItemCatalog(name="Кинджал Мандрівника", slot="weapon", rarity="rare", cosmetic=False)
+    session.add_all([player, mask, dagger])
+    session.flush()
+
+    service = InventoryService(session)
+    first_mask = service.grant_catalog_item(player, mask.id)
+    second_mask = service.grant_catalog_item(player, mask.id)
+    service.grant_catalog_item(player, dagger.id)
+    service.grant_catalog_item(player, dagger.id)
+    session.commit()
+    player_id = player.id
+    mask_name = mask.name
+    session.close()
+
+    assert second_mask.item_id == first_mask.item_id
+    assert second_mask.quantity == 2
+
+    response = client.get(f"/player/{player_id}/inventory")
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 3
+    mask_rows = [item for item in items if item["name"] == mask_name]
+    assert len(mask_rows) == 1
+    assert mask_rows[0]["quantity"] == 2
+
+
+def test_stack_grants_from_separate_sessions_share_one_row(session_factory):
+    with session_factory() as session:
+        session.add_all([
+            Player(id=79, username="Racer", level=1, xp=0, energy=10, max_energy=20, gold=0),
+            InventoryItemCatalog(id=7901, name="Зілля", slot="consumable", rarity="common"),
+        ])
+        session.commit()
+
+    granted = []
+    for _ in range(2):
+        with session_factory() as session:
+            granted.append(InventoryService(session).grant_catalog_item(session.get(Player, 79), 7901))
+            session.commit()
+    assert granted[0].item_id == granted[1].item_id and granted[1].quantity == 2
+
+    # a racing plain INSERT of a second stack row is refused by the partial unique index
+    with session_factory() as session:
+        session.add(InventoryItem(owner_id=79, catalog_item_id=7901, slot="consumable", stackable=True))
+        with pytest.raises(IntegrityError):
+            session.flush()
+        session.rollback()
+        rows = session.query(InventoryItem).filter_by(owner_id=79).all()
+    assert [(row.quantity, row.stackable) for row in rows] == [(2, True)]
+
+
+def test_get_inventory_pages_with_cursor(client: TestClient, session_factory):
+    session = session_factory()
+    player, items = _seed_player_with_inventory(session)
+    player_id = player.id
+    item_ids = [item.id for item in items]
+    session.close()
+
+    first = client.get(f"/player/{player_id}/inventory", params={"limit": 2})
+    assert first.status_code == 200
+    first_page = first.json()
+    assert [item["id"] for item in first_page["items"]] == item_ids[:2]
+    assert first_page["next_cursor"] == item_ids[1]
+
+    second = client.get(
+        f"/player/{player_id}/inventory",
+        params={"limit": 2, "cursor": first_page["next_cursor"]},
+    )
+    assert second.status_code == 200
+    second_page = second.json()
+    assert [item["id"] for item in second_page["items"]] == item_ids[2:]
+    assert second_page["next_cursor"] is None
+
+
+def test_get_inventory_filters_and_sparse_fields(client: TestClient, session_factory):
+    session = session_factory()
+    player, items = _seed_player_with_inventory(session)
+    player_id = player.id
+    cloak_ids = [items[0].id, items[2].id]
+    session.close()
+
+    response = client.get(
+        f"/player/{player_id}/inventory",
+        params={"slot": "cloak", "equipped": "false", "fields": "id,name"},
+    )
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"id": cloak_ids[1], "name": "Пелерина Довіри"}]
+
+    response = client.get(f"/player/{player_id}/inventory", params={"rarity": "epic", "fields": "rarity"})
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"rarity": "epic"}]
+
+    response = client.get(f"/player/{player_id}/inventory", params={"cosmetic": "false"})
+    assert response.status_code == 200
+    assert response.json()["items"] == []
+
+
+def test_get_inventory_rejects_unknown_fields(client: TestClient, session_factory):
+    session = session_factory()
+    player, _ = _seed_player_with_inventory(session)
+    player_id = player.id
+    session.close()
+
+    response = client.get(f"/player/{player_id}/inventory", params={"fields": "id,owner_id"})
+    assert response.status_code == 400
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.db.models.farm import FarmPlot, PlayerFarmingStats
+from app.db.models.inventory import InventoryItemCatalog
+from app.db.models.player import Player
+from app.db.models.shop import ShopOffer
+from app.db.models.wallet import Wallet
+from app.services.leaderboard_service import LEADERBOARD_GOLD, LeaderboardRegistry, leaderboards
+from app.utils.ranking import RankedSet
+
+
+def test_ranked_set_matches_a_sorted_list() -> None:
+    ranked: RankedSet[int] = RankedSet(seed=3)
+    expected: list[int] = []
+    rng = random.Random(7)
+    for step in range(4000):
+        key = rng.randrange(500)
+        if key in ranked:
+            ranked.remove(key)
+            expected.remove(key)
+        else:
+            ranked.add(key)
+            expected.append(key)
+            expected.sort()
+        if step % 250 == 0:
+            assert list(ranked) == expected and len(ranked) == len(expected)
+            assert all(ranked[index] == key and ranked.index(key) == index for index, key in enumerate(expected))
+            assert ranked.slice(5, 17) == expected[5:17]
+
+
+def _seed(session_factory) -> None:
+    with session_factory() as session:
+        for offset, (level, xp, gold) in enumerate([(5, 10, 300), (7, 0, 50), (5, 40, 900), (2, 0, 10), (5, 10, 120)]):
+            player = Player(id=4701 + offset, username=f"Ranked {offset}", level=level, xp=xp, gold=gold)
+            session.add(player)
+        session.add(PlayerFarmingStats(player_id=4703, level=3, xp=5))
+        session.commit()
+
+
+def test_top_and_standing_are_kept_current_by_commits(client: TestClient, session_factory) -> None:
+    _seed(session_factory)
+
+    top = client.get("/leaderboards/level", params={"limit": 3}).json()
+    assert top["total"] == 5
+    assert [(entry["player_id"], entry["value"], entry["xp"]) for entry in top["entries"]] == [
+        (4702, 7, 0),
+        (4703, 5, 40),
+        # equal level and XP: the older account ranks first
+        (4701, 5, 10),
+    ]
+    assert client.get("/leaderboards/gold", params={"limit": 1}).json()["entries"][0]["player_id"] == 4703
+    assert client.get("/leaderboards/farming").json()["total"] == 1
+
+    standing = client.get("/leaderboards/level/players/4705", params={"around": 1}).json()
+    assert standing["entry"]["rank"] == 4
+    assert [entry["player_id"] for entry in standing["neighbours"]] == [4701, 4704]
+
+    # a committed write moves the player without rebuilding the board
+    with session_factory() as session:
+        player = session.get(Player, 4704)
+        player.level, player.gold = 9, 1000
+        session.commit()
+    # a rolled back one does not
+    with session_factory() as session:
+        session.get(Player, 4701).level = 30
+        session.flush()
+        session.rollback()
+
+    top = client.get("/leaderboards/level", params={"limit": 2}).json()
+    assert [entry["player_id"] for entry in top["entries"]] == [4704, 4702]
+    assert client.get("/leaderboards/gold/players/4704").json()["entry"]["rank"] == 1
+    assert client.get("/leaderboards/level/players/4701").json()["entry"]["rank"] == 4
+
+    assert client.get("/leaderboards/farming/players/4701").status_code == 404
+    assert client.get("/leaderboards/wealth").status_code == 404
+
+
+def test_admin_rebuild_picks_up_writes_from_other_processes(client: TestClient, session_factory) -> None:
+    _seed(session_factory)
+    assert client.get("/leaderboards/level").json()["total"] == 5
+
+    # a write this process never saw, e.g. from another worker
+    with session_factory() as session:
+        session.execute(Player.__table__.update().where(Player.id == 4704).values(level=50))
+        session.commit()
+    assert client.get("/leaderboards/level/players/4704").json()["entry"]["rank"] == 5
+
+    rebuilt = client.post("/admin/leaderboards/rebuild")
+    assert rebuilt.status_code == 200 and rebuilt.json() == {"level": 5, "farming": 1, "gold": 5}
+    assert client.get("/leaderboards/level/players/4704").json()["entry"]["rank"] == 1
+    assert leaderboards.loaded
+
+
+def _board_entry(client: TestClient, board: str, player_id: int) -> dict:
+    return client.get(f"/leaderboards/{board}/players/{player_id}").json()["entry"]
+
+
+def test_gameplay_routes_keep_the_boards_current(client: TestClient, session_factory) -> None:
+    player_id = 4801
+    with session_factory() as session:
+        item = InventoryItemCatalog(name="Плащ рейтингу", slot="cloak", rarity="rare", cosmetic=True)
+        session.add_all([Player(id=player_id, username="Farmer", level=3, xp=5, gold=2000), item])
+        session.add(Wallet(player_id=player_id, gold=2000))
+        session.flush()
+        offer = ShopOffer(catalog_item_id=item.id, price_gold=300, expires_at=datetime.now(timezone.utc) + timedelta(days=1))
+        session.add(offer)
+        session.commit()
+        offer_id = offer.id
+    assert _board_entry(client, "gold", player_id)["value"] == 2000
+
+    # the farm flows load Player with load_only(id, level, gold)
+    state = client.get(f"/farm/{player_id}").json()
+    plot_id = next(plot["id"] for plot in state["plots"] if plot["unlocked"])
+    plant = state["available_plants"][0]
+    assert client.post(f"/farm/{player_id}/plant", json={"plot_id": plot_id, "plant_type_id": plant["id"]}).status_code == 200
+    with session_factory() as session:
+        session.get(FarmPlot, plot_id).crop.ready_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+        session.commit()
+    harvested = client.post(f"/farm/{player_id}/harvest-all").json()["state"]["wallet_gold"]
+    assert harvested != 2000
+    assert _board_entry(client, "gold", player_id)["value"] == harvested
+    assert _board_entry(client, "farming", player_id)["value"] >= 1
+
+    bought = client.post(f"/player/{player_id}/shop/buy", json={"offer_id": offer_id}).json()
+    assert _board_entry(client, "gold", player_id)["value"] == bought["wallet"]["gold"] == harvested - 300
+
+    claimed = client.post(f"/player/{player_id}/claim-daily-reward").json()
+    assert claimed["status"] == "claimed"
+    with session_factory() as session:
+        player = session.get(Player, player_id)
+        level, xp, gold = player.level, player.xp, player.gold
+    entry = _board_entry(client, "level", player_id)
+    assert (entry["value"], entry["xp"]) == (level, xp)
+    assert _board_entry(client, "gold", player_id)["value"] == gold
+
+
+def test_concurrent_cold_starts_keep_changes_buffered_by_the_first_rebuild(session_factory) -> None:
+    _seed(session_factory)
+    registry = LeaderboardRegistry()
+    second_start: list[threading.Thread] = []
+
+    class _SlowSession:
+        """Commits a score change and starts a second cold load while the first rebuild reads."""
+
+        def __init__(self, session) -> None:
+            self._session = session
+
+        def execute(self, stmt):
+            result = self._session.execute(stmt)
+            registry.apply({4704: {LEADERBOARD_GOLD: (5000,)}})
+            with session_factory() as other:
+                thread = threading.Thread(target=registry.ensure_loaded, args=(other,))
+                thread.start()
+                # with a single-flight rebuild the second load waits for this one
+                thread.join(timeout=0.2)
+                second_start.append(thread)
+            return result
+
+    with session_factory() as session:
+        registry.ensure_loaded(_SlowSession(session))
+    second_start[0].join()
+
+    total, top = registry.top(LEADERBOARD_GOLD, limit=1)
+    assert total == 5 and top[0].player_id == 4704 and top[0].score == (5000,)
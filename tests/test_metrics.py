@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import gc
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.db.models.player import Player
+from app.utils.metrics import Counter, Histogram, MetricsRegistry
+
+
+def _samples(text: str) -> dict[str, float]:
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = float(value)
+    return samples
+
+
+def test_metrics_endpoint_reports_routes_caches_and_domain_counters(client: TestClient, session_factory) -> None:
+    with session_factory() as session:
+        session.add(Player(id=4201, username="Metered", level=5, gold=2000))
+        session.commit()
+
+    state = client.get("/farm/4201").json()
+    client.get("/farm/4201")
+    plot_id = next(plot["id"] for plot in state["plots"] if plot["unlocked"])
+    planted = client.post("/farm/4201/plant", json={"plot_id": plot_id, "plant_type_id": state["available_plants"][0]["id"]})
+    assert planted.status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = _samples(response.text)
+
+    route = 'method="GET",route="/farm/{player_id}"'
+    assert samples[f"app_http_request_duration_seconds_count{{{route}}}"] == 2
+    assert samples[f'app_http_request_duration_seconds_bucket{{{route},le="+Inf"}}'] == 2
+    assert samples[f'app_http_responses_total{{{route},status="200"}}'] == 2
+    assert samples["app_farm_crops_planted_total"] == 1
+    # the /metrics request itself is the only one in flight
+    assert samples["app_http_requests_in_flight"] == 1
+    assert 0 < samples['app_cache_hit_ratio{cache="plant_catalog"}'] < 1
+    assert samples[f"app_db_statements_total{{{route}}}"] > 0
+    assert 'app_db_pool_connections{engine="sync",state="checkedout"}' in samples
+
+
+def test_counters_sum_shards_from_every_thread() -> None:
+    registry = MetricsRegistry()
+    counter = Counter("test_events_total", "Events", ("kind",), registry=registry)
+    latency = Histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0), registry=registry)
+
+    def work() -> None:
+        for _ in range(1000):
+            counter.inc("a")
+            latency.observe(0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    samples = _samples(registry.render())
+    assert samples['test_events_total{kind="a"}'] == 8000
+    assert samples['test_latency_seconds_bucket{le="0.1"}'] == 0
+    assert samples['test_latency_seconds_bucket{le="1.0"}'] == 8000
+    assert samples["test_latency_seconds_sum"] == 4000
+
+
+def test_shards_of_exited_threads_are_folded_into_the_totals() -> None:
+    registry = MetricsRegistry()
+    counter = Counter("test_jobs_total", "Jobs", registry=registry)
+
+    # bursts of short-lived threads, like idle threadpool workers being pruned and respawned
+    for _ in range(20):
+        threads = [threading.Thread(target=lambda: counter.inc(amount=5)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    gc.collect()
+
+    assert len(registry._shards) <= 1
+    assert registry.value("test_jobs_total") == 500
+    counter.inc()
+    assert _samples(registry.render())["test_jobs_total"] == 501
+
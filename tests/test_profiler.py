@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.db.models.player import Player
+from app.utils.profiler import SamplingProfiler
+
+
+def _spin_for_profiler(seconds: float) -> None:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(range(200))
+
+
+def test_sampler_collects_collapsed_stacks() -> None:
+    profiler = SamplingProfiler()
+    session = profiler.start(seconds=5, interval=0.001)
+    worker = threading.Thread(target=_spin_for_profiler, args=(0.2,), name="busy-worker")
+    worker.start()
+    worker.join()
+    profiler.stop()
+    for _ in range(100):
+        if not session.running:
+            break
+        time.sleep(0.01)
+
+    assert not session.running and session.samples > 0
+    lines = session.collapsed().splitlines()
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy and any("test_profiler.py:_spin_for_profiler" in line for line in busy)
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) > 0 and ";" in stack
+
+
+def test_admin_profiler_session_for_n_route_requests(client: TestClient, session_factory) -> None:
+    with session_factory() as session:
+        session.add(Player(id=4301, username="Profiled", level=5, gold=100))
+        session.commit()
+
+    assert client.get("/admin/profiler").status_code == 404
+    started = client.post("/admin/profiler", json={"route": "/farm/{player_id}", "requests": 2, "interval_ms": 1})
+    assert started.status_code == 201 and started.json()["running"]
+    assert client.post("/admin/profiler", json={}).status_code == 409
+
+    client.get("/health")
+    client.get("/farm/4301")
+    client.get("/farm/4301")
+
+    status = client.get("/admin/profiler").json()
+    for _ in range(100):
+        if not status["running"]:
+            break
+        time.sleep(0.01)
+        status = client.get("/admin/profiler").json()
+    assert not status["running"]
+    # /health and the admin calls do not match the route
+    assert status["requests_seen"] == 2
+
+    stacks = client.get("/admin/profiler/collapsed")
+    assert stacks.status_code == 200
+    assert stacks.headers["content-type"].startswith("text/plain")
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.db.models.player import Player
+from app.db.query_stats import route_query_stats, track_queries
+from conftest import query_budget_violations
+
+
+def _create_player(session_factory, player_id: int) -> int:
+    with session_factory() as session:
+        session.add(Player(id=player_id, username="Counted", level=5, gold=100))
+        session.commit()
+    return player_id
+
+
+def test_debug_headers_and_route_aggregates(client: TestClient, session_factory, monkeypatch) -> None:
+    player_id = _create_player(session_factory, 4101)
+
+    quiet = client.get(f"/farm/{player_id}")
+    assert "x-db-statements" not in quiet.headers
+
+    monkeypatch.setenv("APP_DEBUG", "1")
+    farm = client.get(f"/farm/{player_id}")
+    # async route: the statements run inside SQLAlchemy's greenlet and still reach the request stats
+    shop = client.get(f"/player/{player_id}/shop")
+    assert int(farm.headers["x-db-statements"]) > 0
+    assert int(shop.headers["x-db-statements"]) > 0
+    assert float(farm.headers["x-db-time-ms"]) >= float(farm.headers["x-db-slowest-ms"]) > 0
+
+    totals = route_query_stats.snapshot()[("GET", "/farm/{player_id}")]
+    assert totals.requests == 2
+    assert totals.max_statements >= int(farm.headers["x-db-statements"])
+    assert totals.slowest_statement
+
+    stats = client.get("/admin/query-stats").json()
+    assert {(row["method"], row["route"]) for row in stats} >= {
+        ("GET", "/farm/{player_id}"),
+        ("GET", "/player/{player_id}/shop"),
+    }
+
+
+def test_track_queries_outside_requests(session_factory) -> None:
+    with session_factory() as session, track_queries() as stats:
+        session.execute(select(Player.id)).all()
+        session.execute(select(Player.id).where(Player.id == 1)).all()
+
+    assert stats.statements == 2
+    assert stats.slowest_statement.startswith("SELECT players.id")
+
+
+def test_query_budget_reports_routes_over_budget(client: TestClient, session_factory) -> None:
+    player_id = _create_player(session_factory, 4102)
+    client.get(f"/farm/{player_id}")
+
+    assert query_budget_violations(1, route="GET /farm/{player_id}")
+    assert not query_budget_violations(1, route="GET /health")
+    assert not query_budget_violations(1_000)
+
+
+@pytest.mark.query_budget(4, route="GET /farm/{player_id}")
+@pytest.mark.query_budget(3, route="GET /player/{player_id}/shop")
+def test_steady_state_query_budgets(client: TestClient, session_factory) -> None:
+    player_id = _create_player(session_factory, 4103)
+    # the first visit creates the farm and seeds the plant catalog, the second reloads the catalog cache
+    for _ in range(2):
+        client.get(f"/farm/{player_id}")
+    route_query_stats.reset()
+
+    assert client.get(f"/farm/{player_id}").status_code == 200
+    assert client.get(f"/player/{player_id}/shop").status_code == 200
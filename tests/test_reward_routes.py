@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import io
 from datetime import datetime, timedelta, timezone
 
 from fastapi.testclient import TestClient
+from sqlalchemy import select, text, tuple_
 
 from app.db.models.player import Player
 from app.services.progression_service import DAILY_REWARD_COOLDOWN, DAILY_REWARD_ENERGY, DAILY_REWARD_XP
+from scripts.export_claimable_players import export_claimable
 
 
 def _create_player(session, *, energy: int = 10) -> Player:
@@ -56,3 +60,76 @@ def test_claim_daily_reward_cooldown(client: TestClient, session_factory):
     assert payload["retry_after_seconds"] <= int(DAILY_REWARD_COOLDOWN.total_seconds())
     assert payload["retry_after_seconds"] > 0
     assert "message" in payload
+
+
+def test_claim_daily_reward_retry_replays_claim(client: TestClient, session_factory):
+    session = session_factory()
+    _create_player(session, energy=10)
+    session.close()
+
+    headers = {"Idempotency-Key": "daily-1"}
+    first = client.post("/player/1/claim-daily-reward", headers=headers)
+    retry = client.post("/player/1/claim-daily-reward", headers=headers)
+    fresh = client.post("/player/1/claim-daily-reward", headers={"Idempotency-Key": "daily-2"})
+
+    assert first.json()["status"] == "claimed"
+    assert retry.json() == first.json()
+    assert fresh.json()["status"] == "cooldown"
+
+    check_session = session_factory()
+    player = check_session.get(Player, 1)
+    assert player.xp == DAILY_REWARD_XP
+    check_session.close()
+
+
+def _create_claim_history(session_factory, now: datetime) -> set[int]:
+    """Eleven players: never claimed, claimed long ago, or still on cooldown. Returns the claimable ids."""
+    claimable = set()
+    with session_factory() as session:
+        for index in range(11):
+            player_id = 4801 + index
+            if index % 3 == 0:
+                last_claim = None
+            elif index % 3 == 1:
+                # several players share a claim time, so the keyset has to break ties by id
+                last_claim = now - DAILY_REWARD_COOLDOWN - timedelta(hours=index // 5)
+            else:
+                last_claim = now - timedelta(hours=index)
+            session.add(Player(id=player_id, username=f"Daily {index}", last_daily_claim_at=last_claim))
+            if last_claim is None or now - last_claim >= DAILY_REWARD_COOLDOWN:
+                claimable.add(player_id)
+        session.commit()
+    return claimable
+
+
+def test_admin_exports_claimable_players_in_batches(client: TestClient, session_factory, sync_engine):
+    claimable = _create_claim_history(session_factory, datetime.now(timezone.utc))
+
+    response = client.get("/admin/daily-rewards/claimable")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0] == "player_id"
+    assert sorted(map(int, lines[1:])) == sorted(claimable)
+
+    output = io.StringIO()
+    written = asyncio.run(export_claimable(sync_engine.url.render_as_string(hide_password=False), output, batch_size=2, header=False))
+    ids = list(map(int, output.getvalue().splitlines()))
+    assert written == len(claimable) and len(ids) == len(set(ids)) and set(ids) == claimable
+
+
+def test_claimable_queries_use_the_claim_index(sync_engine):
+    cutoff = datetime.now(timezone.utc) - DAILY_REWARD_COOLDOWN
+    statements = [
+        select(Player.id).where(Player.last_daily_claim_at.is_(None), Player.id > 10).order_by(Player.id).limit(100),
+        select(Player.last_daily_claim_at, Player.id)
+        .where(Player.last_daily_claim_at <= cutoff, tuple_(Player.last_daily_claim_at, Player.id) > tuple_(cutoff, 10))
+        .order_by(Player.last_daily_claim_at, Player.id)
+        .limit(100),
+    ]
+    with sync_engine.connect() as connection:
+        for stmt in statements:
+            compiled = stmt.compile(connection, compile_kwargs={"literal_binds": True})
+            plan = "\n".join(str(row[-1]) for row in connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+            assert "ix_players_last_daily_claim_at_id" in plan
+            assert "TEMP B-TREE" not in plan
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 
 from app.db.models.inventory import InventoryItem, InventoryItemCatalog
 from app.db.models.player import Player
 from app.db.models.shop import ShopOffer
 from app.db.models.wallet import Wallet
+from app.db.session import ASYNC_ENGINE
+from app.services.shop_offer_cache import ShopOfferCache
+from app.services.shop_service import offer_purchase_queue
+from app.utils.metrics import REGISTRY
+from scripts.flash_sale_load_test import run_flash_sale
 
 
 def _create_offer(session, *, price: int = 80) -> tuple[Player, ShopOffer]:
@@ -79,3 +87,156 @@ def test_shop_buy_deducts_wallet_and_grants_item(client: TestClient, session_fac
     assert inventory_item is not None
     assert inventory_item.owner_id == player_id
     check_session.close()
+
+
+def test_shop_buy_repeatable_cosmetic_grows_stack(client: TestClient, session_factory):
+    session = session_factory()
+    player, offer = _create_offer(session, price=50)
+    offer.is_limited = False
+    wallet = session.get(Wallet, player.id)
+    wallet.gold = 100
+    player.gold = 100
+    session.commit()
+    player_id = player.id
+    offer_id = offer.id
+    session.close()
+
+    first = client.post(f"/player/{player_id}/shop/buy", json={"offer_id": offer_id}).json()
+    second = client.post(f"/player/{player_id}/shop/buy", json={"offer_id": offer_id}).json()
+
+    assert second["granted"]["inventory_item_id"] == first["granted"]["inventory_item_id"]
+    assert second["granted"]["quantity"] == 2
+    assert second["wallet"]["gold"] == 0
+
+
+def test_shop_list_serves_offers_from_cache_until_they_change(client: TestClient, session_factory):
+    session = session_factory()
+    player, offer = _create_offer(session)
+    player_id = player.id
+    catalog_item_id = offer.catalog_item_id
+    session.close()
+
+    assert len(client.get(f"/player/{player_id}/shop").json()["offers"]) == 1
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(ASYNC_ENGINE.sync_engine, "before_cursor_execute", _record)
+    try:
+        cached = client.get(f"/player/{player_id}/shop")
+    finally:
+        event.remove(ASYNC_ENGINE.sync_engine, "before_cursor_execute", _record)
+    assert cached.status_code == 200
+    assert not any("shop_offers" in statement for statement in statements)
+
+    session = session_factory()
+    session.add(ShopOffer(catalog_item_id=catalog_item_id, price_gold=10, is_limited=False))
+    session.commit()
+    session.close()
+
+    refreshed = client.get(f"/player/{player_id}/shop").json()["offers"]
+    assert [entry["price_gold"] for entry in refreshed] == [80, 10]
+
+
+@pytest.mark.asyncio
+async def test_shop_offer_cache_refreshes_at_next_expiry(async_session):
+    now = datetime.now(timezone.utc)
+    item = InventoryItemCatalog(name="Кинджал Світанку", slot="weapon", rarity="rare")
+    async_session.add(item)
+    await async_session.flush()
+    async_session.add_all(
+        [
+            ShopOffer(catalog_item_id=item.id, price_gold=30, expires_at=now + timedelta(minutes=5)),
+            ShopOffer(catalog_item_id=item.id, price_gold=40, expires_at=None),
+        ]
+    )
+    await async_session.flush()
+
+    cache = ShopOfferCache()
+    snapshot = await cache.get(async_session, now)
+    assert [offer["price_gold"] for _, offer in snapshot.offers] == [30, 40]
+    assert snapshot.catalog_item_ids == (item.id,)
+    assert await cache.get(async_session, now + timedelta(minutes=4)) is snapshot
+
+    after_expiry = await cache.get(async_session, now + timedelta(minutes=6))
+    assert after_expiry is not snapshot
+    assert [offer["price_gold"] for _, offer in after_expiry.offers] == [40]
+
+
+def test_shop_buy_replays_response_for_same_idempotency_key(client: TestClient, session_factory):
+    session = session_factory()
+    player, offer = _create_offer(session, price=60)
+    player_id = player.id
+    offer_id = offer.id
+    session.close()
+
+    headers = {"Idempotency-Key": "buy-cloak-1"}
+    first = client.post(f"/player/{player_id}/shop/buy", json={"offer_id": offer_id}, headers=headers)
+    retry = client.post(f"/player/{player_id}/shop/buy", json={"offer_id": offer_id}, headers=headers)
+
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+    check_session = session_factory()
+    wallet = check_session.get(Wallet, player_id)
+    owned = check_session.query(InventoryItem).filter_by(owner_id=player_id).count()
+    check_session.close()
+    assert wallet.gold == 0
+    assert owned == 1
+
+    reused = client.post(f"/player/{player_id}/shop/buy", json={"offer_id": offer_id + 1}, headers=headers)
+    assert reused.status_code == 422
+
+
+def test_shop_purchases_metric_counts_committed_purchases_only(client: TestClient, session_factory):
+    session = session_factory()
+    player, offer = _create_offer(session, price=60)
+    player_id, offer_id = player.id, offer.id
+    session.close()
+
+    headers = {"Idempotency-Key": "buy-metric-1"}
+    assert client.post(f"/player/{player_id}/shop/buy", json={"offer_id": offer_id}, headers=headers).status_code == 200
+    # a replay and a rejected (rolled back) purchase are not purchases
+    assert client.post(f"/player/{player_id}/shop/buy", json={"offer_id": offer_id}, headers=headers).status_code == 200
+    assert client.post(f"/player/{player_id}/shop/buy", json={"offer_id": offer_id}).status_code == 402
+
+    assert REGISTRY.value("app_shop_purchases_total") == 1
+
+def test_shop_buy_stops_when_stock_runs_out(client: TestClient, session_factory):
+    session = session_factory()
+    player, offer = _create_offer(session, price=20)
+    offer.stock_remaining = 1
+    second_player = Player(id=302, username="Latecomer", level=2, xp=0, energy=15, max_energy=20, gold=20)
+    session.add_all([second_player, Wallet(player_id=second_player.id, gold=20)])
+    session.commit()
+    first_id, second_id, offer_id = player.id, second_player.id, offer.id
+    session.close()
+
+    # the shop window is now cached; the stock shown must still follow purchases
+    assert client.get(f"/player/{second_id}/shop").json()["offers"][0]["stock_remaining"] == 1
+    assert client.post(f"/player/{first_id}/shop/buy", json={"offer_id": offer_id}).status_code == 200
+    assert client.get(f"/player/{second_id}/shop").json()["offers"][0]["stock_remaining"] == 0
+    sold_out = client.post(f"/player/{second_id}/shop/buy", json={"offer_id": offer_id})
+    assert sold_out.status_code == 409
+    assert offer_purchase_queue.is_sold_out(offer_id)
+
+    check_session = session_factory()
+    assert check_session.get(ShopOffer, offer_id).stock_remaining == 0
+    assert check_session.get(Wallet, second_id).gold == 20
+    check_session.close()
+
+
+def test_flash_sale_harness_never_oversells(tmp_path):
+    report = asyncio.run(
+        run_flash_sale(f"sqlite:///{tmp_path / 'flash.db'}", players=60, stock=7, concurrency=30)
+    )
+
+    assert report.outcomes["purchased"] == 7
+    assert report.outcomes["error"] == 0, report.errors
+    assert report.granted_rows == 7
+    assert report.oversell == 0
+    assert report.stock_left == 0
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import alembic.command
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models.player import Player
+from app.services.farm_service import FarmService
+from app.services.leaderboard_service import leaderboards
+from app.services.plant_catalog_cache import plant_catalog_cache
+from app.services.quest_content_service import quest_content_cache
+from app.services.shop_offer_cache import shop_offer_cache
+from app.startup import SchemaOutOfDate, alembic_heads, ensure_schema, schema_mode, warm_up
+from scripts.migrate import migrate
+
+
+def _stamp(engine, revision: str | None) -> None:
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        connection.execute(text("DELETE FROM alembic_version"))
+        if revision is not None:
+            connection.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": revision})
+
+
+def test_schema_check_requires_migration_head(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    try:
+        with pytest.raises(SchemaOutOfDate, match="no revision"):
+            ensure_schema(engine, mode="check")
+
+        _stamp(engine, "f19b6d3a7c52")
+        with pytest.raises(SchemaOutOfDate, match="make migrate"):
+            ensure_schema(engine, mode="check")
+
+        _stamp(engine, alembic_heads()[0])
+        ensure_schema(engine, mode="check")
+        # the check never touches the application tables
+        assert inspect(engine).get_table_names() == ["alembic_version"]
+    finally:
+        engine.dispose()
+
+
+def test_schema_create_mode_builds_tables(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    try:
+        ensure_schema(engine, mode="off")
+        assert inspect(engine).get_table_names() == []
+        ensure_schema(engine, mode="create")
+        assert "players" in inspect(engine).get_table_names()
+    finally:
+        engine.dispose()
+
+
+def test_sqlite_defaults_to_create_and_migrate_stamps_the_head(tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv("DB_SCHEMA_MODE", raising=False)
+    assert schema_mode(create_engine("postgresql://example/db")) == "check"
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    try:
+        assert schema_mode(engine) == "create"
+        # the dev database built from the models passes the strict check
+        migrate(engine)
+        ensure_schema(engine, mode="check")
+        assert "players" in inspect(engine).get_table_names()
+    finally:
+        engine.dispose()
+
+    monkeypatch.setenv("DB_SCHEMA_MODE", "check")
+    assert schema_mode(create_engine("sqlite://")) == "check"
+
+
+def test_migrate_upgrades_an_existing_versioned_database(tmp_path, monkeypatch) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE players (id INTEGER PRIMARY KEY)"))
+        _stamp(engine, "f19b6d3a7c52")
+        # stand in for Postgres: an older schema must go through the migration chain
+        monkeypatch.setattr(engine.dialect, "name", "postgresql")
+        upgrades = []
+        monkeypatch.setattr(alembic.command, "upgrade", lambda config, revision: upgrades.append(revision))
+
+        migrate(engine)
+
+        assert upgrades == ["head"]
+        assert inspect(engine).get_table_names() == ["alembic_version", "players"]
+        monkeypatch.undo()
+        with pytest.raises(SchemaOutOfDate):
+            ensure_schema(engine, mode="check")
+    finally:
+        engine.dispose()
+
+
+def test_warm_up_primes_process_caches(sync_engine, session_factory) -> None:
+    with session_factory() as session:
+        session.add(Player(id=3901, username="Warm", level=1, gold=0))
+        session.flush()
+        FarmService(session).get_farm_state(3901, datetime.now(timezone.utc))
+        session.commit()
+    plant_catalog_cache.invalidate()
+
+    async_engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def create_tables() -> None:
+        async with async_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    try:
+        timings = asyncio.run(
+            warm_up(
+                sync_engine=sync_engine,
+                async_engine=async_engine,
+                session_factory=session_factory,
+                async_session_factory=async_sessionmaker(bind=async_engine, class_=AsyncSession),
+            )
+        )
+    finally:
+        asyncio.run(async_engine.dispose())
+
+    assert set(timings) == {"modules", "sync_pool", "async_pool", "plant_and_quest_caches", "shop_cache", "leaderboards"}
+    assert plant_catalog_cache.snapshot is not None
+    assert quest_content_cache.synced
+    assert shop_offer_cache.snapshot is not None
+    assert leaderboards.loaded